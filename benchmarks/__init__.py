@@ -0,0 +1,19 @@
+"""Throughput benchmarks for the hot paths of Pysolar
+
+Run from the top of the source tree:
+
+    python -m benchmarks                    # run and compare with baseline.json
+    python -m benchmarks --save             # run and store the results as the baseline
+    python -m benchmarks --filter rest      # only cases whose name contains "rest"
+
+Every case runs under both numeric backends ("math" loops over scalar calls,
+"numpy" makes one call on arrays) for several input sizes, and is reported
+in items per second; rest.get_clear_sky_irradiance, which always works on
+numpy arrays, only runs under "numpy". When a baseline exists, the run fails
+if any case is slower than its baseline by more than --threshold percent.
+Baselines depend on the machine, so they are not kept in the repository.
+
+The import_pysolar case times cold starts, each in a new interpreter: a bare
+`import pysolar` under "math", and importing it up to its first numpy
+function under "numpy".
+"""
@@ -0,0 +1,92 @@
+"""Command-line entry point; see the package docstring."""
+import argparse
+import json
+import os
+import sys
+import time
+from pysolar import numeric
+from . import cases
+
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def get_key(case):
+    return \
+        "%s[%s,%d]" % (case.name, case.backend, case.size)
+#end get_key
+
+def measure(case, min_time, repeat):
+    "returns the best throughput of case over repeat runs of at least min_time seconds, in items per second."
+    with numeric.backend(case.backend) :
+        function, items = case.setup(case.backend, case.size)
+        function() # warm up caches and lazy imports
+        best = float("inf")
+        for _ in range(repeat) :
+            calls = 0
+            begin = time.perf_counter()
+            while True :
+                function()
+                calls += 1
+                elapsed = time.perf_counter() - begin
+                if elapsed >= min_time :
+                    break
+                #end if
+            #end while
+            best = min(best, elapsed / calls)
+        #end for
+    #end with
+    return \
+        items / best
+#end measure
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m benchmarks", description = "Pysolar throughput benchmarks")
+    parser.add_argument("--baseline", default = default_baseline, help = "baseline JSON file (default: %(default)s)")
+    parser.add_argument("--save", action = "store_true", help = "store the results as the baseline instead of comparing")
+    parser.add_argument("--threshold", type = float, default = 20.0, help = "allowed throughput loss in percent (default: %(default)s)")
+    parser.add_argument("--filter", default = "", help = "only run cases whose name contains this text")
+    parser.add_argument("--min-time", type = float, default = 0.2, help = "seconds per timing run (default: %(default)s)")
+    parser.add_argument("--repeat", type = int, default = 3, help = "timing runs per case (default: %(default)s)")
+    args = parser.parse_args(argv)
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline) :
+        with open(args.baseline) as f :
+            baseline = json.load(f)
+        #end with
+    #end if
+    results = {}
+    regressions = []
+    for case in cases.get_cases() :
+        if args.filter not in case.name :
+            continue
+        key = get_key(case)
+        throughput = measure(case, args.min_time, args.repeat)
+        results[key] = throughput
+        line = "%-60s %14.1f items/s" % (key, throughput)
+        if key in baseline :
+            change = (throughput / baseline[key] - 1) * 100
+            line += "  %+7.1f%%" % change
+            if change < -args.threshold :
+                regressions.append(key)
+                line += "  REGRESSION"
+            #end if
+        #end if
+        print(line, flush = True)
+    #end for
+    if args.save :
+        with open(args.baseline, "w") as f :
+            json.dump(results, f, indent = 1, sort_keys = True)
+        #end with
+        print("saved %d results to %s" % (len(results), args.baseline))
+    #end if
+    if regressions :
+        print("%d case(s) slower than the baseline by more than %g%%" % (len(regressions), args.threshold))
+        return \
+            1
+    #end if
+    return \
+        0
+#end main
+
+if __name__ == "__main__" :
+    sys.exit(main())
+#end if
@@ -0,0 +1,152 @@
+"""Benchmark cases: each returns a function to time and the number of items it
+processes per call, for one backend and input size."""
+import collections
+import datetime
+import os
+import subprocess
+import sys
+import numpy
+from pysolar import constants, rest, simulate, solar, solartime, util
+
+Case = collections.namedtuple("Case", ("name", "backend", "size", "setup"))
+
+backends = ("math", "numpy")
+sizes = (1, 100, 10000)
+math_sizes = (1, 100, 1000) # scalar loops get slow well before arrays do
+span_days = (1, 30, 365)
+import_statements = \
+    {
+        "math" : "import pysolar",
+        # cold start up to the first numpy computation
+        "numpy" : "import pysolar; pysolar.numeric.cos",
+    }
+source_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+latitude_deg = 42.364908
+longitude_deg = -71.112828
+start = datetime.datetime(2024, 1, 1, tzinfo = datetime.timezone.utc)
+
+def get_times(backend, size):
+    "returns size times an hour apart, as a list of datetimes or a datetime64 array."
+    if backend == "numpy" :
+        return \
+            numpy.datetime64("2024-01-01T00:00") + numpy.arange(size).astype("timedelta64[h]")
+    #end if
+    return \
+        [start + datetime.timedelta(hours = i) for i in range(size)]
+#end get_times
+
+def _per_item(backend, size, function, make_arguments):
+    "times function on arrays of size items with numpy, or on each of size scalars with math."
+    if backend == "numpy" :
+        arguments = make_arguments(numpy.arange(size))
+        return \
+            (lambda : function(*arguments)), size
+    #end if
+    arguments = [make_arguments(i) for i in range(size)]
+    return \
+        (lambda : [function(*args) for args in arguments]), size
+#end _per_item
+
+def _get_position(backend, size):
+    when = get_times(backend, size)
+    if backend == "numpy" :
+        return \
+            (lambda : solar.get_position(latitude_deg, longitude_deg, when)), size
+    #end if
+    return \
+        (lambda : [solar.get_position(latitude_deg, longitude_deg, w) for w in when]), size
+#end _get_position
+
+def _get_coeff(backend, size):
+    return \
+        _per_item \
+          (
+            backend, size,
+            solar.get_coeff,
+            lambda i : (0.024 + 1e-6 * i, constants.get_table("heliocentric_longitude_coeffs") if backend == "numpy" else constants.get_table_lists("heliocentric_longitude_coeffs"))
+          )
+#end _get_coeff
+
+def _get_nutation(backend, size):
+    return \
+        _per_item(backend, size, solar.get_nutation, lambda i : (0.0024 + 1e-7 * i,))
+#end _get_nutation
+
+def _get_julian_solar_day(backend, size):
+    when = get_times(backend, size)
+    if backend == "numpy" :
+        return \
+            (lambda : solartime.get_julian_solar_day(when)), size
+    #end if
+    return \
+        (lambda : [solartime.get_julian_solar_day(w) for w in when]), size
+#end _get_julian_solar_day
+
+def _get_sunrise_sunset_transit(backend, size):
+    if backend == "numpy" :
+        # the datetime interface is scalar; arrays go through the day-of-year version
+        day = numpy.arange(size) % 365 + 1
+        return \
+            (lambda : util.get_sunrise_sunset_transit_hours(latitude_deg, longitude_deg, day)), size
+    #end if
+    when = [start + datetime.timedelta(days = i % 365) for i in range(size)]
+    return \
+        (lambda : [util.get_sunrise_sunset_transit(latitude_deg, longitude_deg, w) for w in when]), size
+#end _get_sunrise_sunset_transit
+
+def _get_rest_broadband(backend, size):
+    altitude_deg = numpy.linspace(1, 89, size)
+    return \
+        (lambda : rest.get_clear_sky_irradiance(altitude_deg)), size
+#end _get_rest_broadband
+
+def _simulate_span(backend, days):
+    horizon = [0] * 360
+    end = start + datetime.timedelta(days = days)
+    nr_steps = days * 24
+    if backend == "numpy" :
+        return \
+            (lambda : simulate.simulate_span_array(latitude_deg, longitude_deg, horizon, start, end, 60)), nr_steps
+    #end if
+    return \
+        (lambda : list(simulate.simulate_span(latitude_deg, longitude_deg, horizon, start, end, 60))), nr_steps
+#end _simulate_span
+
+def _import_pysolar(backend, size):
+    "times a fresh interpreter importing pysolar from the source tree, size times."
+    command = [sys.executable, "-c", import_statements[backend]]
+    return \
+        (lambda : [subprocess.run(command, cwd = source_directory, check = True) for _ in range(size)]), size
+#end _import_pysolar
+
+def get_cases():
+    "returns the list of all benchmark cases."
+    functions = \
+        (
+            ("solar.get_position", _get_position),
+            ("solar.get_coeff", _get_coeff),
+            ("solar.get_nutation", _get_nutation),
+            ("solartime.get_julian_solar_day", _get_julian_solar_day),
+            ("util.get_sunrise_sunset_transit", _get_sunrise_sunset_transit),
+        )
+    # rest.py is written for numpy arrays whichever backend is selected
+    numpy_functions = \
+        (
+            ("rest.get_clear_sky_irradiance", _get_rest_broadband),
+        )
+    cases = []
+    for backend in backends :
+        for name, setup in functions + (numpy_functions if backend == "numpy" else ()) :
+            for size in (sizes if backend == "numpy" else math_sizes) :
+                cases.append(Case(name, backend, size, setup))
+            #end for
+        #end for
+        cases.append(Case("import_pysolar", backend, 1, _import_pysolar))
+        for days in span_days :
+            cases.append(Case("simulate.simulate_span_hourly_days", backend, days, _simulate_span))
+        #end for
+    #end for
+    return \
+        cases
+#end get_cases
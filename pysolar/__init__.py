@@ -1,13 +1,37 @@
-from . import \
-    constants, \
-    solartime as stime, \
-    radiation, \
-    util, \
-    solar, \
-    numeric
+"""Submodules are imported on first use (PEP 562), so that `import pysolar`
+stays cheap; numpy is only imported once a computation needs it."""
+import importlib
+
+# attribute name -> submodule
+_submodules = \
+    {
+        "constants" : "constants",
+        "stime" : "solartime",
+        "solartime" : "solartime",
+        "radiation" : "radiation",
+        "util" : "util",
+        "solar" : "solar",
+        "numeric" : "numeric",
+        "tzinfo_check" : "tzinfo_check",
+    }
+
+def __getattr__(name):
+    if name not in _submodules :
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    #end if
+    module = importlib.import_module("." + _submodules[name], __name__)
+    globals()[name] = module
+    return \
+        module
+#end __getattr__
+
+def __dir__():
+    return \
+        sorted(set(globals()) | set(_submodules))
+#end __dir__
 
 def use_numpy():
-    numeric.use_numpy()
+    importlib.import_module(".numeric", __name__).use_numpy()
 
 def use_math():
-    numeric.use_math()
\ No newline at end of file
+    importlib.import_module(".numeric", __name__).use_math()
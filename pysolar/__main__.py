@@ -0,0 +1,7 @@
+"""Command-line entry point; see the docstring of batch.py."""
+import sys
+from .batch import main
+
+if __name__ == "__main__" :
+    sys.exit(main())
+#end if
@@ -0,0 +1,147 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""asyncio versions of the batch entry points
+
+    async for records in aio.compute_chunks(batch.read_csv_chunks(f), executor = pool) :
+        await sink.write(records)
+    #end async for
+
+Each chunk is computed by a call in executor, a concurrent.futures thread or
+process pool (default: the event loop's default thread pool), so the event
+loop stays free for I/O while arrays are being computed. At most max_pending
+chunks are submitted at a time, so memory stays bounded however long the
+input is. Results come back in input order, or as soon as they are ready
+with ordered = False.
+
+Cancelling the consuming task, or closing an async generator early, cancels
+the chunks that have not started yet; chunks already running finish in
+their worker, and their results are dropped. The computations use the numpy
+backend, which each worker selects with numeric.backend only while it computes
+a chunk, so the caller's backend is left as it was.
+"""
+import asyncio
+import collections
+import os
+import numpy
+from . import batch, constants, numeric, simulate
+
+def _get_default_max_pending():
+    return \
+        2 * (os.cpu_count() or 1)
+#end _get_default_max_pending
+
+def _call(function, arguments):
+    # the caller's backend is restored as soon as the chunk is computed
+    with numeric.backend("numpy") :
+        return \
+            function(*arguments)
+    #end with
+#end _call
+
+async def map_chunks(function, argument_chunks, executor = None, max_pending = None, ordered = True):
+    '''async generator yielding function(*arguments) for each tuple of arguments
+    from the iterable argument_chunks, each call being made in executor. function
+    and its arguments must be picklable for a process pool.'''
+    loop = asyncio.get_running_loop()
+    if max_pending is None :
+        max_pending = _get_default_max_pending()
+    #end if
+    pending = collections.deque()
+
+    async def next_result() :
+        if ordered :
+            return \
+                await pending.popleft()
+        #end if
+        done, _ = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+        future = next(iter(done))
+        pending.remove(future)
+        return \
+            future.result()
+    #end next_result
+
+    try :
+        for arguments in argument_chunks :
+            pending.append(loop.run_in_executor(executor, _call, function, tuple(arguments)))
+            if len(pending) >= max_pending :
+                yield await next_result()
+            #end if
+        #end for
+        while len(pending) != 0 :
+            yield await next_result()
+        #end while
+    finally :
+        for future in pending :
+            future.cancel()
+        #end for
+    #end try
+#end map_chunks
+
+async def compute_chunks(chunks, irradiance = "direct", executor = None, max_pending = None, ordered = True):
+    "async version of batch.compute_chunks, yielding batch.get_batch_records for each" \
+    " dict of columns from chunks."
+    argument_chunks = \
+        (
+            (columns["latitude"], columns["longitude"], columns["elevation"], columns["timestamp"], irradiance)
+            for columns in chunks
+        )
+    async for records in map_chunks(batch.get_batch_records, argument_chunks, executor, max_pending, ordered) :
+        yield records
+    #end async for
+#end compute_chunks
+
+async def get_batch_records(latitude_deg, longitude_deg, elevation, when, irradiance = "direct", chunk_rows = batch.default_chunk_rows, executor = None, max_pending = None):
+    '''async version of batch.get_batch_records: the arrays, which broadcast
+    together, are split into chunks of chunk_rows computed in executor, and the
+    records are returned as one array in the shape of the broadcast arguments.'''
+    when = numpy.asarray(when, dtype = "datetime64[s]")
+    columns = numpy.broadcast_arrays \
+      (
+        numpy.asarray(latitude_deg, dtype = float),
+        numpy.asarray(longitude_deg, dtype = float),
+        numpy.asarray(elevation, dtype = float),
+        when
+      )
+    shape = columns[0].shape
+    columns = [column.reshape(-1) for column in columns]
+    argument_chunks = \
+        (
+            [column[first : first + chunk_rows] for column in columns] + [irradiance]
+            for first in range(0, columns[0].size, chunk_rows)
+        )
+    parts = [records async for records in map_chunks(batch.get_batch_records, argument_chunks, executor, max_pending)]
+    if len(parts) == 0 :
+        return \
+            numpy.empty(shape, dtype = batch.get_record_dtype(irradiance))
+    #end if
+    return \
+        numpy.concatenate(parts).reshape(shape)
+#end get_batch_records
+
+async def simulate_span_chunks(latitude_deg, longitude_deg, horizon, start_datetime, end_datetime, step_minutes, elevation = 0, temperature = constants.standard_temperature, pressure = constants.standard_pressure, chunk_steps = simulate.default_chunk_steps, executor = None, max_pending = None):
+    "async version of simulate.simulate_span_chunks, computing each chunk with" \
+    " simulate.simulate_times in executor."
+    argument_chunks = \
+        (
+            (latitude_deg, longitude_deg, horizon, when, elevation, temperature, pressure)
+            for when in simulate.get_time_chunks(start_datetime, end_datetime, step_minutes, chunk_steps)
+        )
+    async for records in map_chunks(simulate.simulate_times, argument_chunks, executor, max_pending) :
+        yield records
+    #end async for
+#end simulate_span_chunks
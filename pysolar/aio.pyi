@@ -0,0 +1,11 @@
+# Stubs for pysolar.aio (Python 3.6)
+
+import concurrent.futures
+import datetime
+import numpy
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Sequence, Union
+
+def map_chunks(function:Callable[..., Any], argument_chunks:Iterable[Sequence[Any]], executor:Optional[concurrent.futures.Executor] = ..., max_pending:Optional[int] = ..., ordered:bool = ...) -> AsyncIterator[Any]: ...
+def compute_chunks(chunks:Iterable[Dict[str, numpy.ndarray]], irradiance:str = ..., executor:Optional[concurrent.futures.Executor] = ..., max_pending:Optional[int] = ..., ordered:bool = ...) -> AsyncIterator[numpy.ndarray]: ...
+async def get_batch_records(latitude_deg:Any, longitude_deg:Any, elevation:Any, when:Any, irradiance:str = ..., chunk_rows:int = ..., executor:Optional[concurrent.futures.Executor] = ..., max_pending:Optional[int] = ...) -> numpy.ndarray: ...
+def simulate_span_chunks(latitude_deg:float, longitude_deg:float, horizon:Any, start_datetime:Union[datetime.datetime, numpy.datetime64], end_datetime:Union[datetime.datetime, numpy.datetime64], step_minutes:float, elevation:float = ..., temperature:float = ..., pressure:float = ..., chunk_steps:int = ..., executor:Optional[concurrent.futures.Executor] = ..., max_pending:Optional[int] = ...) -> AsyncIterator[numpy.ndarray]: ...
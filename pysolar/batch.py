@@ -0,0 +1,402 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Batch computation of solar positions and irradiance for tables of sites and times
+
+    python -m pysolar sites.csv -o positions.csv --irradiance rest --processes 4
+
+The input is a CSV file with a header row, or an .npy file, of rows of
+latitude, longitude, elevation (optional, in metres) and timestamp. CSV
+columns may also be named lat, lon and time. Timestamps are ISO 8601 strings,
+taken as UTC unless they carry an offset, or numbers of seconds since the
+Unix epoch. An .npy input is either a structured array with those fields or
+a 2-dimensional float array whose columns are latitude, longitude, elevation
+and Unix time.
+
+Rows are read, computed and written in chunks, so memory does not depend on
+the size of the input. The output is CSV, or .npy when the output file name
+ends in .npy; it holds the input columns followed by azimuth and altitude in
+degrees and the chosen irradiance in W/m^2: "direct" is the direct radiation
+of radiation.get_radiation_direct, "rest" adds the direct_normal, diffuse and
+global components of rest.get_clear_sky_irradiance. Irradiance is zero while
+the sun is below the horizon.
+"""
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy
+from . import numeric, radiation, rest, solar
+
+default_chunk_rows = 65536
+irradiance_columns = \
+    {
+        "none" : (),
+        "direct" : ("radiation",),
+        "rest" : ("direct_normal", "diffuse", "global"),
+    }
+column_aliases = \
+    {
+        "latitude" : ("latitude", "lat"),
+        "longitude" : ("longitude", "lon"),
+        "elevation" : ("elevation",),
+        "timestamp" : ("timestamp", "time"),
+    }
+
+def get_record_dtype(irradiance = "direct"):
+    "returns the structured dtype of the output records for the given irradiance."
+    return \
+        numpy.dtype \
+          (
+                [
+                    ("timestamp", "datetime64[s]"),
+                    ("latitude", float),
+                    ("longitude", float),
+                    ("elevation", float),
+                    ("azimuth", float),
+                    ("altitude", float),
+                ]
+            +
+                [(name, float) for name in irradiance_columns[irradiance]]
+          )
+#end get_record_dtype
+
+def _parse_iso_timestamp(value):
+    when = datetime.datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if when.tzinfo is not None :
+        when = when.astimezone(datetime.timezone.utc).replace(tzinfo = None)
+    #end if
+    return \
+        when
+#end _parse_iso_timestamp
+
+def parse_timestamps(values):
+    '''converts an array of timestamps to UTC datetime64[s]: datetime64 values
+    are passed through, numbers are seconds since the Unix epoch and strings are
+    ISO 8601, naive ones being taken as UTC.'''
+    values = numpy.asarray(values)
+    if values.dtype.kind == "M" :
+        return \
+            values.astype("datetime64[s]")
+    #end if
+    if values.dtype.kind in "iuf" :
+        return \
+            numpy.datetime64(0, "s") + numpy.rint(values).astype(numpy.int64).astype("timedelta64[s]")
+    #end if
+    if len(values) != 0 :
+        try :
+            float(values[0])
+        except ValueError :
+            pass
+        else :
+            try :
+                numbers = values.astype(float)
+            except ValueError :
+                raise ValueError("timestamps mix Unix times and ISO 8601 strings") from None
+            #end try
+            return \
+                parse_timestamps(numbers)
+        #end try
+    #end if
+    if all("-" in value and "Z" not in value and "+" not in value and value.count("-") <= 2 for value in values.tolist()) :
+        # the common case of naive timestamps, parsed in bulk; numpy would take a bare number for a year
+        try :
+            return \
+                values.astype("datetime64[s]")
+        except ValueError :
+            pass # reported below, for the offending value
+        #end try
+    #end if
+    when = []
+    for value in values.tolist() :
+        try :
+            when.append(_parse_iso_timestamp(value))
+        except ValueError :
+            raise ValueError("invalid timestamp %r" % value) from None
+        #end try
+    #end for
+    return \
+        numpy.array(when, dtype = "datetime64[s]")
+#end parse_timestamps
+
+def _get_column_index(header, name, required = True):
+    for alias in column_aliases[name] :
+        if alias in header :
+            return \
+                header.index(alias)
+        #end if
+    #end for
+    if required :
+        raise ValueError("no %s column in %s" % (" or ".join(column_aliases[name]), ", ".join(header)))
+    #end if
+    return \
+        None
+#end _get_column_index
+
+def read_csv_chunks(f, chunk_rows = default_chunk_rows):
+    "yields dicts of \"latitude\", \"longitude\", \"elevation\" and \"timestamp\" arrays" \
+    " holding up to chunk_rows rows each of the CSV file object f."
+    reader = csv.reader(f)
+    header = [name.strip().lower() for name in next(reader)]
+    indexes = \
+        {
+            "latitude" : _get_column_index(header, "latitude"),
+            "longitude" : _get_column_index(header, "longitude"),
+            "elevation" : _get_column_index(header, "elevation", required = False),
+            "timestamp" : _get_column_index(header, "timestamp"),
+        }
+    while True :
+        rows = [row for _, row in zip(range(chunk_rows), reader) if len(row) != 0]
+        if len(rows) == 0 :
+            break
+        #end if
+        columns = list(zip(*rows))
+        yield \
+            {
+                "latitude" : numpy.array(columns[indexes["latitude"]], dtype = float),
+                "longitude" : numpy.array(columns[indexes["longitude"]], dtype = float),
+                "elevation" :
+                    numpy.zeros(len(rows))
+                if indexes["elevation"] is None else
+                    numpy.array(columns[indexes["elevation"]], dtype = float),
+                "timestamp" : parse_timestamps(numpy.array(columns[indexes["timestamp"]])),
+            }
+    #end while
+#end read_csv_chunks
+
+def read_npy_chunks(path, chunk_rows = default_chunk_rows):
+    "yields the rows of an .npy file in chunks, like read_csv_chunks. The file is" \
+    " memory-mapped, so only one chunk is read at a time."
+    table = numpy.load(path, mmap_mode = "r")
+    if table.dtype.names is not None :
+        names = table.dtype.names
+        fields = {}
+        for name, aliases in column_aliases.items() :
+            found = [alias for alias in aliases if alias in names]
+            if len(found) == 0 and name != "elevation" :
+                raise ValueError("no %s field in %s" % (" or ".join(aliases), path))
+            #end if
+            fields[name] = found[0] if len(found) != 0 else None
+        #end for
+    elif table.ndim != 2 or table.shape[1] != 4 :
+        raise ValueError("%s must hold a structured array or 4 columns" % path)
+    #end if
+    for first in range(0, len(table), chunk_rows) :
+        chunk = table[first : first + chunk_rows]
+        if table.dtype.names is not None :
+            columns = \
+                {
+                    name : (numpy.zeros(len(chunk)) if field is None else numpy.array(chunk[field]))
+                    for name, field in fields.items()
+                }
+        else :
+            columns = dict(zip(("latitude", "longitude", "elevation", "timestamp"), numpy.array(chunk, dtype = float).T))
+        #end if
+        columns["timestamp"] = parse_timestamps(columns["timestamp"])
+        for name in ("latitude", "longitude", "elevation") :
+            columns[name] = columns[name].astype(float)
+        #end for
+        yield columns
+    #end for
+#end read_npy_chunks
+
+def get_batch_records(latitude_deg, longitude_deg, elevation, when, irradiance = "direct"):
+    "computes position and irradiance for arrays of sites and UTC datetime64 times of" \
+    " the same length, returning a structured array of get_record_dtype(irradiance)."
+    when = numpy.asarray(when, dtype = "datetime64[s]")
+    result = numpy.empty(when.shape, dtype = get_record_dtype(irradiance))
+    result["timestamp"] = when
+    result["latitude"] = latitude_deg
+    result["longitude"] = longitude_deg
+    result["elevation"] = elevation
+    if len(when) == 0 :
+        return \
+            result
+    #end if
+    azimuth, altitude = solar.get_position(latitude_deg, longitude_deg, when, elevation)
+    result["azimuth"] = azimuth
+    result["altitude"] = altitude
+    daytime = altitude > 0
+    if irradiance == "direct" :
+        # the air mass of a sun below the horizon overflows exp; those rows are zeroed
+        with numpy.errstate(over = 'ignore', invalid = 'ignore') :
+            result["radiation"] = numpy.where(daytime, radiation.get_radiation_direct(when, altitude), 0)
+        #end with
+    elif irradiance == "rest" :
+        components = rest.get_clear_sky_irradiance(altitude)
+        for name in irradiance_columns["rest"] :
+            result[name] = numpy.where(daytime, components[name], 0)
+        #end for
+    #end if
+    return \
+        result
+#end get_batch_records
+
+def _get_chunk_records(arguments):
+    columns, irradiance = arguments
+    with numeric.backend("numpy") :
+        return \
+            get_batch_records(columns["latitude"], columns["longitude"], columns["elevation"], columns["timestamp"], irradiance)
+    #end with
+#end _get_chunk_records
+
+def compute_chunks(chunks, irradiance = "direct", processes = 1):
+    '''yields get_batch_records for each dict of columns from chunks, in order.
+    With more than one process, chunks are computed in a pool of worker processes,
+    with at most two per process in flight so that memory stays bounded.'''
+    if processes <= 1 :
+        # the numpy backend is only selected while a chunk is computed, never across a yield
+        for columns in chunks :
+            yield _get_chunk_records((columns, irradiance))
+        #end for
+        return
+    #end if
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool :
+        pending = collections.deque()
+        for columns in chunks :
+            pending.append(pool.submit(_get_chunk_records, (columns, irradiance)))
+            if len(pending) >= 2 * processes :
+                yield pending.popleft().result()
+            #end if
+        #end for
+        while len(pending) != 0 :
+            yield pending.popleft().result()
+        #end while
+    #end with
+#end compute_chunks
+
+def write_csv_records(f, records, header = False):
+    "appends records from get_batch_records to the text file object f as CSV rows," \
+    " preceded by the column names if header."
+    names = records.dtype.names
+    if header :
+        f.write(",".join(names) + "\n")
+    #end if
+    if len(records) == 0 :
+        return
+    #end if
+    rows = numpy.empty(len(records), dtype = [("timestamp", "U19")] + [(name, float) for name in names[1:]])
+    rows["timestamp"] = numpy.datetime_as_string(records["timestamp"], unit = "s")
+    for name in names[1:] :
+        rows[name] = records[name]
+    #end for
+    numpy.savetxt(f, rows, fmt = ",".join(["%s"] + ["%.10g"] * (len(names) - 1)))
+#end write_csv_records
+
+def write_npy_records(path, record_chunks, dtype):
+    '''writes the chunks of records to an .npy file at path as one structured
+    array of the given dtype. The records are spooled to a temporary file until
+    their number is known, so memory stays bounded; the result is renamed into
+    place once complete. returns the number of records.'''
+    nr_records = 0
+    with tempfile.TemporaryFile() as spool :
+        for records in record_chunks :
+            spool.write(records.astype(dtype, copy = False).tobytes())
+            nr_records += len(records)
+        #end for
+        spool.seek(0)
+        fd, temp_path = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(path)), suffix = ".tmp")
+        try :
+            with os.fdopen(fd, "wb") as f :
+                header = \
+                    {
+                        "descr" : numpy.lib.format.dtype_to_descr(dtype),
+                        "fortran_order" : False,
+                        "shape" : (nr_records,),
+                    }
+                numpy.lib.format.write_array_header_1_0(f, header)
+                shutil.copyfileobj(spool, f)
+            #end with
+            os.replace(temp_path, path)
+        except BaseException :
+            os.unlink(temp_path)
+            raise
+        #end try
+    #end with
+    return \
+        nr_records
+#end write_npy_records
+
+def _counted(record_chunks, counts, progress):
+    begin = time.perf_counter()
+    for records in record_chunks :
+        counts[0] += len(records)
+        if progress :
+            elapsed = time.perf_counter() - begin
+            sys.stderr.write("%d rows, %.0f rows/s\n" % (counts[0], counts[0] / max(elapsed, 1e-9)))
+        #end if
+        yield records
+    #end for
+#end _counted
+
+def run_batch(input, output, irradiance = "direct", chunk_rows = default_chunk_rows, processes = 1, progress = False):
+    '''reads sites and times from the file input, a CSV or .npy path ("-" reads CSV
+    from standard input), and writes their positions and irradiance to output
+    ("-" writes CSV to standard output). returns the number of rows and the
+    seconds taken.'''
+    if irradiance not in irradiance_columns :
+        raise ValueError("irradiance must be one of %s" % ", ".join(irradiance_columns))
+    #end if
+    begin = time.perf_counter()
+    counts = [0]
+    with contextlib.nullcontext(sys.stdin) if input == "-" else open(input, newline = "") as infile :
+        if input != "-" and input.endswith(".npy") :
+            chunks = read_npy_chunks(input, chunk_rows)
+        else :
+            chunks = read_csv_chunks(infile, chunk_rows)
+        #end if
+        record_chunks = _counted(compute_chunks(chunks, irradiance, processes), counts, progress)
+        if output != "-" and output.endswith(".npy") :
+            write_npy_records(output, record_chunks, get_record_dtype(irradiance))
+        else :
+            with contextlib.nullcontext(sys.stdout) if output == "-" else open(output, "w", newline = "") as outfile :
+                write_csv_records(outfile, numpy.empty(0, dtype = get_record_dtype(irradiance)), header = True)
+                for records in record_chunks :
+                    write_csv_records(outfile, records)
+                #end for
+            #end with
+        #end if
+    #end with
+    return \
+        counts[0], time.perf_counter() - begin
+#end run_batch
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m pysolar", description = "Solar positions and irradiance for a table of sites and times")
+    parser.add_argument("input", help = "CSV or .npy file of latitude, longitude, elevation and timestamp; - for CSV on standard input")
+    parser.add_argument("-o", "--output", default = "-", help = "CSV or .npy output file (default: CSV on standard output)")
+    parser.add_argument("--irradiance", choices = tuple(irradiance_columns), default = "direct", help = "irradiance columns to add (default: %(default)s)")
+    parser.add_argument("--chunk-rows", type = int, default = default_chunk_rows, help = "rows per chunk (default: %(default)s)")
+    parser.add_argument("--processes", type = int, default = 1, help = "worker processes (default: %(default)s)")
+    parser.add_argument("--progress", action = "store_true", help = "report progress after each chunk")
+    args = parser.parse_args(argv)
+    try :
+        nr_rows, seconds = run_batch(args.input, args.output, args.irradiance, args.chunk_rows, args.processes, args.progress)
+    except ValueError as error :
+        parser.error("%s: %s" % (args.input, error))
+    #end try
+    sys.stderr.write("%d rows in %.2f s, %.0f rows/s\n" % (nr_rows, seconds, nr_rows / max(seconds, 1e-9)))
+    return \
+        0
+#end main
@@ -0,0 +1,19 @@
+# Stubs for pysolar.batch (Python 3.6)
+
+import numpy
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+default_chunk_rows: int
+irradiance_columns: Dict[str, Tuple[str, ...]]
+column_aliases: Dict[str, Tuple[str, ...]]
+
+def get_record_dtype(irradiance:str = ...) -> numpy.dtype: ...
+def parse_timestamps(values:Any) -> numpy.ndarray: ...
+def read_csv_chunks(f:TextIO, chunk_rows:int = ...) -> Iterator[Dict[str, numpy.ndarray]]: ...
+def read_npy_chunks(path:str, chunk_rows:int = ...) -> Iterator[Dict[str, numpy.ndarray]]: ...
+def get_batch_records(latitude_deg:Any, longitude_deg:Any, elevation:Any, when:Any, irradiance:str = ...) -> numpy.ndarray: ...
+def compute_chunks(chunks:Iterable[Dict[str, numpy.ndarray]], irradiance:str = ..., processes:int = ...) -> Iterator[numpy.ndarray]: ...
+def write_csv_records(f:TextIO, records:numpy.ndarray, header:bool = ...) -> None: ...
+def write_npy_records(path:str, record_chunks:Iterable[numpy.ndarray], dtype:numpy.dtype) -> int: ...
+def run_batch(input:str, output:str, irradiance:str = ..., chunk_rows:int = ..., processes:int = ..., progress:bool = ...) -> Tuple[int, float]: ...
+def main(argv:Optional[List[str]] = ...) -> int: ...
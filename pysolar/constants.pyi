@@ -1,6 +1,7 @@
 # Stubs for pysolar.constants (Python 3.6)
 
 from typing import Dict, List, Tuple
+import numpy
 
 aberration_coeffs: Dict[str,float]
 
@@ -21,3 +22,9 @@ nutation_coefficients: List[Tuple[float, float, float, float]]
 heliocentric_longitude_coeffs: List[List[Tuple[float, float, float]]]
 heliocentric_latitude_coeffs: List[List[Tuple[float, float, float]]]
 sun_earth_distance_coeffs: List[List[Tuple[float, float, float]]]
+tables: Tuple[str, ...]
+series_tables: Tuple[str, ...]
+table_directory: str
+
+def get_table(name:str) -> numpy.ndarray: ...
+def get_table_lists(name:str) -> List: ...
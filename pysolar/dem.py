@@ -0,0 +1,288 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Horizon profiles computed from a local digital elevation model
+
+The elevation raster is a 2-dimensional array in a projected coordinate
+system with square cells measured in metres: x increases to the east along
+columns and y to the north, with row 0 at the north edge, as in ESRI ASCII
+grids. Rasters are read from .npy files, memory-mapped so that the worker
+processes of a pool share one copy, or converted once from ASCII grids.
+
+For each site, rays are marched outwards along every azimuth of the profile
+at once, sampling the terrain by bilinear interpolation. The elevation angle
+of each sample is lowered by the curvature of the earth, reduced by
+atmospheric refraction, and the horizon is the highest angle along each ray.
+"""
+import concurrent.futures
+import hashlib
+import os
+import tempfile
+import numpy
+from . import constants
+from .horizon import HorizonProfile
+
+refraction_coefficient = 0.13 # typical ratio of the radius of the earth to that of a horizontal light ray
+default_max_distance = 20000.0 # metres
+default_resolution_deg = 1.0
+default_observer_height = 2.0 # metres above the terrain
+_distance_block = 256 # ray samples processed at a time, to bound memory
+
+def read_ascii_grid(path):
+    "reads an ESRI ASCII grid, returning (values, header) where values is a float32" \
+    " array with row 0 at the north edge and header a dict of the lower-cased header" \
+    " keys, such as ncols, nrows, xllcorner, yllcorner, cellsize and nodata_value."
+    header = {}
+    with open(path) as f :
+        while True :
+            position = f.tell()
+            line = f.readline()
+            fields = line.split()
+            if len(fields) != 2 or not fields[0][0].isalpha() :
+                f.seek(position)
+                break
+            #end if
+            header[fields[0].lower()] = float(fields[1])
+        #end while
+        values = numpy.loadtxt(f, dtype = numpy.float32, ndmin = 2)
+    #end with
+    if values.shape != (int(header["nrows"]), int(header["ncols"])) :
+        raise ValueError("%s: grid has shape %s, header says %d x %d" % (path, values.shape, header["nrows"], header["ncols"]))
+    #end if
+    return \
+        values, header
+#end read_ascii_grid
+
+class ElevationRaster :
+    '''Terrain elevations in metres on square cells of cell_size metres, with the
+    north-west corner of the raster at (x_west, y_north). Cells equal to nodata
+    count as unknown terrain. path, if set, is the .npy file the values were
+    memory-mapped from, which pools of worker processes reopen.'''
+
+    def __init__(self, values, x_west, y_north, cell_size, nodata = None, path = None) :
+        if numpy.ndim(values) != 2 :
+            raise ValueError("an elevation raster must be 2-dimensional")
+        #end if
+        self.values = values
+        self.x_west = float(x_west)
+        self.y_north = float(y_north)
+        self.cell_size = float(cell_size)
+        self.nodata = nodata
+        self.path = path
+    #end __init__
+
+    @classmethod
+    def load(cls, path, x_west, y_north, cell_size, nodata = None) :
+        "memory-maps the raster from a .npy file."
+        return \
+            cls(numpy.load(path, mmap_mode = "r"), x_west, y_north, cell_size, nodata, path)
+    #end load
+
+    @classmethod
+    def from_ascii_grid(cls, path, npy_path = None) :
+        "converts an ESRI ASCII grid to a .npy file, by default path with .npy appended," \
+        " and memory-maps it. The .npy file is rewritten unless it holds the values of" \
+        " the grid already."
+        if npy_path is None :
+            npy_path = path + ".npy"
+        #end if
+        values, header = read_ascii_grid(path)
+        try :
+            current = numpy.array_equal(numpy.load(npy_path, mmap_mode = "r"), values, equal_nan = True)
+        except (OSError, ValueError) :
+            current = False
+        #end try
+        if not current :
+            fd, temp_path = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(npy_path)), suffix = ".npy")
+            with os.fdopen(fd, "wb") as f :
+                numpy.save(f, values)
+            #end with
+            os.replace(temp_path, npy_path)
+        #end if
+        cell_size = header["cellsize"]
+        if "xllcenter" in header :
+            x_west = header["xllcenter"] - cell_size / 2
+            y_south = header["yllcenter"] - cell_size / 2
+        else :
+            x_west = header["xllcorner"]
+            y_south = header["yllcorner"]
+        #end if
+        return \
+            cls.load(npy_path, x_west, y_south + values.shape[0] * cell_size, cell_size, header.get("nodata_value"))
+    #end from_ascii_grid
+
+    def get_arguments(self) :
+        "returns the arguments of load that reopen this raster."
+        if self.path is None :
+            raise ValueError("raster is not backed by a .npy file")
+        #end if
+        return \
+            (self.path, self.x_west, self.y_north, self.cell_size, self.nodata)
+    #end get_arguments
+
+    def sample(self, x, y) :
+        "returns the terrain elevation at the points (x, y) by bilinear interpolation" \
+        " between cell centres, NaN outside the raster or next to nodata cells."
+        nr_rows, nr_cols = self.values.shape
+        column = (numpy.asarray(x) - self.x_west) / self.cell_size - 0.5
+        row = (self.y_north - numpy.asarray(y)) / self.cell_size - 0.5
+        inside = (column >= 0) & (column <= nr_cols - 1) & (row >= 0) & (row <= nr_rows - 1)
+        column = numpy.where(inside, column, 0)
+        row = numpy.where(inside, row, 0)
+        j = numpy.minimum(column.astype(numpy.intp), max(nr_cols - 2, 0))
+        i = numpy.minimum(row.astype(numpy.intp), max(nr_rows - 2, 0))
+        u = column - j
+        v = row - i
+        j1 = numpy.minimum(j + 1, nr_cols - 1)
+        i1 = numpy.minimum(i + 1, nr_rows - 1)
+        corners = [numpy.asarray(self.values[a, b], dtype = float) for a, b in ((i, j), (i, j1), (i1, j), (i1, j1))]
+        if self.nodata is not None :
+            corners = [numpy.where(corner == self.nodata, numpy.nan, corner) for corner in corners]
+        #end if
+        top = corners[0] + u * (corners[1] - corners[0])
+        bottom = corners[2] + u * (corners[3] - corners[2])
+        return \
+            numpy.where(inside, top + v * (bottom - top), numpy.nan)
+    #end sample
+
+#end ElevationRaster
+
+def get_horizon(raster, x, y, observer_height = default_observer_height, resolution_deg = default_resolution_deg, max_distance = default_max_distance, step = None):
+    '''Horizon profile seen from (x, y), observer_height metres above the terrain,
+    by marching rays every step metres (default: the raster cell size) out to
+    max_distance along each azimuth of the profile. Azimuths along which no
+    terrain is known give a horizon of -90 degrees; a site outside the raster or
+    next to nodata cells raises ValueError.'''
+    if step is None :
+        step = raster.cell_size
+    #end if
+    nr_azimuths = int(round(360 / resolution_deg))
+    azimuth_rad = numpy.radians(numpy.arange(nr_azimuths) * (360 / nr_azimuths))
+    east = numpy.sin(azimuth_rad)[:, None]
+    north = numpy.cos(azimuth_rad)[:, None]
+    observer = raster.sample(x, y) + observer_height
+    if numpy.isnan(observer) :
+        raise ValueError("no terrain elevation known at site (%g, %g)" % (x, y))
+    #end if
+    distance = numpy.arange(1, int(max_distance / step) + 1) * step
+    horizon = numpy.full(nr_azimuths, -90.0)
+    for first in range(0, len(distance), _distance_block) :
+        d = distance[first : first + _distance_block]
+        terrain = raster.sample(x + east * d, y + north * d)
+        drop = d * d * (1 - refraction_coefficient) / (2 * constants.earth_radius)
+        angle = numpy.degrees(numpy.arctan2(terrain - drop - observer, d))
+        horizon = numpy.fmax(horizon, numpy.where(numpy.isnan(angle), -90.0, angle).max(axis = 1))
+    #end for
+    return \
+        HorizonProfile(horizon)
+#end get_horizon
+
+_worker_raster = None
+
+def _init_worker(arguments):
+    global _worker_raster
+    _worker_raster = ElevationRaster.load(*arguments)
+#end _init_worker
+
+def _get_worker_horizon(arguments):
+    return \
+        get_horizon(_worker_raster, *arguments).elevation_deg
+#end _get_worker_horizon
+
+def get_fingerprint(raster):
+    "returns a string identifying the contents and placement of raster: the size and" \
+    " modification time of its .npy file, or a hash of its values if it has none."
+    if raster.path is not None :
+        info = os.stat(raster.path)
+        contents = (os.path.abspath(raster.path), info.st_size, info.st_mtime_ns)
+    else :
+        values = numpy.ascontiguousarray(raster.values)
+        contents = (values.shape, values.dtype.str, hashlib.sha1(values.data).hexdigest())
+    #end if
+    return \
+        repr(contents + (raster.x_west, raster.y_north, raster.cell_size, raster.nodata))
+#end get_fingerprint
+
+def get_cache_path(cache_directory, fingerprint, site, parameters):
+    "returns the file in cache_directory holding the horizon for site computed with" \
+    " the given parameters on the raster with the given get_fingerprint."
+    key = repr((fingerprint, tuple(float(v) for v in site), parameters))
+    return \
+        os.path.join(cache_directory, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+#end get_cache_path
+
+def get_horizons(raster, sites, observer_height = default_observer_height, resolution_deg = default_resolution_deg, max_distance = default_max_distance, step = None, cache_directory = None, max_workers = None):
+    '''Horizon profiles for many sites, given as an (n, 2) array of (x, y) in the
+    coordinates of raster, in the same order.
+
+    Profiles found in cache_directory for the current contents of the raster are
+    loaded; the others are computed, in
+    max_workers processes that memory-map the raster file, or a temporary copy of
+    an in-memory raster (default: one per CPU; 1 computes in this process), and
+    saved there.
+    '''
+    sites = numpy.asarray(sites, dtype = float).reshape(-1, 2)
+    parameters = (float(observer_height), float(resolution_deg), float(max_distance), step)
+    result = [None] * len(sites)
+    if cache_directory is not None :
+        fingerprint = get_fingerprint(raster)
+    #end if
+    todo = []
+    for index, site in enumerate(sites) :
+        if cache_directory is not None :
+            path = get_cache_path(cache_directory, fingerprint, site, parameters)
+            if os.path.exists(path) :
+                result[index] = HorizonProfile.load(path)
+                continue
+            #end if
+        #end if
+        todo.append(index)
+    #end for
+    arguments = [(sites[index, 0], sites[index, 1]) + parameters for index in todo]
+    if max_workers is None :
+        max_workers = os.cpu_count() or 1
+    #end if
+    if max_workers == 1 or len(todo) <= 1 :
+        computed = (get_horizon(raster, *args) for args in arguments)
+    else :
+        with tempfile.TemporaryDirectory() as directory :
+            if raster.path is None :
+                # the workers memory-map a temporary copy of an in-memory raster
+                path = os.path.join(directory, "raster.npy")
+                numpy.save(path, raster.values)
+                raster_arguments = (path, raster.x_west, raster.y_north, raster.cell_size, raster.nodata)
+            else :
+                raster_arguments = raster.get_arguments()
+            #end if
+            with concurrent.futures.ProcessPoolExecutor(max_workers, initializer = _init_worker, initargs = (raster_arguments,)) as pool :
+                chunksize = max(1, len(todo) // (4 * max_workers))
+                computed = [HorizonProfile(elevation_deg) for elevation_deg in pool.map(_get_worker_horizon, arguments, chunksize = chunksize)]
+            #end with
+        #end with
+    #end if
+    if cache_directory is not None :
+        os.makedirs(cache_directory, exist_ok = True)
+    #end if
+    for index, profile in zip(todo, computed) :
+        if cache_directory is not None :
+            profile.save(get_cache_path(cache_directory, fingerprint, sites[index], parameters))
+        #end if
+        result[index] = profile
+    #end for
+    return \
+        result
+#end get_horizons
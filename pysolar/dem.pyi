@@ -0,0 +1,34 @@
+# Stubs for pysolar.dem (Python 3.6)
+
+import numpy
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .horizon import HorizonProfile
+
+refraction_coefficient: float
+default_max_distance: float
+default_resolution_deg: float
+default_observer_height: float
+
+ArrayLike = Union[numpy.ndarray, float]
+
+def read_ascii_grid(path:str) -> Tuple[numpy.ndarray, Dict[str, float]]: ...
+
+class ElevationRaster:
+    values: numpy.ndarray
+    x_west: float
+    y_north: float
+    cell_size: float
+    nodata: Optional[float]
+    path: Optional[str]
+    def __init__(self, values:numpy.ndarray, x_west:float, y_north:float, cell_size:float, nodata:Optional[float] = ..., path:Optional[str] = ...) -> None: ...
+    @classmethod
+    def load(cls, path:str, x_west:float, y_north:float, cell_size:float, nodata:Optional[float] = ...) -> 'ElevationRaster': ...
+    @classmethod
+    def from_ascii_grid(cls, path:str, npy_path:Optional[str] = ...) -> 'ElevationRaster': ...
+    def get_arguments(self) -> Tuple[str, float, float, float, Optional[float]]: ...
+    def sample(self, x:ArrayLike, y:ArrayLike) -> numpy.ndarray: ...
+
+def get_horizon(raster:ElevationRaster, x:float, y:float, observer_height:float = ..., resolution_deg:float = ..., max_distance:float = ..., step:Optional[float] = ...) -> HorizonProfile: ...
+def get_fingerprint(raster:ElevationRaster) -> str: ...
+def get_cache_path(cache_directory:str, fingerprint:str, site:numpy.ndarray, parameters:Tuple[Any, ...]) -> str: ...
+def get_horizons(raster:ElevationRaster, sites:numpy.ndarray, observer_height:float = ..., resolution_deg:float = ..., max_distance:float = ..., step:Optional[float] = ..., cache_directory:Optional[str] = ..., max_workers:Optional[int] = ...) -> List[HorizonProfile]: ...
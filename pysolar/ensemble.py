@@ -0,0 +1,260 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Ensembles of REST2 clear-sky runs over sampled atmospheres
+
+The position of the sun does not depend on the atmosphere, so it is computed
+once for all sites and times; the REST2 model in rest.py is then evaluated
+for batches of atmosphere samples along a leading ensemble axis. Each batch
+is folded into running summaries and dropped, so memory does not grow with
+the number of samples.
+
+Means, standard deviations, minima and maxima are exact; the moments of each
+batch are merged into the running ones as in Chan, Golub and LeVeque, which
+stays accurate where a sum of squares would cancel.
+
+Percentiles are estimated with the P-square algorithm of Jain and Chlamtac
+(1985), which keeps five markers per percentile for every site and time:
+with the moments, 272 bytes per site and time for three percentiles,
+whatever the number of members. The markers start at the exact percentiles
+of the first batch, so a single batch gives exact results; later batches
+move them by interpolation, which is typically good to a few percent of the
+spread of the members but has no guaranteed bound.
+"""
+import numpy
+from . import numeric, rest, solar
+
+atmosphere_parameters = \
+    (
+        "pressure_millibars",
+        "ozone_atm_cm",
+        "nitrogen_atm_cm",
+        "precipitable_water_cm",
+        "turbidity_alpha",
+        "turbidity_beta",
+        "ground_albedo",
+    )
+default_percentiles = (5, 50, 95)
+default_batch_size = 64
+
+class StreamingSummary :
+    '''Running count, mean, standard deviation, minimum, maximum and estimates of
+    the given percentiles, which must lie strictly between 0 and 100, of arrays
+    of a fixed shape, added in batches along a leading axis.'''
+
+    def __init__(self, shape, percentiles = default_percentiles) :
+        self.shape = tuple(shape)
+        self.percentiles = tuple(percentiles)
+        fractions = numpy.asarray(self.percentiles, dtype = float) / 100
+        if numpy.any((fractions <= 0) | (fractions >= 1)) :
+            raise ValueError("percentiles must lie strictly between 0 and 100; see min and max")
+        #end if
+        self.count = 0
+        self._mean = numpy.zeros(self.shape)
+        self._m2 = numpy.zeros(self.shape) # sum of squared deviations from the mean
+        self.min = numpy.full(self.shape, numpy.inf)
+        self.max = numpy.full(self.shape, -numpy.inf)
+        # quantiles tracked by the five markers of each percentile
+        self._marker_fractions = \
+            numpy.stack \
+              (
+                [numpy.zeros_like(fractions), fractions / 2, fractions, (1 + fractions) / 2, numpy.ones_like(fractions)],
+                axis = 1
+              ).reshape((len(fractions), 5) + (1,) * len(self.shape))
+        # (percentile, marker) + shape heights and positions, once started
+        self._heights = None
+        self._positions = None
+        self._first = [] # batches held until there are enough values to start the markers
+    #end __init__
+
+    def _start_markers(self, values) :
+        # the linear percentiles of numpy lie at rank 1 + (count - 1) * fraction,
+        # the desired positions of the markers
+        nr_markers = self._marker_fractions.shape[:2]
+        self._heights = numpy.percentile(values, 100 * self._marker_fractions.reshape(-1), axis = 0).reshape(nr_markers + self.shape)
+        self._positions = numpy.broadcast_to(1 + (len(values) - 1) * self._marker_fractions, self._heights.shape).copy()
+    #end _start_markers
+
+    def _add_marker_value(self, value, count) :
+        # one step of P-square for every percentile and element; count includes value
+        q = self._heights
+        n = self._positions
+        numpy.minimum(q[:, 0], value, out = q[:, 0])
+        numpy.maximum(q[:, 4], value, out = q[:, 4])
+        n[:, 1:4] += value < q[:, 1:4]
+        n[:, 4] += 1
+        desired = 1 + (count - 1) * self._marker_fractions
+        for i in (1, 2, 3) :
+            d = desired[:, i] - n[:, i]
+            step = \
+                (
+                    ((d >= 1) & (n[:, i + 1] - n[:, i] > 1)).astype(float)
+                -
+                    ((d <= -1) & (n[:, i - 1] - n[:, i] < -1))
+                )
+            if not step.any() :
+                continue
+            #end if
+            parabolic = \
+                (
+                    q[:, i]
+                +
+                        step / (n[:, i + 1] - n[:, i - 1])
+                    *
+                        (
+                            (n[:, i] - n[:, i - 1] + step) * (q[:, i + 1] - q[:, i]) / (n[:, i + 1] - n[:, i])
+                        +
+                            (n[:, i + 1] - n[:, i] - step) * (q[:, i] - q[:, i - 1]) / (n[:, i] - n[:, i - 1])
+                        )
+                )
+            up = step > 0
+            neighbour = numpy.where(up, q[:, i + 1], q[:, i - 1])
+            neighbour_position = numpy.where(up, n[:, i + 1], n[:, i - 1])
+            linear = q[:, i] + step * (neighbour - q[:, i]) / (neighbour_position - n[:, i])
+            moved = numpy.where((q[:, i - 1] < parabolic) & (parabolic < q[:, i + 1]), parabolic, linear)
+            q[:, i] = numpy.where(step != 0, moved, q[:, i])
+            n[:, i] += step
+        #end for
+    #end _add_marker_value
+
+    def add(self, values) :
+        "folds in a batch of arrays stacked along a leading axis."
+        values = numpy.broadcast_to(values, values.shape[:1] + self.shape)
+        nr_values = len(values)
+        if nr_values == 0 :
+            return
+        #end if
+        # merge the moments of the batch into the running ones
+        batch_mean = values.mean(axis = 0)
+        batch_m2 = numpy.square(values - batch_mean).sum(axis = 0)
+        count = self.count + nr_values
+        delta = batch_mean - self._mean
+        self._mean += delta * (nr_values / count)
+        self._m2 += batch_m2 + numpy.square(delta) * (self.count * nr_values / count)
+        numpy.minimum(self.min, values.min(axis = 0), out = self.min)
+        numpy.maximum(self.max, values.max(axis = 0), out = self.max)
+        if self._heights is None :
+            self._first.append(numpy.array(values))
+            if count >= 5 :
+                self._start_markers(numpy.concatenate(self._first))
+                self._first = None
+            #end if
+        else :
+            for index, value in enumerate(values) :
+                self._add_marker_value(value, self.count + index + 1)
+            #end for
+        #end if
+        self.count = count
+    #end add
+
+    @property
+    def mean(self) :
+        return \
+            self._mean.copy()
+    #end mean
+
+    @property
+    def std(self) :
+        return \
+            numpy.sqrt(self._m2 / self.count)
+    #end std
+
+    def get_percentiles(self) :
+        "returns an array of the estimated percentiles, along a leading axis."
+        if self._heights is None :
+            # fewer than five values, all kept
+            return \
+                numpy.percentile(numpy.concatenate(self._first), self.percentiles, axis = 0)
+        #end if
+        return \
+            numpy.clip(self._heights[:, 2], self.min, self.max)
+    #end get_percentiles
+
+    def get_summary(self) :
+        "returns a dict of \"count\", \"mean\", \"std\", \"min\", \"max\" and \"percentiles\"."
+        return \
+            {
+                "count" : self.count,
+                "mean" : self.mean,
+                "std" : self.std,
+                "min" : self.min.copy(),
+                "max" : self.max.copy(),
+                "percentiles" : self.get_percentiles(),
+            }
+    #end get_summary
+
+#end StreamingSummary
+
+def get_ensemble_summary(altitude_deg, samples, components = ("global",), percentiles = default_percentiles, batch_size = default_batch_size, irradiance = rest.get_clear_sky_irradiance):
+    '''Summaries of REST2 irradiance at the given solar altitudes over an ensemble
+    of atmospheres.
+
+    samples is a dict mapping names from atmosphere_parameters to 1-dimensional
+    arrays of equal length, one entry per ensemble member; the other parameters
+    keep their rest defaults. A parameter may also be given per member and per
+    altitude, as an array with the ensemble axis first. irradiance is called
+    as rest.get_clear_sky_irradiance is, and returns a dict containing the
+    components.
+
+    returns a dict mapping each component ("direct_normal", "beam", "diffuse",
+    "backscattered" or "global") to a StreamingSummary.get_summary dict whose
+    arrays have the shape of altitude_deg, with a leading percentile axis for
+    "percentiles".
+    '''
+    altitude_deg = numpy.asarray(altitude_deg, dtype = float)
+    unknown = set(samples) - set(atmosphere_parameters)
+    if unknown :
+        raise ValueError("unknown atmosphere parameters: %s" % ", ".join(sorted(unknown)))
+    #end if
+    if len(samples) == 0 :
+        raise ValueError("samples must give at least one atmosphere parameter")
+    #end if
+    samples = {name : numpy.asarray(value, dtype = float) for name, value in samples.items()}
+    nr_members = len(next(iter(samples.values())))
+    if any(len(value) != nr_members for value in samples.values()) :
+        raise ValueError("all samples must have the same number of members")
+    #end if
+    if nr_members == 0 :
+        raise ValueError("samples must have at least one member")
+    #end if
+    summaries = {component : StreamingSummary(altitude_deg.shape, percentiles) for component in components}
+    for first in range(0, nr_members, batch_size) :
+        batch = \
+            {
+                # members along a new leading axis, broadcasting against the altitudes
+                name : value[first : first + batch_size].reshape((-1,) + value.shape[1:] + (1,) * (altitude_deg.ndim + 1 - value.ndim))
+                for name, value in samples.items()
+            }
+        result = irradiance(altitude_deg, **batch)
+        for component, summary in summaries.items() :
+            summary.add(result[component])
+        #end for
+    #end for
+    return \
+        {component : summary.get_summary() for component, summary in summaries.items()}
+#end get_ensemble_summary
+
+def get_site_ensemble_summary(latitude_deg, longitude_deg, when, samples, elevation = 0, **kwargs):
+    "computes the solar altitude once with solar.get_position for all sites and times," \
+    " which must broadcast together, and returns get_ensemble_summary for it. The" \
+    " position is computed with the numpy backend."
+    with numeric.backend("numpy") :
+        altitude_deg = solar.get_position(latitude_deg, longitude_deg, when, elevation)[1]
+    #end with
+    return \
+        get_ensemble_summary(altitude_deg, samples, **kwargs)
+#end get_site_ensemble_summary
@@ -0,0 +1,29 @@
+# Stubs for pysolar.ensemble (Python 3.6)
+
+import datetime
+import numpy
+from typing import Any, Callable, Dict, Sequence, Tuple, Union
+
+atmosphere_parameters: Tuple[str, ...]
+default_percentiles: Tuple[float, ...]
+default_batch_size: int
+
+ArrayLike = Union[numpy.ndarray, float]
+
+class StreamingSummary:
+    shape: Tuple[int, ...]
+    percentiles: Tuple[float, ...]
+    count: int
+    min: numpy.ndarray
+    max: numpy.ndarray
+    def __init__(self, shape:Sequence[int], percentiles:Sequence[float] = ...) -> None: ...
+    def add(self, values:numpy.ndarray) -> None: ...
+    @property
+    def mean(self) -> numpy.ndarray: ...
+    @property
+    def std(self) -> numpy.ndarray: ...
+    def get_percentiles(self) -> numpy.ndarray: ...
+    def get_summary(self) -> Dict[str, Any]: ...
+
+def get_ensemble_summary(altitude_deg:ArrayLike, samples:Dict[str, numpy.ndarray], components:Sequence[str] = ..., percentiles:Sequence[float] = ..., batch_size:int = ..., irradiance:Callable[..., Dict[str, numpy.ndarray]] = ...) -> Dict[str, Dict[str, Any]]: ...
+def get_site_ensemble_summary(latitude_deg:ArrayLike, longitude_deg:ArrayLike, when:Union[datetime.datetime, numpy.ndarray], samples:Dict[str, numpy.ndarray], elevation:ArrayLike = ..., **kwargs:Any) -> Dict[str, Dict[str, Any]]: ...
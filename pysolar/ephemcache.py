@@ -0,0 +1,244 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""A persistent on-disk cache of solar positions over whole years
+
+    with ephemcache.EphemerisCache("~/.cache/pysolar") as cache :
+        positions = cache.get_site_year(42.36, -71.11, 2024, step_minutes = 10)
+    #end with
+
+Each entry holds the positions of the sun at one site every step_minutes
+through one UTC calendar year, as a .npy file of year_dtype records that is
+memory-mapped read-only when loaded. An SQLite index in the same directory
+maps the parameters of each entry to its file, size and time of last use,
+and may be shared by several processes.
+
+Entries are keyed by their parameters, the engine, the pysolar version and a
+fingerprint of the coefficient tables and of the source of the modules that
+compute positions, so any change to those invalidates the cache: entries
+with another fingerprint are never returned. They are left in place for
+the installation that wrote them, which may share the directory, and age
+out with the others: when the files exceed max_bytes, the least recently
+used entries are deleted, whichever fingerprint they have.
+"""
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import numpy
+from . import constants, numeric, solar, solartime
+
+index_name = "index.sqlite"
+engines = ("numpy", "fast")
+default_max_bytes = 1 << 30
+default_chunk_steps = 100000
+year_dtype = numpy.dtype \
+  (
+    [
+        ("time", "datetime64[s]"),
+        ("azimuth", float),
+        ("altitude", float),
+    ]
+  )
+
+@functools.lru_cache(maxsize = None)
+def get_fingerprint():
+    "returns a digest of the pysolar version, the coefficient tables and the source of" \
+    " the modules computing positions."
+    digest = hashlib.sha1()
+    try :
+        version = importlib.metadata.version("pysolar")
+    except importlib.metadata.PackageNotFoundError :
+        version = "unknown"
+    #end try
+    digest.update(version.encode())
+    paths = \
+        (
+            [os.path.join(constants.table_directory, name + ".npy") for name in constants.tables]
+        +
+            [module.__file__ for module in (constants, numeric, solar, solartime)]
+        )
+    for path in paths :
+        with open(path, "rb") as f :
+            digest.update(f.read())
+        #end with
+    #end for
+    return \
+        digest.hexdigest()
+#end get_fingerprint
+
+def get_year_times(year, step_minutes):
+    "returns the UTC datetime64 times every step_minutes through the given year."
+    start = numpy.datetime64("%04d-01-01T00:00:00" % year, "s")
+    step = numpy.timedelta64(int(round(step_minutes * 60)), "s")
+    nr_steps = int((numpy.datetime64("%04d-01-01T00:00:00" % (year + 1), "s") - start) // step)
+    return \
+        start + numpy.arange(nr_steps) * step
+#end get_year_times
+
+def _get_positions(engine, latitude_deg, longitude_deg, when, elevation, temperature, pressure):
+    with numeric.backend("numpy") :
+        if engine == "fast" :
+            return \
+                solar.get_azimuth_fast(latitude_deg, longitude_deg, when), solar.get_altitude_fast(latitude_deg, longitude_deg, when)
+        #end if
+        return \
+            solar.get_position(latitude_deg, longitude_deg, when, elevation, temperature, pressure)
+    #end with
+#end _get_positions
+
+class EphemerisCache :
+    '''Cache of site-year positions in directory, created if needed, holding at most
+    about max_bytes of position files.'''
+
+    def __init__(self, directory, max_bytes = default_max_bytes) :
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok = True)
+        self._index = sqlite3.connect(os.path.join(self.directory, index_name), timeout = 60, isolation_level = None)
+        self._index.execute \
+          (
+            "create table if not exists entries"
+            " (key text primary key, parameters text, fingerprint text, file text, size integer, last_used real)"
+          )
+    #end __init__
+
+    def __enter__(self) :
+        return \
+            self
+    #end __enter__
+
+    def __exit__(self, *exc_info) :
+        self.close()
+    #end __exit__
+
+    def close(self) :
+        self._index.close()
+    #end close
+
+    def _delete(self, entries) :
+        for key, file in entries :
+            self._index.execute("delete from entries where key = ?", (key,))
+            try :
+                os.unlink(os.path.join(self.directory, file))
+            except FileNotFoundError :
+                pass
+            #end try
+        #end for
+    #end _delete
+
+    def get_size(self) :
+        "returns the total size of the position files, in bytes."
+        return \
+            self._index.execute("select coalesce(sum(size), 0) from entries").fetchone()[0]
+    #end get_size
+
+    def __len__(self) :
+        return \
+            self._index.execute("select count(*) from entries").fetchone()[0]
+    #end __len__
+
+    def clear(self) :
+        "deletes every entry."
+        self._delete(self._index.execute("select key, file from entries").fetchall())
+    #end clear
+
+    def _evict(self, keep) :
+        "deletes the least recently used entries other than keep until the files fit in max_bytes."
+        size = self.get_size()
+        for key, file, entry_size in self._index.execute("select key, file, size from entries where key != ? order by last_used", (keep,)).fetchall() :
+            if size <= self.max_bytes :
+                break
+            #end if
+            self._delete([(key, file)])
+            size -= entry_size
+        #end for
+    #end _evict
+
+    def get_site_year(self, latitude_deg, longitude_deg, year, step_minutes = 60, elevation = 0, temperature = constants.standard_temperature, pressure = constants.standard_pressure, engine = "numpy") :
+        '''returns a read-only memory-mapped array of year_dtype records of the sun's
+        azimuth and altitude at the site every step_minutes through the UTC year,
+        computing and storing it on a miss. engine is "numpy", the full algorithm
+        of solar.get_position, or "fast", solar.get_azimuth_fast and
+        get_altitude_fast, which ignore elevation and refraction.'''
+        if engine not in engines :
+            raise ValueError("engine must be one of %s" % ", ".join(engines))
+        #end if
+        parameters = json.dumps \
+          (
+            {
+                "latitude_deg" : float(latitude_deg),
+                "longitude_deg" : float(longitude_deg),
+                "year" : int(year),
+                "step_minutes" : float(step_minutes),
+                "elevation" : float(elevation),
+                "temperature" : float(temperature),
+                "pressure" : float(pressure),
+                "engine" : engine,
+            },
+            sort_keys = True
+          )
+        key = hashlib.sha1((get_fingerprint() + parameters).encode()).hexdigest()
+        row = self._index.execute("select file from entries where key = ? and fingerprint = ?", (key, get_fingerprint())).fetchone()
+        if row is not None :
+            try :
+                result = numpy.load(os.path.join(self.directory, row[0]), mmap_mode = "r")
+            except FileNotFoundError :
+                # removed by another process since the lookup
+                self._index.execute("delete from entries where key = ?", (key,))
+            else :
+                self._index.execute("update entries set last_used = ? where key = ?", (time.time(), key))
+                return \
+                    result
+            #end try
+        #end if
+        file = key + ".npy"
+        when = get_year_times(year, step_minutes)
+        fd, temp_path = tempfile.mkstemp(dir = self.directory, suffix = ".tmp")
+        os.close(fd)
+        try :
+            # filled in chunks, so memory does not grow with the number of steps
+            records = numpy.lib.format.open_memmap(temp_path, mode = "w+", dtype = year_dtype, shape = when.shape)
+            for first in range(0, len(when), default_chunk_steps) :
+                chunk = when[first : first + default_chunk_steps]
+                azimuth, altitude = _get_positions(engine, latitude_deg, longitude_deg, chunk, elevation, temperature, pressure)
+                records["time"][first : first + len(chunk)] = chunk
+                records["azimuth"][first : first + len(chunk)] = azimuth
+                records["altitude"][first : first + len(chunk)] = altitude
+            #end for
+            records.flush()
+            del records
+            os.replace(temp_path, os.path.join(self.directory, file))
+        except BaseException :
+            os.unlink(temp_path)
+            raise
+        #end try
+        self._index.execute \
+          (
+            "insert or replace into entries values (?, ?, ?, ?, ?, ?)",
+            (key, parameters, get_fingerprint(), file, os.path.getsize(os.path.join(self.directory, file)), time.time())
+          )
+        self._evict(key)
+        return \
+            numpy.load(os.path.join(self.directory, file), mmap_mode = "r")
+    #end get_site_year
+
+#end EphemerisCache
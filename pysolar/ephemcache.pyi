@@ -0,0 +1,25 @@
+# Stubs for pysolar.ephemcache (Python 3.6)
+
+import numpy
+from typing import Any, Tuple
+
+index_name: str
+engines: Tuple[str, ...]
+default_max_bytes: int
+default_chunk_steps: int
+year_dtype: numpy.dtype
+
+def get_fingerprint() -> str: ...
+def get_year_times(year:int, step_minutes:float) -> numpy.ndarray: ...
+
+class EphemerisCache:
+    directory: str
+    max_bytes: int
+    def __init__(self, directory:str, max_bytes:int = ...) -> None: ...
+    def __enter__(self) -> 'EphemerisCache': ...
+    def __exit__(self, *exc_info:Any) -> None: ...
+    def close(self) -> None: ...
+    def get_size(self) -> int: ...
+    def __len__(self) -> int: ...
+    def clear(self) -> None: ...
+    def get_site_year(self, latitude_deg:float, longitude_deg:float, year:int, step_minutes:float = ..., elevation:float = ..., temperature:float = ..., pressure:float = ..., engine:str = ...) -> numpy.ndarray: ...
@@ -0,0 +1,235 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Times at which the sun crosses a given altitude: sunrise, sunset, twilights
+and custom thresholds, for many sites and days at once.
+
+The time-dependent part of the solar position algorithm does not depend on the
+observer, so it is evaluated once on a shared time grid and interpolated. Each
+crossing is then bracketed between the local transit and the neighbouring
+anti-transit, where the altitude changes monotonically, and refined with a
+Newton iteration on the analytic altitude rate, falling back to bisection
+whenever a Newton step leaves the bracket.
+
+Altitudes here are topocentric elevation angles without refraction; the
+standard sunrise threshold of -0.8333 degrees already allows for refraction
+and the radius of the sun.
+
+The computations always use the numpy backend, selected with numeric.backend
+for the duration of each call.
+"""
+import functools
+import numpy
+from . import numeric, solar
+
+sunrise_altitude_deg = -0.8333
+twilight_altitudes_deg = \
+    {
+        'civil' : -6.0,
+        'nautical' : -12.0,
+        'astronomical' : -18.0,
+    }
+hour_angle_rate = 360.9856 # degrees per day, rate of change of the local hour angle of the sun's meridian
+geocentric_grid_step_minutes = 60
+
+def get_geocentric_grid(first_day, nr_days, step_minutes = geocentric_grid_step_minutes):
+    "returns (grid, apparent sidereal time, right ascension, declination, equatorial" \
+    " horizontal parallax) sampled every step_minutes from first_day over nr_days days." \
+    " grid is in days since first_day; the angles are unwrapped so they can be" \
+    " interpolated linearly."
+    with numeric.backend("numpy") :
+        return \
+            _get_geocentric_grid(numpy.datetime64(first_day, 'D'), int(nr_days), step_minutes)
+    #end with
+#end get_geocentric_grid
+
+@functools.lru_cache(maxsize = 8)
+def _get_geocentric_grid(first_day, nr_days, step_minutes):
+    # cached so that a fleet processed in batches of sites shares one evaluation
+    steps = numpy.arange(0, nr_days * 24 * 60 + step_minutes, step_minutes)
+    when = first_day + steps.astype('timedelta64[m]')
+    ast, ra, dec, ehp = solar.get_geocentric_position(when)
+    result = \
+        (
+            steps / (24 * 60),
+            numpy.degrees(numpy.unwrap(numpy.radians(ast))),
+            numpy.degrees(numpy.unwrap(numpy.radians(ra))),
+            dec,
+            ehp,
+        )
+    for values in result :
+        values.flags.writeable = False
+    #end for
+    return \
+        result
+#end _get_geocentric_grid
+
+def _interpolate(grid, t):
+    "linearly interpolates the unwrapped grid angles at times t, given in days since" \
+    " the start of grid. The grid is uniform, so no search is needed."
+    days = grid[0]
+    step = days[1] - days[0]
+    position = numpy.clip(t / step, 0, len(days) - 1.000001)
+    index = position.astype(int)
+    weight = position - index
+    return \
+        tuple(values[index] + weight * (values[index + 1] - values[index]) for values in grid[1:])
+#end _interpolate
+
+def _get_topocentric_altitude(grid, t, site):
+    "returns topocentric elevation angle and its rate of change in degrees per day at" \
+    " times t, given in days since the start of grid, for the sites described by" \
+    " (longitude, sin latitude, cos latitude, projected radial distance, projected" \
+    " axial distance)."
+    longitude_deg, sin_latitude, cos_latitude, projected_radial_distance, projected_axial_distance = site
+    ast, ra, dec, ehp = _interpolate(grid, t)
+    local_hour_angle = solar.get_local_hour_angle(ast, longitude_deg, ra)
+    parallax_sun_right_ascension = solar.get_parallax_sun_right_ascension(projected_radial_distance, ehp, local_hour_angle, dec)
+    topocentric_local_hour_angle = numpy.radians(solar.get_topocentric_local_hour_angle(local_hour_angle, parallax_sun_right_ascension))
+    topocentric_sun_declination = numpy.radians(solar.get_topocentric_sun_declination(dec, projected_axial_distance, ehp, parallax_sun_right_ascension, local_hour_angle))
+    # same as solar.get_topocentric_elevation_angle, reusing the site terms
+    cos_term = cos_latitude * numpy.cos(topocentric_sun_declination)
+    sin_altitude = sin_latitude * numpy.sin(topocentric_sun_declination) + cos_term * numpy.cos(topocentric_local_hour_angle)
+    altitude = numpy.arcsin(sin_altitude)
+    # differentiating sin(h) = sin(phi) sin(delta) + cos(phi) cos(delta) cos(H) with respect to H
+    rate = -cos_term * numpy.sin(topocentric_local_hour_angle) / numpy.cos(altitude) * hour_angle_rate
+    return \
+        numpy.degrees(altitude), rate
+#end _get_topocentric_altitude
+
+def _get_transit(grid, day, longitude_deg):
+    "returns the geocentric transit nearest to local mean noon of each day, in days" \
+    " since the start of grid."
+    t = day + 0.5 - longitude_deg / 360
+    for _ in range(3) :
+        ast, ra = _interpolate(grid, t)[:2]
+        hour_angle = (ast + longitude_deg - ra + 180) % 360 - 180
+        t = t - hour_angle / hour_angle_rate
+    #end for
+    return \
+        t
+#end _get_transit
+
+def get_crossings(latitude_deg, longitude_deg, start, days, altitude_deg, elevation = 0, tolerance_seconds = 1.0, max_iterations = 20):
+    '''Finds the times at which the sun rises and sets through altitude_deg
+    (topocentric elevation angle, without refraction) on each of `days`
+    consecutive dates from `start`.
+
+    The events of a date are the rising before and the setting after the
+    local transit nearest to local mean noon of that date.
+
+    latitude_deg, longitude_deg, elevation (metres) and altitude_deg may be
+    arrays that broadcast together; start is anything numpy.datetime64 accepts as a date.
+
+    returns (rising, setting) as datetime64[s] arrays whose shape is the
+    broadcast shape of the site arguments followed by days. NaT marks dates
+    on which the sun stays above or below altitude_deg.
+    '''
+    with numeric.backend("numpy") :
+        return \
+            _get_crossings(latitude_deg, longitude_deg, start, days, altitude_deg, elevation, tolerance_seconds, max_iterations)
+    #end with
+#end get_crossings
+
+def _get_crossings(latitude_deg, longitude_deg, start, days, altitude_deg, elevation, tolerance_seconds, max_iterations):
+    latitude_deg, longitude_deg, elevation, altitude_deg = \
+        numpy.broadcast_arrays(latitude_deg, longitude_deg, elevation, altitude_deg)
+    shape = latitude_deg.shape + (days,)
+    # work on flat arrays with one element per site and date, so that each
+    # iteration only touches the crossings that have not converged yet
+    latitude_deg, longitude_deg, elevation, altitude_deg = \
+        (
+            numpy.broadcast_to(numpy.asarray(value, dtype = float)[..., None], shape).ravel()
+            for value in (latitude_deg, longitude_deg, elevation, altitude_deg)
+        )
+    # the grid starts a day early and ends a day late so that every bracket lies inside it
+    first_day = numpy.datetime64(start, 'D') - numpy.timedelta64(1, 'D')
+    grid = get_geocentric_grid(first_day, days + 2)
+    day = numpy.broadcast_to(numpy.arange(1, days + 1), shape).ravel()
+    latitude_rad = numpy.radians(latitude_deg)
+    site = \
+        (
+            longitude_deg,
+            numpy.sin(latitude_rad),
+            numpy.cos(latitude_rad),
+            solar.get_projected_radial_distance(elevation, latitude_deg),
+            solar.get_projected_axial_distance(elevation, latitude_deg),
+        )
+
+    def altitude_above_threshold(t, index = slice(None)) :
+        altitude, rate = _get_topocentric_altitude(grid, t, tuple(values[index] for values in site))
+        return \
+            altitude - altitude_deg[index], rate
+    #end altitude_above_threshold
+
+    transit = _get_transit(grid, day, longitude_deg)
+    transit_altitude = altitude_above_threshold(transit)[0]
+    tolerance = tolerance_seconds / 86400
+    declination_rad = numpy.radians(_interpolate(grid, transit)[2])
+    cos_hour_angle = \
+        (
+            (numpy.sin(numpy.radians(altitude_deg)) - site[1] * numpy.sin(declination_rad))
+        /
+            (site[2] * numpy.cos(declination_rad))
+        )
+    crossing_hour_angle = numpy.degrees(numpy.arccos(numpy.clip(cos_hour_angle, -1, 1)))
+    result = []
+    for direction in (-1, +1) :
+        # altitude increases from anti-transit to transit and decreases after
+        outer = transit + direction * 0.5
+        found = (altitude_above_threshold(outer)[0] < 0) & (transit_altitude >= 0)
+        active = numpy.flatnonzero(found)
+        below, above = outer[active], transit[active]
+        # initial guess from the hour angle of the crossing at the transit declination
+        t = transit[active] + direction * crossing_hour_angle[active] / hour_angle_rate
+        crossing = numpy.full(transit.shape, numpy.nan)
+        for _ in range(max_iterations) :
+            f, rate = altitude_above_threshold(t, active)
+            below = numpy.where(f < 0, t, below)
+            above = numpy.where(f < 0, above, t)
+            with numpy.errstate(divide = 'ignore', invalid = 'ignore') :
+                newton = t - f / rate
+            #end with
+            inside = (newton > numpy.minimum(below, above)) & (newton < numpy.maximum(below, above))
+            t_next = numpy.where(inside, newton, (below + above) / 2)
+            converged = (numpy.abs(t_next - t) < tolerance) | (numpy.abs(above - below) < tolerance)
+            crossing[active] = t_next
+            keep = ~converged
+            active, t, below, above = active[keep], t_next[keep], below[keep], above[keep]
+            if len(active) == 0 :
+                break
+            #end if
+        #end for
+        when = first_day + numpy.round(numpy.nan_to_num(crossing) * 86400).astype('timedelta64[s]')
+        result.append(numpy.where(found, when, numpy.datetime64('NaT', 's')).reshape(shape))
+    #end for
+    return \
+        tuple(result)
+#end _get_crossings
+
+def get_sunrise_sunset(latitude_deg, longitude_deg, start, days, elevation = 0):
+    "returns (sunrise, sunset) datetime64[s] arrays for each date; see get_crossings."
+    return \
+        get_crossings(latitude_deg, longitude_deg, start, days, sunrise_altitude_deg, elevation)
+#end get_sunrise_sunset
+
+def get_twilight(latitude_deg, longitude_deg, start, days, kind = 'civil', elevation = 0):
+    "returns (dawn, dusk) datetime64[s] arrays for each date, where kind is 'civil'," \
+    " 'nautical' or 'astronomical'; see get_crossings."
+    return \
+        get_crossings(latitude_deg, longitude_deg, start, days, twilight_altitudes_deg[kind], elevation)
+#end get_twilight
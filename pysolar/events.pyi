@@ -0,0 +1,16 @@
+# Stubs for pysolar.events (Python 3.6)
+
+import numpy
+from typing import Dict, Tuple, Union
+
+sunrise_altitude_deg: float
+twilight_altitudes_deg: Dict[str, float]
+hour_angle_rate: float
+geocentric_grid_step_minutes: int
+
+ArrayLike = Union[numpy.ndarray, float]
+
+def get_geocentric_grid(first_day:numpy.datetime64, nr_days:int, step_minutes:int = ...) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: ...
+def get_crossings(latitude_deg:ArrayLike, longitude_deg:ArrayLike, start:numpy.datetime64, days:int, altitude_deg:ArrayLike, elevation:ArrayLike = ..., tolerance_seconds:float = ..., max_iterations:int = ...) -> Tuple[numpy.ndarray, numpy.ndarray]: ...
+def get_sunrise_sunset(latitude_deg:ArrayLike, longitude_deg:ArrayLike, start:numpy.datetime64, days:int, elevation:ArrayLike = ...) -> Tuple[numpy.ndarray, numpy.ndarray]: ...
+def get_twilight(latitude_deg:ArrayLike, longitude_deg:ArrayLike, start:numpy.datetime64, days:int, kind:str = ..., elevation:ArrayLike = ...) -> Tuple[numpy.ndarray, numpy.ndarray]: ...
@@ -0,0 +1,123 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Horizon profiles for shading
+
+A horizon profile gives the elevation angle of the skyline, in degrees, at
+evenly spaced azimuths starting from north and going clockwise, as
+returned by solar.get_azimuth. The sun is blocked when its altitude is
+below the skyline at its azimuth. Profiles interpolate periodically in
+azimuth, so any angular resolution can be used, and queries over arrays of
+sun positions are a single gather into the profile.
+"""
+import os
+import tempfile
+import numpy
+
+interpolations = ("nearest", "linear")
+
+class HorizonProfile :
+    '''Skyline elevation in degrees sampled at len(elevation_deg) evenly spaced
+    azimuths, the first one due north.'''
+
+    def __init__(self, elevation_deg) :
+        elevation_deg = numpy.asarray(elevation_deg, dtype = numpy.float32)
+        if elevation_deg.ndim != 1 or len(elevation_deg) == 0 :
+            raise ValueError("a horizon profile needs a non-empty 1-dimensional array of elevations")
+        #end if
+        self.elevation_deg = elevation_deg
+    #end __init__
+
+    @property
+    def resolution_deg(self) :
+        "the azimuth step between samples, in degrees."
+        return \
+            360 / len(self.elevation_deg)
+    #end resolution_deg
+
+    @classmethod
+    def from_samples(cls, azimuth_deg, elevation_deg, resolution_deg = 1.0) :
+        "builds a profile of the given resolution by periodic linear interpolation of" \
+        " skyline elevations measured at arbitrary azimuths."
+        nr_samples = int(round(360 / resolution_deg))
+        return \
+            cls \
+              (
+                numpy.interp
+                  (
+                    numpy.arange(nr_samples) * (360 / nr_samples),
+                    numpy.asarray(azimuth_deg, dtype = float) % 360,
+                    elevation_deg,
+                    period = 360
+                  )
+              )
+    #end from_samples
+
+    @classmethod
+    def from_pixels(cls, horizon, alt_zero = 380) :
+        "converts a horizon as taken by simulate.simulate_span, one pixel row per degree" \
+        " of azimuth counted down from the top of an image in which the horizontal is at" \
+        " row alt_zero, to elevation angles."
+        rows = numpy.asarray(horizon, dtype = float)
+        return \
+            cls(numpy.degrees(numpy.arcsin(numpy.clip((alt_zero - rows) / alt_zero, -1, 1))))
+    #end from_pixels
+
+    def get_elevation(self, azimuth_deg, interpolation = "linear") :
+        "returns the skyline elevation at the given azimuths, interpolating linearly or" \
+        " taking the nearest sample, periodically in azimuth."
+        position = numpy.asarray(azimuth_deg, dtype = float) % 360 / self.resolution_deg
+        if interpolation == "nearest" :
+            result = self.elevation_deg.take(numpy.rint(position).astype(numpy.intp), mode = "wrap")
+        elif interpolation == "linear" :
+            index = numpy.floor(position).astype(numpy.intp)
+            weight = position - index
+            below = self.elevation_deg.take(index, mode = "wrap")
+            above = self.elevation_deg.take(index + 1, mode = "wrap")
+            result = below + weight * (above - below)
+        else :
+            raise ValueError("interpolation must be one of %s" % ", ".join(interpolations))
+        #end if
+        return \
+            result
+    #end get_elevation
+
+    def is_blocked(self, azimuth_deg, altitude_deg, interpolation = "linear") :
+        "returns true where the sun, at the given azimuths and altitudes, is below the skyline."
+        return \
+            numpy.asarray(altitude_deg) < self.get_elevation(azimuth_deg, interpolation)
+    #end is_blocked
+
+    def save(self, path) :
+        "writes the profile to path as a .npy file of float32 elevations."
+        directory = os.path.dirname(os.path.abspath(path))
+        # write to a temporary file first so readers never see a partial profile
+        fd, temp_path = tempfile.mkstemp(dir = directory, suffix = ".npy")
+        with os.fdopen(fd, "wb") as f :
+            numpy.save(f, self.elevation_deg)
+        #end with
+        os.replace(temp_path, path)
+    #end save
+
+    @classmethod
+    def load(cls, path) :
+        "reads a profile written by save."
+        return \
+            cls(numpy.load(path))
+    #end load
+
+#end HorizonProfile
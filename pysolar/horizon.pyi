@@ -0,0 +1,23 @@
+# Stubs for pysolar.horizon (Python 3.6)
+
+import numpy
+from typing import Sequence, Tuple, Union
+
+interpolations: Tuple[str, ...]
+
+ArrayLike = Union[numpy.ndarray, float]
+
+class HorizonProfile:
+    elevation_deg: numpy.ndarray
+    def __init__(self, elevation_deg:Sequence[float]) -> None: ...
+    @property
+    def resolution_deg(self) -> float: ...
+    @classmethod
+    def from_samples(cls, azimuth_deg:Sequence[float], elevation_deg:Sequence[float], resolution_deg:float = ...) -> 'HorizonProfile': ...
+    @classmethod
+    def from_pixels(cls, horizon:Sequence[float], alt_zero:float = ...) -> 'HorizonProfile': ...
+    def get_elevation(self, azimuth_deg:ArrayLike, interpolation:str = ...) -> numpy.ndarray: ...
+    def is_blocked(self, azimuth_deg:ArrayLike, altitude_deg:ArrayLike, interpolation:str = ...) -> numpy.ndarray: ...
+    def save(self, path:str) -> None: ...
+    @classmethod
+    def load(cls, path:str) -> 'HorizonProfile': ...
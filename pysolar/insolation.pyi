@@ -0,0 +1,15 @@
+# Stubs for pysolar.insolation (Python 3.6)
+
+import numpy
+from typing import Callable, Tuple, Union
+
+default_order: int
+
+ArrayLike = Union[numpy.ndarray, float]
+Irradiance = Callable[[numpy.ndarray, numpy.ndarray, numpy.ndarray], numpy.ndarray]
+
+def get_nodes(order:int = ...) -> Tuple[numpy.ndarray, numpy.ndarray]: ...
+def get_direct_irradiance(when:numpy.ndarray, altitude_deg:numpy.ndarray, azimuth_deg:numpy.ndarray) -> numpy.ndarray: ...
+def get_daylight_intervals(latitude_deg:ArrayLike, longitude_deg:ArrayLike, start:numpy.datetime64, days:int, elevation:ArrayLike = ...) -> Tuple[numpy.ndarray, numpy.ndarray]: ...
+def get_daily_insolation(latitude_deg:ArrayLike, longitude_deg:ArrayLike, start:numpy.datetime64, days:int, irradiance:Irradiance = ..., order:int = ..., elevation:ArrayLike = ...) -> numpy.ndarray: ...
+def get_monthly_insolation(latitude_deg:ArrayLike, longitude_deg:ArrayLike, year:int, month:int, irradiance:Irradiance = ..., order:int = ..., elevation:ArrayLike = ...) -> numpy.ndarray: ...
@@ -21,17 +21,25 @@
 Import math functions from either numpy (in order to vectorize operations) or
 builtins math module.
 
-By default, use numpy when available.
+By default, use numpy when available. The backend is chosen when one of its
+functions is first looked up, so that importing pysolar does not import numpy.
 
 To force builtins math module usage when numpy is available:
     import pysolar
     pysolar.use_math()
 """
 
-from math import degrees, cos, sin, radians, tan, pi
-from math import acos, atan, asin, atan2, exp, e
+import contextlib
+import importlib
+import importlib.util
+import threading
 
-current_mod = 'math'
+numpy = None # imported by use_numpy
+
+# names bound by use_numpy and use_math
+backend_names = ('degrees', 'cos', 'sin', 'radians', 'tan', 'pi', 'acos',
+                 'atan', 'asin', 'atan2', 'exp', 'e', 'log', 'where',
+                 'tm_yday', 'tm_hour', 'tm_min', 'current_mod')
 
 
 def globals_import_from(module, name, name_as):
@@ -49,14 +57,10 @@ def where_math(condition, x, y):
     else:
         return y
 
-where = where_math
-
 
 def tm_yday_math(d):
     return d.utctimetuple().tm_yday
 
-tm_yday = tm_yday_math
-
 
 def tm_yday_numpy(d):
     dd = numpy.array(d, dtype='datetime64[D]')
@@ -67,8 +71,6 @@ def tm_yday_numpy(d):
 def tm_hour_math(d):
     return d.utctimetuple().tm_hour
 
-tm_hour = tm_hour_math
-
 
 def tm_hour_numpy(d):
     dh = numpy.array(d, dtype='datetime64[h]')
@@ -79,8 +81,6 @@ def tm_hour_numpy(d):
 def tm_min_math(d):
     return d.utctimetuple().tm_min
 
-tm_min = tm_min_math
-
 
 def tm_min_numpy(d):
     dm = numpy.array(d, dtype='datetime64[m]')
@@ -92,6 +92,8 @@ def use_numpy():
     """
     Import required functions/constants from numpy
     """
+    global numpy
+    numpy = importlib.import_module('numpy')
     globals_import_from('numpy', 'degrees', 'degrees')
     globals_import_from('numpy', 'cos', 'cos')
     globals_import_from('numpy', 'sin', 'sin')
@@ -104,6 +106,7 @@ def use_numpy():
     globals_import_from('numpy', 'arctan2', 'atan2')
     globals_import_from('numpy', 'exp', 'exp')
     globals_import_from('numpy', 'e', 'e')
+    globals_import_from('numpy', 'log', 'log')
     globals_import_from('numpy', 'where', 'where')
     globals()['tm_yday'] = tm_yday_numpy
     globals()['tm_hour'] = tm_hour_numpy
@@ -127,15 +130,81 @@ def use_math():
     globals_import_from('math', 'atan2', 'atan2')
     globals_import_from('math', 'exp', 'exp')
     globals_import_from('math', 'e', 'e')
-    globals()['where'] = where
+    globals_import_from('math', 'log', 'log')
+    globals()['where'] = where_math
     globals()['tm_yday'] = tm_yday_math
     globals()['tm_hour'] = tm_hour_math
     globals()['tm_min'] = tm_min_math
     globals()['current_mod'] = 'math'
 
 
-try:
-    import numpy
-    use_numpy()
-except ImportError:
-    pass
+def use_default():
+    """
+    Use numpy when available, else the builtins math module
+    """
+    if importlib.util.find_spec('numpy') is not None:
+        use_numpy()
+    else:
+        use_math()
+
+
+_scope_condition = threading.Condition()
+_scope_local = threading.local()
+_scope_count = 0 # open backend() scopes, all of the same backend
+_scope_previous = None # backend to restore when the last scope closes
+
+
+@contextlib.contextmanager
+def backend(name):
+    """
+    Selects the backend name ('numpy' or 'math') for the duration of a with
+    block, then restores the backend in use before it:
+
+        with numeric.backend('numpy'):
+            azimuth, altitude = solar.get_position(lat, lon, times)
+
+    Threads may hold scopes of the same backend concurrently; a thread asking
+    for the other one waits until they are closed, so the backend does not
+    change under a running computation. The backend remains global while a
+    scope is open: code calling use_numpy or use_math directly, or running
+    in another thread without a scope, is not synchronized with it.
+    """
+    global _scope_count, _scope_previous
+    if name not in ('numpy', 'math'):
+        raise ValueError("backend must be 'numpy' or 'math'")
+    depth = getattr(_scope_local, 'depth', 0)
+    with _scope_condition:
+        if depth != 0 and globals()['current_mod'] != name:
+            raise RuntimeError('cannot select the %s backend within a %s backend scope' % (name, globals()['current_mod']))
+        while _scope_count != 0 and globals()['current_mod'] != name:
+            _scope_condition.wait()
+        if _scope_count == 0:
+            _scope_previous = globals().get('current_mod')
+            if _scope_previous != name:
+                use_numpy() if name == 'numpy' else use_math()
+        _scope_count += 1
+    _scope_local.depth = depth + 1
+    try:
+        yield
+    finally:
+        _scope_local.depth = depth
+        with _scope_condition:
+            _scope_count -= 1
+            if _scope_count == 0:
+                if _scope_previous is None:
+                    # no backend had been chosen: choose the default lazily again
+                    for backend_name in backend_names:
+                        globals().pop(backend_name, None)
+                elif _scope_previous != name:
+                    use_numpy() if _scope_previous == 'numpy' else use_math()
+                _scope_condition.notify_all()
+
+
+def __getattr__(name):
+    """
+    Selects the default backend on the first lookup of one of its names
+    """
+    if name not in backend_names:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    use_default()
+    return globals()[name]
@@ -0,0 +1,125 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Plane-of-array irradiance on tilted panels for many orientations at once
+
+Angles follow solar.get_incidence_angle: the sun's azimuth is measured
+clockwise from north, as returned by solar.get_azimuth, and a panel's
+slope_orientation is measured from south, positive towards west, so that
+a south-facing panel has slope_orientation 0.
+
+The cosine of the angle of incidence is the dot product of the unit vector
+towards the sun with the panel normal. Both are computed once, per time and
+per orientation respectively, and combined with a single matrix product,
+so that the trigonometry is never repeated for each (time, panel) pair.
+Diffuse light is taken as isotropic; the ground reflects the global
+horizontal irradiance with the given albedo.
+"""
+import numpy
+
+def get_sun_vectors(altitude_deg, azimuth_deg):
+    "returns unit vectors towards the sun, with shape of the broadcast arguments" \
+    " followed by 3, in the frame whose first axis points north, second axis east" \
+    " and third axis up."
+    altitude_rad = numpy.radians(altitude_deg)
+    azimuth_rad = numpy.radians(azimuth_deg)
+    cos_altitude = numpy.cos(altitude_rad)
+    return \
+        numpy.stack \
+          (
+            numpy.broadcast_arrays
+              (
+                cos_altitude * numpy.cos(azimuth_rad),
+                cos_altitude * numpy.sin(azimuth_rad),
+                numpy.sin(altitude_rad),
+              ),
+            axis = -1
+          )
+#end get_sun_vectors
+
+def get_panel_normals(slope, slope_orientation):
+    "returns unit normals of panels with the given slope and orientation in degrees," \
+    " with shape 3 followed by the broadcast shape of the arguments, in the frame of" \
+    " get_sun_vectors."
+    slope_rad = numpy.radians(slope)
+    # azimuth, clockwise from north, of the direction the panel faces
+    facing_rad = numpy.radians(numpy.asarray(slope_orientation) + 180)
+    sin_slope = numpy.sin(slope_rad)
+    return \
+        numpy.stack \
+          (
+            numpy.broadcast_arrays
+              (
+                sin_slope * numpy.cos(facing_rad),
+                sin_slope * numpy.sin(facing_rad),
+                numpy.cos(slope_rad),
+              )
+          )
+#end get_panel_normals
+
+def get_cos_incidence(altitude_deg, azimuth_deg, slope, slope_orientation):
+    "returns the cosine of the angle of incidence of the sun on each panel, with the" \
+    " broadcast shape of the sun arguments followed by the broadcast shape of the panel" \
+    " arguments. Negative values mean the sun is behind the panel."
+    sun = get_sun_vectors(altitude_deg, azimuth_deg)
+    normals = get_panel_normals(slope, slope_orientation)
+    return \
+        (sun.reshape(-1, 3) @ normals.reshape(3, -1)).reshape(sun.shape[:-1] + normals.shape[1:])
+#end get_cos_incidence
+
+def get_plane_of_array_irradiance(altitude_deg, azimuth_deg, direct_normal, diffuse_horizontal, slope, slope_orientation, ground_albedo = 0.2, global_horizontal = None):
+    '''Irradiance in W/m^2 on panels of the given slopes and orientations.
+
+    altitude_deg, azimuth_deg, direct_normal and diffuse_horizontal describe the
+    sun and sky at each time and must broadcast together; for example, from
+    rest.get_clear_sky_irradiance, its "direct_normal" entry and "global" minus
+    "beam" (its "diffuse" entry leaves out the backscattered part of the sky
+    diffuse), or radiation.get_radiation_direct with a diffuse estimate. slope and
+    slope_orientation describe the panels and must broadcast together;
+    ground_albedo may be given per panel. global_horizontal defaults to
+    direct_normal * sin(altitude) + diffuse_horizontal.
+
+    returns a dict with "beam", "sky_diffuse", "ground_reflected" and "global"
+    plane-of-array irradiance, each with the shape of the sun arguments followed
+    by the shape of the panel arguments.
+    '''
+    sun_shape = numpy.broadcast_shapes \
+      (
+        numpy.shape(altitude_deg), numpy.shape(azimuth_deg),
+        numpy.shape(direct_normal), numpy.shape(diffuse_horizontal), numpy.shape(global_horizontal),
+      )
+    panel_shape = numpy.broadcast_shapes(numpy.shape(slope), numpy.shape(slope_orientation))
+    altitude_deg, direct_normal, diffuse_horizontal = \
+        (numpy.broadcast_to(value, sun_shape) for value in (altitude_deg, direct_normal, diffuse_horizontal))
+    if global_horizontal is None :
+        global_horizontal = direct_normal * numpy.maximum(numpy.sin(numpy.radians(altitude_deg)), 0) + diffuse_horizontal
+    #end if
+    # sun terms gain trailing axes for the panels
+    expand = (Ellipsis,) + (None,) * len(panel_shape)
+    cos_incidence = get_cos_incidence(altitude_deg, azimuth_deg, slope, slope_orientation)
+    cos_slope = numpy.cos(numpy.radians(numpy.broadcast_to(slope, panel_shape)))
+    beam = numpy.where((altitude_deg > 0)[expand], direct_normal[expand] * numpy.maximum(cos_incidence, 0), 0.0)
+    sky_diffuse = diffuse_horizontal[expand] * (1 + cos_slope) / 2
+    ground_reflected = numpy.broadcast_to(global_horizontal, sun_shape)[expand] * (ground_albedo * (1 - cos_slope) / 2)
+    return \
+        {
+            "beam" : beam,
+            "sky_diffuse" : sky_diffuse,
+            "ground_reflected" : ground_reflected,
+            "global" : beam + sky_diffuse + ground_reflected,
+        }
+#end get_plane_of_array_irradiance
@@ -0,0 +1,11 @@
+# Stubs for pysolar.poa (Python 3.6)
+
+import numpy
+from typing import Dict, Optional, Union
+
+ArrayLike = Union[numpy.ndarray, float]
+
+def get_sun_vectors(altitude_deg:ArrayLike, azimuth_deg:ArrayLike) -> numpy.ndarray: ...
+def get_panel_normals(slope:ArrayLike, slope_orientation:ArrayLike) -> numpy.ndarray: ...
+def get_cos_incidence(altitude_deg:ArrayLike, azimuth_deg:ArrayLike, slope:ArrayLike, slope_orientation:ArrayLike) -> numpy.ndarray: ...
+def get_plane_of_array_irradiance(altitude_deg:ArrayLike, azimuth_deg:ArrayLike, direct_normal:ArrayLike, diffuse_horizontal:ArrayLike, slope:ArrayLike, slope_orientation:ArrayLike, ground_albedo:ArrayLike = ..., global_horizontal:Optional[ArrayLike] = ...) -> Dict[str, numpy.ndarray]: ...
@@ -0,0 +1,176 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Opt-in timing of the stages of the solar position and REST2 pipelines
+
+    with profiling.StageProfiler() as profiler :
+        solar.get_position(latitude_deg, longitude_deg, when)
+    #end with
+    print(profiler.report())
+
+While a profiler is active, the module attributes of the functions making
+up each stage are replaced by timing wrappers; since the modules call each
+other through their attributes, every call is counted. The original
+functions are put back on exit, so there is no overhead outside the with
+block. Time is wall time and stages nest: "geocentric" includes
+"time_scale", "vsop87" and "nutation", and "topocentric" includes
+"geocentric". A stage only counts its outermost calls, so a time-scale
+function calling another is counted once. Only one profiler may be
+active at a time, and counts are only exact in single-threaded use.
+"""
+import time
+from . import rest, solar, solartime, tzinfo_check
+
+stages = \
+    {
+        "time_scale" :
+            (
+                (solartime, "get_julian_solar_day"),
+                (solartime, "get_julian_ephemeris_day"),
+                (solartime, "get_leap_seconds"),
+                (solartime, "get_delta_t"),
+            ),
+        "vsop87" :
+            (
+                (solar, "get_geocentric_longitude"),
+                (solar, "get_geocentric_latitude"),
+                (solar, "get_sun_earth_distance"),
+            ),
+        "nutation" :
+            (
+                (solar, "get_nutation"),
+            ),
+        "geocentric" :
+            (
+                (solar, "get_geocentric_position"),
+            ),
+        "topocentric" :
+            (
+                (solar, "get_topocentric_position"),
+            ),
+        "rest_atmosphere" :
+            (
+                (rest, "get_atmospheric_state"),
+            ),
+        "rest_irradiance" :
+            (
+                (rest, "get_clear_sky_irradiance_from_state"),
+            ),
+    }
+tz_validation_stage = "tz_validation" # time spent in tzinfo_check.check_aware_dt
+
+_active = None
+
+class StageProfiler :
+    '''Context manager recording call counts and cumulative wall time per stage.
+
+    callback, if given, is called on exit with the result of get_stats, for
+    export to a metrics system.'''
+
+    def __init__(self, callback = None) :
+        self.callback = callback
+        self.calls = {}
+        self.seconds = {}
+        self._depth = {}
+        self._originals = []
+    #end __init__
+
+    def _add(self, stage, seconds) :
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+    #end _add
+
+    def _wrap(self, stage, function) :
+
+        def timed(*args, **kwargs) :
+            depth = self._depth.get(stage, 0)
+            if depth != 0 :
+                # already inside this stage
+                return \
+                    function(*args, **kwargs)
+            #end if
+            self._depth[stage] = 1
+            begin = time.perf_counter()
+            try :
+                return \
+                    function(*args, **kwargs)
+            finally :
+                self._add(stage, time.perf_counter() - begin)
+                self._depth[stage] = 0
+            #end try
+        #end timed
+
+        timed.__name__ = function.__name__
+        timed.__doc__ = function.__doc__
+        timed.__wrapped__ = function
+        return \
+            timed
+    #end _wrap
+
+    def __enter__(self) :
+        global _active
+        if _active is not None :
+            raise RuntimeError("a StageProfiler is already active")
+        #end if
+        _active = self
+        for stage, functions in stages.items() :
+            for module, name in functions :
+                original = getattr(module, name)
+                self._originals.append((module, name, original))
+                setattr(module, name, self._wrap(stage, original))
+            #end for
+        #end for
+        tzinfo_check.check_observer = lambda seconds : self._add(tz_validation_stage, seconds)
+        return \
+            self
+    #end __enter__
+
+    def __exit__(self, exc_type, exc_value, traceback) :
+        global _active
+        tzinfo_check.check_observer = None
+        for module, name, original in reversed(self._originals) :
+            setattr(module, name, original)
+        #end for
+        self._originals = []
+        _active = None
+        if self.callback is not None :
+            self.callback(self.get_stats())
+        #end if
+    #end __exit__
+
+    def get_stats(self) :
+        "returns a dict mapping each stage that was called to a dict of \"calls\" and \"seconds\"."
+        return \
+            {stage : {"calls" : self.calls[stage], "seconds" : self.seconds[stage]} for stage in self.calls}
+    #end get_stats
+
+    def report(self) :
+        "returns a table of the stages, slowest first."
+        lines = ["%-16s %10s %12s %14s" % ("stage", "calls", "seconds", "us per call")]
+        for stage, stats in sorted(self.get_stats().items(), key = lambda item : - item[1]["seconds"]) :
+            lines.append \
+              (
+                "%-16s %10d %12.6f %14.2f"
+                %
+                (stage, stats["calls"], stats["seconds"], stats["seconds"] / stats["calls"] * 1e6)
+              )
+        #end for
+        return \
+            "\n".join(lines)
+    #end report
+
+#end StageProfiler
@@ -0,0 +1,19 @@
+# Stubs for pysolar.profiling (Python 3.6)
+
+import types
+from typing import Any, Callable, Dict, Optional, Tuple
+
+stages: Dict[str, Tuple[Tuple[types.ModuleType, str], ...]]
+tz_validation_stage: str
+
+Stats = Dict[str, Dict[str, float]]
+
+class StageProfiler:
+    callback: Optional[Callable[[Stats], Any]]
+    calls: Dict[str, int]
+    seconds: Dict[str, float]
+    def __init__(self, callback:Optional[Callable[[Stats], Any]] = ...) -> None: ...
+    def __enter__(self) -> 'StageProfiler': ...
+    def __exit__(self, exc_type:Any, exc_value:Any, traceback:Any) -> None: ...
+    def get_stats(self) -> Stats: ...
+    def report(self) -> str: ...
@@ -18,6 +18,7 @@
 # Disable linting as this is a work in progress
 # flake8: noqa
 
+import numpy
 from . import numeric as math
 from .constants import standard_pressure
 
@@ -181,16 +182,9 @@ def get_gas_transmittance(band, mRprime):
         return (1 + 0.27284 * mRprime - 0.00063699 * mRprime ** 2) / (1 + 0.30306 * mRprime)
 
 def get_global_broadband_irradiance(altitude_deg, pressure_millibars=standard_pressure_millibars, ozone_atm_cm=0.35, nitrogen_atm_cm=0.0002, precipitable_water_cm=5.0, turbidity_alpha=1.3, turbidity_beta=0.6):
-    Eb_high = get_beam_irradiance_by_band("high-frequency", altitude_deg, pressure_millibars, ozone_atm_cm, nitrogen_atm_cm, precipitable_water_cm, turbidity_alpha, turbidity_beta)
-    Eb_low  = get_beam_irradiance_by_band("low-frequency",  altitude_deg, pressure_millibars, ozone_atm_cm, nitrogen_atm_cm, precipitable_water_cm, turbidity_alpha, turbidity_beta)
-
-    Edp_high = get_diffuse_irradiance_by_band("high-frequency", air_mass, turbidity_alpha, turbidity_beta)
-    Edp_low  = get_diffuse_irradiance_by_band("low-frequency",  air_mass, turbidity_alpha, turbidity_beta)
-
-    Edd_high = get_backscattered_diffuse_irradiance_by_band("high-frequency", Eb_high, Edp_high, turbidity_alpha, turbidity_beta)
-    Edd_low  = get_backscattered_diffuse_irradiance_by_band("low-frequency", Eb_low, Edp_low, turbidity_alpha, turbidity_beta)
-
-    return Eb_high + Eb_low + Edp_high + Edp_low + Edd_high + Edd_low
+    # one atmospheric state serves the beam, diffuse and backscattered components of both bands
+    state = get_atmospheric_state(altitude_deg, pressure_millibars, ozone_atm_cm, nitrogen_atm_cm, precipitable_water_cm, turbidity_alpha, turbidity_beta)
+    return get_clear_sky_irradiance_from_state(state, get_ground_albedo(None))["global"].sum(axis=0)
 
 def get_ground_albedo(band):
     # This could probably be improved with [Gueymard, 1993: Mathematically integrable parameterization of clear-sky beam and global irradiances and its use in daily irradiation applications]
@@ -200,12 +194,13 @@ def get_ground_albedo(band):
 
 def get_nitrogen_transmittance(band, mw, nitrogen_atm_cm):
     if band == "high-frequency":
+        un = nitrogen_atm_cm  # just renaming to keep equations short
         g1 = (0.17499 + 41.654 * un - 2146.4 * un ** 2) / \
             (1 + 22295.0 * un ** 2)
         g2 = un * (-1.2134 + 59.324 * un) / (1 + 8847.8 * un ** 2)
         g3 = (0.17499 + 61.658 * un + 9196.4 * un ** 2) / \
             (1 + 74109.0 * un ** 2)
-        return min(1, (1 + g1 * mw + g2 * mw ** 2) / (1 + g3 * mw))
+        return numpy.minimum(1, (1 + g1 * mw + g2 * mw ** 2) / (1 + g3 * mw))
     else:
         return 1.0
 
@@ -213,26 +208,22 @@ def get_nitrogen_transmittance(band, mw, nitrogen_atm_cm):
 # from Appendix B of [Gueymard, 2003]
 def get_optical_mass_rayleigh(altitude_deg, pressure_millibars):
     Z = 90 - altitude_deg
-    Z_rad = math.radians(Z)
-    return (pressure_millibars / standard_pressure_millibars) / ((math.cos(Z_rad) + 0.48353 * Z_rad ** 0.095846) / (96.741 - Z_rad) ** 1.754)
+    return (pressure_millibars / standard_pressure_millibars) / (math.cos(math.radians(Z)) + 0.48353 * Z ** 0.095846 / (96.741 - Z) ** 1.754)
 
 
 def get_optical_mass_ozone(altitude_deg):  # from Appendix B of [Gueymard, 2003]
     Z = 90 - altitude_deg
-    Z_rad = math.radians(Z)
-    return 1 / ((math.cos(Z_rad) + 1.0651 * Z_rad ** 0.6379) / (101.8 - Z_rad) ** 2.2694)
+    return 1 / (math.cos(math.radians(Z)) + 1.0651 * Z ** 0.6379 / (101.8 - Z) ** 2.2694)
 
 
 def get_optical_mass_water(altitude_deg):  # from Appendix B of [Gueymard, 2003]
     Z = 90 - altitude_deg
-    Z_rad = math.radians(Z)
-    return 1 / ((math.cos(Z_rad) + 0.10648 * Z_rad ** 0.11423) / (93.781 - Z_rad) ** 1.9203)
+    return 1 / (math.cos(math.radians(Z)) + 0.10648 * Z ** 0.11423 / (93.781 - Z) ** 1.9203)
 
 
 def get_optical_mass_aerosol(altitude_deg):  # from Appendix B of [Gueymard, 2003]
     Z = 90 - altitude_deg
-    Z_rad = math.radians(Z)
-    return 1 / ((math.cos(Z_rad) + 0.16851 * Z_rad ** 0.18198) / (95.318 - Z_rad) ** 1.9542)
+    return 1 / (math.cos(math.radians(Z)) + 0.16851 * Z ** 0.18198 / (95.318 - Z) ** 1.9542)
 
 
 def get_ozone_transmittance(band, mo, uo):
@@ -301,3 +292,171 @@ def get_water_vapor_transmittance_coefficients(band, w):
         c4 = w * (0.70992 - 0.23155 * w + 0.096514 * w ** 2) / \
             (1 + 0.44907 * w + 0.75425 * w ** 2)
         return [float('NaN'), c1, c2, c3, c4]
+
+
+# Array engine
+#
+# The functions below evaluate both REST2 bands at once. Every per-band
+# quantity is an array whose leading axis has length 2, ordered as in `bands`;
+# the remaining axes follow numpy broadcasting of the inputs, so a year of
+# 1-minute altitudes and matching atmospheric series run in one call.
+
+bands = ("high-frequency", "low-frequency")
+
+
+def _by_band(values, shape):
+    # stacks the per-band values of a quantity, in the order of `bands`, along a new leading axis
+    return numpy.stack([numpy.broadcast_to(value, shape) for value in values])
+
+
+def get_atmospheric_state(altitude_deg, pressure_millibars=standard_pressure_millibars, ozone_atm_cm=0.35, nitrogen_atm_cm=0.0002, precipitable_water_cm=5.0, turbidity_alpha=1.3, turbidity_beta=0.6):
+    """Everything REST2 needs about the path of sunlight through the atmosphere,
+    computed once per (altitude, atmosphere) sample.
+
+    All arguments may be arrays that broadcast together. Returns a dict of
+    optical masses, the effective aerosol wavelength, transmittances and
+    scattering terms; per-band entries have a leading band axis (see `bands`).
+    Each quantity comes from the per-band function above, evaluated with the
+    numpy backend. Beam, diffuse, backscattered and global irradiance are all
+    derived from it by the *_from_state functions, without recomputing any of it.
+    """
+    with math.backend("numpy") :
+        altitude_deg = numpy.asarray(altitude_deg, dtype=float)
+        p = numpy.asarray(pressure_millibars, dtype=float)
+        uo = numpy.asarray(ozone_atm_cm, dtype=float)
+        un = numpy.asarray(nitrogen_atm_cm, dtype=float)
+        w = numpy.asarray(precipitable_water_cm, dtype=float)
+        a = numpy.asarray(turbidity_alpha, dtype=float)
+        b = numpy.asarray(turbidity_beta, dtype=float)
+        shape = numpy.broadcast_shapes(altitude_deg.shape, p.shape, uo.shape, un.shape, w.shape, a.shape, b.shape)
+
+        daytime = altitude_deg > 0
+        altitude_deg = numpy.where(daytime, altitude_deg, 0)
+        cos_Z = numpy.cos(numpy.radians(90 - altitude_deg))
+        mR = get_optical_mass_rayleigh(altitude_deg, standard_pressure_millibars)
+        mRprime = get_optical_mass_rayleigh(altitude_deg, p)
+        mo = get_optical_mass_ozone(altitude_deg)
+        mw = get_optical_mass_water(altitude_deg)
+        ma = get_optical_mass_aerosol(altitude_deg)
+
+        # gaseous transmittances; nitrogen and water vapour also at the diffuse optical mass of 1.66
+        TR = _by_band([get_rayleigh_transmittance(band, mRprime) for band in bands], shape)
+        Tg = _by_band([get_gas_transmittance(band, mRprime) for band in bands], shape)
+        To = _by_band([get_ozone_transmittance(band, mo, uo) for band in bands], shape)
+        Tn = _by_band([get_nitrogen_transmittance(band, mw, un) for band in bands], shape)
+        Tw = _by_band([get_water_vapor_transmittance(band, mw, w) for band in bands], shape)
+        Tnprime = _by_band([get_nitrogen_transmittance(band, 1.66, un) for band in bands], shape)
+        Twprime = _by_band([get_water_vapor_transmittance(band, 1.66, w) for band in bands], shape)
+
+        # aerosol extinction at the effective wavelength of each band
+        effective_wavelength = _by_band([get_effective_aerosol_wavelength(band, ma, a, b) for band in bands], shape)
+        tau_a = get_aerosol_optical_depth(b, effective_wavelength, a)
+        Ta = _by_band([get_aerosol_transmittance(band, ma, tau) for band, tau in zip(bands, tau_a)], shape)
+        Tas = _by_band([get_aerosol_scattering_transmittance(band, ma, tau) for band, tau in zip(bands, tau_a)], shape)
+
+        # scattering terms for the diffuse component, eq. 7-10 of [Gueymard, 2008]
+        BR = _by_band([get_rayleigh_extinction_forward_scattering_fraction(band, mR) for band in bands], shape)
+        Ba = get_aerosol_forward_scatterance_factor(altitude_deg)
+        F = _by_band([get_aerosol_scattering_correction_factor(band, ma, tau) for band, tau in zip(bands, tau_a)], shape)
+        rhos = _by_band([get_sky_albedo(band, a, b) for band in bands], shape)
+
+    return {
+        "shape": shape,
+        "daytime": daytime,
+        "cos_zenith": cos_Z,
+        "rayleigh_optical_mass": mR,
+        "rayleigh_optical_mass_pressure_corrected": mRprime,
+        "ozone_optical_mass": mo,
+        "water_optical_mass": mw,
+        "aerosol_optical_mass": ma,
+        "effective_aerosol_wavelength": effective_wavelength,
+        "aerosol_optical_depth": tau_a,
+        "rayleigh_transmittance": TR,
+        "gas_transmittance": Tg,
+        "ozone_transmittance": To,
+        "nitrogen_transmittance": Tn,
+        "water_vapor_transmittance": Tw,
+        "nitrogen_transmittance_diffuse": Tnprime,
+        "water_vapor_transmittance_diffuse": Twprime,
+        "aerosol_transmittance": Ta,
+        "aerosol_scattering_transmittance": Tas,
+        "rayleigh_forward_scattering_fraction": BR,
+        "aerosol_forward_scatterance_factor": Ba,
+        "aerosol_scattering_correction_factor": F,
+        "sky_albedo": rhos,
+    }
+
+
+def _band_constant(values, state):
+    # per-band constant shaped to broadcast against the band axis of the state
+    return numpy.array([values[band] for band in bands]).reshape((2,) + (1,) * len(state["shape"]))
+
+
+def get_direct_normal_irradiance_from_state(state):
+    """Direct normal irradiance of each band, from get_atmospheric_state."""
+    transmittance = state["rayleigh_transmittance"] * state["gas_transmittance"] * state["ozone_transmittance"] \
+        * state["nitrogen_transmittance"] * state["water_vapor_transmittance"] * state["aerosol_transmittance"]
+    return numpy.where(state["daytime"], _band_constant(E0n, state) * transmittance, 0.0)
+
+
+def get_beam_irradiance_from_state(state):
+    """Beam irradiance on the horizontal of each band, from get_atmospheric_state."""
+    return get_direct_normal_irradiance_from_state(state) * state["cos_zenith"]
+
+
+def get_diffuse_irradiance_from_state(state):
+    """Sky diffuse irradiance on the horizontal of each band, before backscattering,
+    from get_atmospheric_state."""
+    TR = state["rayleigh_transmittance"]
+    scattering = state["rayleigh_forward_scattering_fraction"] * (1 - TR) * state["aerosol_transmittance"] ** 0.25 \
+        + state["aerosol_forward_scatterance_factor"] * state["aerosol_scattering_correction_factor"] * TR \
+        * (1 - state["aerosol_scattering_transmittance"] ** 0.25)
+    transmittance = state["ozone_transmittance"] * state["gas_transmittance"] \
+        * state["nitrogen_transmittance_diffuse"] * state["water_vapor_transmittance_diffuse"]
+    return numpy.where(state["daytime"], transmittance * scattering * _band_constant(E0n, state) * state["cos_zenith"], 0.0)
+
+
+def get_backscattered_irradiance_from_state(state, beam, diffuse, ground_albedo=0.15):
+    """Irradiance backscattered between the ground and the sky for each band,
+    given the beam and diffuse irradiance derived from the same state."""
+    rhog = numpy.asarray(ground_albedo, dtype=float)
+    rhos = state["sky_albedo"]
+    return rhog * rhos * (beam + diffuse) / (1 - rhog * rhos)
+
+
+def get_clear_sky_irradiance_from_state(state, ground_albedo=0.15):
+    """All REST2 outputs for each band from one atmospheric state: a dict with
+    "direct_normal", "beam", "diffuse", "backscattered" and "global"."""
+    direct_normal = get_direct_normal_irradiance_from_state(state)
+    beam = direct_normal * state["cos_zenith"]
+    diffuse = get_diffuse_irradiance_from_state(state)
+    backscattered = get_backscattered_irradiance_from_state(state, beam, diffuse, ground_albedo)
+    return {
+        "direct_normal": direct_normal,
+        "beam": beam,
+        "diffuse": diffuse,
+        "backscattered": backscattered,
+        "global": beam + diffuse + backscattered,
+    }
+
+
+def get_clear_sky_irradiance_by_bands(altitude_deg, pressure_millibars=standard_pressure_millibars, ozone_atm_cm=0.35, nitrogen_atm_cm=0.0002, precipitable_water_cm=5.0, turbidity_alpha=1.3, turbidity_beta=0.6, ground_albedo=0.15):
+    """REST2 clear-sky irradiance for both bands in one pass.
+
+    All arguments may be arrays that broadcast together. Returns a dict of
+    arrays with a leading band axis (see `bands`): "direct_normal", "beam"
+    (horizontal), "diffuse" (sky diffuse on the horizontal without
+    backscattering), "backscattered" and "global". Irradiance is zero when
+    the sun is below the horizon.
+    """
+    state = get_atmospheric_state(altitude_deg, pressure_millibars, ozone_atm_cm, nitrogen_atm_cm,
+                                  precipitable_water_cm, turbidity_alpha, turbidity_beta)
+    return get_clear_sky_irradiance_from_state(state, ground_albedo)
+
+
+def get_clear_sky_irradiance(altitude_deg, pressure_millibars=standard_pressure_millibars, ozone_atm_cm=0.35, nitrogen_atm_cm=0.0002, precipitable_water_cm=5.0, turbidity_alpha=1.3, turbidity_beta=0.6, ground_albedo=0.15):
+    """Broadband REST2 clear-sky irradiance, the sum over both bands of
+    get_clear_sky_irradiance_by_bands, with the same keys and broadcasting."""
+    by_bands = get_clear_sky_irradiance_by_bands(altitude_deg, pressure_millibars, ozone_atm_cm, nitrogen_atm_cm,
+                                                 precipitable_water_cm, turbidity_alpha, turbidity_beta, ground_albedo)
+    return {name: value.sum(axis=0) for name, value in by_bands.items()}
@@ -0,0 +1,307 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""A small HTTP service for solar positions, batching concurrent requests
+
+    python -m pysolar.server --port 8080 --irradiance rest
+    curl 'http://127.0.0.1:8080/position?lat=42.36&lon=-71.11&time=2024-06-21T16:00:00'
+
+GET /position takes the query parameters lat, lon, elevation (default 0) and
+time (ISO 8601 as in batch.parse_timestamps, default now), and answers with
+a JSON object of the batch.get_batch_records fields.
+
+Rather than computing each request on its own, PositionBatcher collects the
+requests that arrive within a short window, or until max_batch of them are
+waiting, and computes them with one call of batch.get_batch_records in an
+executor thread, so that the event loop keeps accepting requests meanwhile.
+Under load, the cost of a batch is shared by all its requests, while a lone
+request waits at most the window. Only the standard library and numpy are
+used; HTTP support is limited to what this needs.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import math
+import urllib.parse
+import numpy
+from . import batch, numeric
+
+default_host = "127.0.0.1"
+default_port = 8080
+default_window = 0.002 # seconds
+default_max_batch = 4096
+max_header_lines = 100
+# the range of datetime, in which the responses give the time
+min_time = numpy.datetime64("0001-01-01T00:00:00", "s")
+max_time = numpy.datetime64("9999-12-31T23:59:59", "s")
+
+class PositionBatcher :
+    '''Coalesces calls of get_position made within window seconds of each other
+    into batches of at most max_batch, computed by batch.get_batch_records in
+    executor (default: a single thread of its own).'''
+
+    def __init__(self, irradiance = "direct", window = default_window, max_batch = default_max_batch, executor = None) :
+        if irradiance not in batch.irradiance_columns :
+            raise ValueError("irradiance must be one of %s" % ", ".join(batch.irradiance_columns))
+        #end if
+        self.irradiance = irradiance
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor if executor is not None else concurrent.futures.ThreadPoolExecutor(1)
+        self.nr_requests = 0
+        self.nr_batches = 0
+        self._pending = []
+        self._timer = None
+    #end __init__
+
+    async def get_position(self, latitude_deg, longitude_deg, elevation, when) :
+        "returns a dict of the get_batch_records fields for one site and datetime64 time."
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((float(latitude_deg), float(longitude_deg), float(elevation), numpy.datetime64(when, "s"), future))
+        self.nr_requests += 1
+        if len(self._pending) >= self.max_batch :
+            self._flush()
+        elif self._timer is None :
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        #end if
+        return \
+            await future
+    #end get_position
+
+    def _flush(self) :
+        if self._timer is not None :
+            self._timer.cancel()
+            self._timer = None
+        #end if
+        pending, self._pending = self._pending, []
+        if len(pending) != 0 :
+            self.nr_batches += 1
+            asyncio.ensure_future(self._compute(pending))
+        #end if
+    #end _flush
+
+    def _get_records(self, pending) :
+        columns = list(zip(*pending))
+        # selected in the executor thread for the computation only
+        with numeric.backend("numpy") :
+            return \
+                batch.get_batch_records \
+                  (
+                    numpy.array(columns[0]),
+                    numpy.array(columns[1]),
+                    numpy.array(columns[2]),
+                    numpy.array(columns[3], dtype = "datetime64[s]"),
+                    self.irradiance
+                  )
+        #end with
+    #end _get_records
+
+    @staticmethod
+    def _get_result(names, values) :
+        result = dict(zip(names, values))
+        result["timestamp"] = result["timestamp"].isoformat()
+        for name, value in result.items() :
+            if isinstance(value, float) and not math.isfinite(value) :
+                raise ValueError("%s is not finite" % name)
+            #end if
+        #end for
+        return \
+            result
+    #end _get_result
+
+    async def _compute(self, pending) :
+        try :
+            records = await asyncio.get_running_loop().run_in_executor(self.executor, self._get_records, pending)
+        except Exception as error :
+            for request in pending :
+                if not request[-1].done() :
+                    request[-1].set_exception(error)
+                #end if
+            #end for
+            return
+        #end try
+        names = records.dtype.names
+        for request, values in zip(pending, records.tolist()) :
+            future = request[-1]
+            if future.done() :
+                continue
+            #end if
+            # one bad record must not leave the other requests of its batch waiting
+            try :
+                result = self._get_result(names, values)
+            except Exception as error :
+                future.set_exception(error)
+            else :
+                future.set_result(result)
+            #end try
+        #end for
+    #end _compute
+
+    def close(self) :
+        self.executor.shutdown(wait = False)
+    #end close
+
+#end PositionBatcher
+
+def _parse_position_query(query):
+    parameters = urllib.parse.parse_qs(query)
+    get = lambda name, default = None : parameters[name][-1] if name in parameters else default
+    latitude_deg = float(get("lat"))
+    longitude_deg = float(get("lon"))
+    if not (-90 <= latitude_deg <= 90 and -180 <= longitude_deg <= 360) :
+        raise ValueError("latitude or longitude out of range")
+    #end if
+    elevation = float(get("elevation", 0))
+    if not math.isfinite(elevation) :
+        raise ValueError("elevation must be finite")
+    #end if
+    time = get("time")
+    if time is None :
+        when = numpy.datetime64("now", "s")
+    else :
+        when = batch.parse_timestamps([time])[0]
+    #end if
+    if not (min_time <= when <= max_time) :
+        raise ValueError("time out of range")
+    #end if
+    return \
+        latitude_deg, longitude_deg, elevation, when
+#end _parse_position_query
+
+async def _write_response(writer, status, body, keep_alive) :
+    reasons = {200 : "OK", 400 : "Bad Request", 404 : "Not Found", 405 : "Method Not Allowed", 500 : "Internal Server Error"}
+    data = json.dumps(body, allow_nan = False).encode()
+    writer.write \
+      (
+            (
+                "HTTP/1.1 %d %s\r\n"
+                "Content-Type: application/json\r\n"
+                "Content-Length: %d\r\n"
+                "Connection: %s\r\n"
+                "\r\n"
+            %
+                (status, reasons[status], len(data), "keep-alive" if keep_alive else "close")
+            ).encode()
+        +
+            data
+      )
+    await writer.drain()
+#end _write_response
+
+async def handle_connection(batcher, reader, writer):
+    "serves the HTTP requests of one connection, for asyncio.start_server."
+    try :
+        while True :
+            request_line = await reader.readline()
+            if not request_line :
+                break
+            #end if
+            headers = {}
+            for _ in range(max_header_lines) :
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b"") :
+                    break
+                #end if
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            #end for
+            if "content-length" in headers :
+                await reader.readexactly(int(headers["content-length"]))
+            #end if
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3 :
+                await _write_response(writer, 400, {"error" : "malformed request line"}, False)
+                break
+            #end if
+            method, target, version = parts
+            keep_alive = \
+                (
+                    headers.get("connection", "").lower() != "close"
+                and
+                    (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive")
+                )
+            url = urllib.parse.urlsplit(target)
+            if url.path != "/position" :
+                await _write_response(writer, 404, {"error" : "unknown path %s" % url.path}, keep_alive)
+            elif method != "GET" :
+                await _write_response(writer, 405, {"error" : "only GET is supported"}, keep_alive)
+            else :
+                try :
+                    arguments = _parse_position_query(url.query)
+                except (TypeError, ValueError) as error :
+                    await _write_response(writer, 400, {"error" : str(error)}, keep_alive)
+                else :
+                    try :
+                        result = await batcher.get_position(*arguments)
+                    except Exception as error :
+                        await _write_response(writer, 500, {"error" : str(error)}, keep_alive)
+                    else :
+                        await _write_response(writer, 200, result, keep_alive)
+                    #end try
+                #end try
+            #end if
+            if not keep_alive :
+                break
+            #end if
+        #end while
+    except (ConnectionError, asyncio.IncompleteReadError) :
+        pass
+    finally :
+        writer.close()
+    #end try
+#end handle_connection
+
+async def start_server(batcher, host = default_host, port = default_port):
+    "starts serving GET /position with batcher, and returns the asyncio.Server."
+    return \
+        await asyncio.start_server(lambda reader, writer : handle_connection(batcher, reader, writer), host, port)
+#end start_server
+
+async def serve(host = default_host, port = default_port, irradiance = "direct", window = default_window, max_batch = default_max_batch):
+    "serves until cancelled."
+    batcher = PositionBatcher(irradiance, window, max_batch)
+    server = await start_server(batcher, host, port)
+    try :
+        async with server :
+            await server.serve_forever()
+        #end async with
+    finally :
+        batcher.close()
+    #end try
+#end serve
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m pysolar.server", description = "HTTP service for batched solar positions")
+    parser.add_argument("--host", default = default_host, help = "address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type = int, default = default_port, help = "port to listen on (default: %(default)s)")
+    parser.add_argument("--irradiance", choices = tuple(batch.irradiance_columns), default = "direct", help = "irradiance fields to add (default: %(default)s)")
+    parser.add_argument("--window", type = float, default = default_window, help = "seconds to wait for more requests before computing a batch (default: %(default)s)")
+    parser.add_argument("--max-batch", type = int, default = default_max_batch, help = "largest batch (default: %(default)s)")
+    args = parser.parse_args(argv)
+    try :
+        asyncio.run(serve(args.host, args.port, args.irradiance, args.window, args.max_batch))
+    except KeyboardInterrupt :
+        pass
+    #end try
+    return \
+        0
+#end main
+
+if __name__ == "__main__" :
+    main()
+#end if
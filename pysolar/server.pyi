@@ -0,0 +1,30 @@
+# Stubs for pysolar.server (Python 3.6)
+
+import asyncio
+import concurrent.futures
+import numpy
+from typing import Any, Dict, List, Optional
+
+default_host: str
+default_port: int
+default_window: float
+default_max_batch: int
+max_header_lines: int
+min_time: numpy.datetime64
+max_time: numpy.datetime64
+
+class PositionBatcher:
+    irradiance: str
+    window: float
+    max_batch: int
+    executor: concurrent.futures.Executor
+    nr_requests: int
+    nr_batches: int
+    def __init__(self, irradiance:str = ..., window:float = ..., max_batch:int = ..., executor:Optional[concurrent.futures.Executor] = ...) -> None: ...
+    async def get_position(self, latitude_deg:float, longitude_deg:float, elevation:float, when:numpy.datetime64) -> Dict[str, Any]: ...
+    def close(self) -> None: ...
+
+async def handle_connection(batcher:PositionBatcher, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None: ...
+async def start_server(batcher:PositionBatcher, host:str = ..., port:int = ...) -> asyncio.AbstractServer: ...
+async def serve(host:str = ..., port:int = ..., irradiance:str = ..., window:float = ..., max_batch:int = ...) -> None: ...
+def main(argv:Optional[List[str]] = ...) -> int: ...
@@ -20,7 +20,9 @@
 """
 from . import numeric as math
 import datetime
+import numpy
 from . import constants
+from .horizon import HorizonProfile
 from . import radiation
 from . import solar
 
@@ -63,3 +65,99 @@ def simulate_span(latitude_deg, longitude_deg, horizon, start_datetime, end_date
 #       shaded_area = xs * ys
 #       shaded_percentage = shaded_area/area
 # import simulate, datetime; s = datetime.datetime(2008,1,1); e = datetime.datetime(2008,1,5); simulate.simulate_span(42.0, -70.0, s, e, 30)
+
+span_dtype = numpy.dtype \
+  (
+    [
+        ("time", "datetime64[s]"),
+        ("altitude", float),
+        ("azimuth", float),
+        ("radiation", float),
+        ("shade", float),
+    ]
+  )
+default_chunk_steps = 100000
+
+def get_datetime64(when):
+    "converts an aware datetime to a naive UTC numpy.datetime64; datetime64 values," \
+    " which are already UTC, are passed through."
+    if isinstance(when, datetime.datetime) and when.tzinfo is not None :
+        when = when.astimezone(datetime.timezone.utc).replace(tzinfo = None)
+    #end if
+    return \
+        numpy.datetime64(when, 's')
+
+def simulate_times(latitude_deg, longitude_deg, horizon, when, elevation = 0, temperature = constants.standard_temperature, pressure = constants.standard_pressure):
+    '''array version of the body of simulate_span: evaluates position, horizon
+    shading and radiation at once for an array of datetime64 times and returns
+    a structured array of span_dtype with one record per time.
+
+    horizon is either indexable as for simulate_span, or a horizon.HorizonProfile,
+    in which case shade is the skyline elevation in degrees at the sun's azimuth.
+
+    The computation always uses the numpy backend, selected with numeric.backend
+    for the duration of the call.'''
+    alt_zero = 380
+    when = numpy.asarray(when, dtype = "datetime64[s]")
+    with math.backend("numpy") :
+        azi, alt = solar.get_position(latitude_deg, longitude_deg, when, elevation, temperature, pressure)
+        if isinstance(horizon, HorizonProfile) :
+            shade = horizon.get_elevation(azi)
+            blocked = alt < shade
+        else :
+            horizon = numpy.asarray(horizon)
+            # numpy.rint rounds halves to even, like round
+            shade = horizon[numpy.rint(azi).astype(int) % len(horizon)]
+            blocked = shade < alt_zero - numpy.rint(alt_zero * numpy.sin(numpy.radians(alt)))
+        #end if
+        # just below the horizon the air mass is large and negative, so exp overflows
+        # and get_radiation_direct gives inf * 0 = NaN; those samples are zeroed
+        with numpy.errstate(over = 'ignore', invalid = 'ignore') :
+            rad = numpy.where(blocked | (alt <= 0), 0, radiation.get_radiation_direct(when, alt))
+        #end with
+    #end with
+    result = numpy.empty(when.shape, dtype = span_dtype)
+    result["time"] = when
+    result["altitude"] = alt
+    result["azimuth"] = azi
+    result["radiation"] = rad
+    result["shade"] = shade
+    return \
+        result
+
+def get_time_chunks(start_datetime, end_datetime, step_minutes, chunk_steps = default_chunk_steps):
+    "yields the UTC datetime64[s] times of simulate_span_chunks, in arrays of up to" \
+    " chunk_steps consecutive times."
+    start = get_datetime64(start_datetime)
+    step = numpy.timedelta64(int(round(step_minutes * 60)), 's')
+    nr_steps = max(int((get_datetime64(end_datetime) - start) // step), 0)
+    for first in range(0, nr_steps, chunk_steps) :
+        yield start + numpy.arange(first, min(first + chunk_steps, nr_steps)) * step
+    #end for
+#end get_time_chunks
+
+def simulate_span_chunks(latitude_deg, longitude_deg, horizon, start_datetime, end_datetime, step_minutes, elevation = 0, temperature = constants.standard_temperature, pressure = constants.standard_pressure, chunk_steps = default_chunk_steps):
+    '''same samples as simulate_span, yielded as structured arrays of span_dtype
+    holding up to chunk_steps consecutive records each, so that very long spans
+    are processed in bounded memory. Times are UTC datetime64[s].
+
+    start_datetime and end_datetime may be aware datetimes or numpy.datetime64
+    values, which are taken as UTC.'''
+    for when in get_time_chunks(start_datetime, end_datetime, step_minutes, chunk_steps) :
+        yield simulate_times(latitude_deg, longitude_deg, horizon, when, elevation, temperature, pressure)
+    #end for
+
+def simulate_span_array(latitude_deg, longitude_deg, horizon, start_datetime, end_datetime, step_minutes, elevation = 0, temperature = constants.standard_temperature, pressure = constants.standard_pressure):
+    '''same samples as simulate_span, returned as a single structured array of
+    span_dtype with fields time, altitude, azimuth, radiation and shade; see
+    simulate_span_chunks.'''
+    chunks = list \
+      (
+        simulate_span_chunks
+          (
+            latitude_deg, longitude_deg, horizon, start_datetime, end_datetime, step_minutes,
+            elevation, temperature, pressure, chunk_steps = numpy.iinfo(numpy.int64).max
+          )
+      )
+    return \
+        chunks[0] if len(chunks) != 0 else numpy.empty(0, dtype = span_dtype)
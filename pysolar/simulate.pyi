@@ -1,7 +1,18 @@
 # Stubs for pysolar.simulate (Python 3.6)
 
 import datetime
-from typing import Iterator, List, Tuple
+import numpy
+from typing import Iterator, List, Sequence, Tuple, Union
+from .horizon import HorizonProfile
 
 def datetime_range(start_datetime:datetime.datetime, end_datetime:datetime.datetime, step_minutes:float) -> Iterator[datetime.datetime]: ...
 def simulate_span(latitude_deg:float, longitude_deg:float, horizon:List[float], start_datetime:datetime.datetime, end_datetime:datetime.datetime, step_minutes:float, elevation:float = ..., temperature:float = ..., pressure:float = ...) -> Iterator[Tuple[datetime.datetime, float, float, float, float]]: ...  # TODO unclear what horizon is, and never used in the code
+
+span_dtype: numpy.dtype
+default_chunk_steps: int
+
+def get_datetime64(when:Union[datetime.datetime, numpy.datetime64]) -> numpy.datetime64: ...
+def simulate_times(latitude_deg:float, longitude_deg:float, horizon:Union[Sequence[float], HorizonProfile], when:numpy.ndarray, elevation:float = ..., temperature:float = ..., pressure:float = ...) -> numpy.ndarray: ...
+def get_time_chunks(start_datetime:Union[datetime.datetime, numpy.datetime64], end_datetime:Union[datetime.datetime, numpy.datetime64], step_minutes:float, chunk_steps:int = ...) -> Iterator[numpy.ndarray]: ...
+def simulate_span_chunks(latitude_deg:float, longitude_deg:float, horizon:Union[Sequence[float], HorizonProfile], start_datetime:Union[datetime.datetime, numpy.datetime64], end_datetime:Union[datetime.datetime, numpy.datetime64], step_minutes:float, elevation:float = ..., temperature:float = ..., pressure:float = ..., chunk_steps:int = ...) -> Iterator[numpy.ndarray]: ...
+def simulate_span_array(latitude_deg:float, longitude_deg:float, horizon:Union[Sequence[float], HorizonProfile], start_datetime:Union[datetime.datetime, numpy.datetime64], end_datetime:Union[datetime.datetime, numpy.datetime64], step_minutes:float, elevation:float = ..., temperature:float = ..., pressure:float = ...) -> numpy.ndarray: ...
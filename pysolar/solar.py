@@ -21,6 +21,7 @@ This module contains the most important functions for calculation of the positio
 
 """
 from . import numeric as math
+import collections
 import datetime
 from . import constants
 from . import solartime as stime
@@ -54,13 +55,12 @@ def get_aberration_correction(sun_earth_distance):     # sun-earth distance is i
 
 
 @check_aware_dt('when')
-def get_topocentric_position(latitude_deg, longitude_deg, when, elevation = 0):
-    '''Common calculations for altitude and azimuth'''
-    # location-dependent calculations
-    projected_radial_distance = get_projected_radial_distance(elevation, latitude_deg)
-    projected_axial_distance = get_projected_axial_distance(elevation, latitude_deg)
+def get_geocentric_position(when):
+    '''Time-dependent calculations shared by every location
 
-    # time-dependent calculations
+    returns (apparent_sidereal_time, geocentric_sun_right_ascension,
+    geocentric_sun_declination, equatorial_horizontal_parallax) in degrees.
+    '''
     jd = stime.get_julian_solar_day(when)
     jde = stime.get_julian_ephemeris_day(when)
     jce = stime.get_julian_ephemeris_century(jde)
@@ -74,10 +74,25 @@ def get_topocentric_position(latitude_deg, longitude_deg, when, elevation = 0):
     apparent_sidereal_time = get_apparent_sidereal_time(jd, jme, nutation)
     true_ecliptic_obliquity = get_true_ecliptic_obliquity(jme, nutation)
 
-    # calculations dependent on location and time
     apparent_sun_longitude = get_apparent_sun_longitude(geocentric_longitude, nutation, aberration_correction)
     geocentric_sun_right_ascension = get_geocentric_sun_right_ascension(apparent_sun_longitude, true_ecliptic_obliquity, geocentric_latitude)
     geocentric_sun_declination = get_geocentric_sun_declination(apparent_sun_longitude, true_ecliptic_obliquity, geocentric_latitude)
+
+    return apparent_sidereal_time, geocentric_sun_right_ascension, geocentric_sun_declination, equatorial_horizontal_parallax
+
+
+@check_aware_dt('when')
+def get_topocentric_position(latitude_deg, longitude_deg, when, elevation = 0):
+    '''Common calculations for altitude and azimuth'''
+    # location-dependent calculations
+    projected_radial_distance = get_projected_radial_distance(elevation, latitude_deg)
+    projected_axial_distance = get_projected_axial_distance(elevation, latitude_deg)
+
+    # time-dependent calculations
+    apparent_sidereal_time, geocentric_sun_right_ascension, geocentric_sun_declination, equatorial_horizontal_parallax = \
+        get_geocentric_position(when)
+
+    # calculations dependent on location and time
     local_hour_angle = get_local_hour_angle(apparent_sidereal_time, longitude_deg, geocentric_sun_right_ascension)
     parallax_sun_right_ascension = get_parallax_sun_right_ascension(projected_radial_distance, equatorial_horizontal_parallax, local_hour_angle, geocentric_sun_declination)
     topocentric_local_hour_angle = get_topocentric_local_hour_angle(local_hour_angle, parallax_sun_right_ascension)
@@ -116,6 +131,159 @@ def get_position(latitude_deg, longitude_deg, when, elevation=0,
     return azimuth_deg, altitude_deg
 
 
+default_observer_cache_size = 8
+
+class Observer :
+    '''A fixed site, with the terms of get_position that depend only on the site
+    and its atmosphere computed once, and a cache of the positions of the last
+    cache_size distinct times. temperature in Kelvin and pressure in Pascal, as
+    for get_position. The site and atmosphere are read-only, as the precomputed
+    terms and the cache depend on them; make a new Observer to change them.'''
+
+    __slots__ = \
+        (
+            "cache_size",
+            "_latitude_deg",
+            "_longitude_deg",
+            "_elevation",
+            "_temperature",
+            "_pressure",
+            "_projected_radial_distance",
+            "_projected_axial_distance",
+            "_sin_latitude",
+            "_cos_latitude",
+            "_refraction_numerator",
+            "_refraction_denominator",
+            "_cache",
+        )
+
+    def __init__(self, latitude_deg, longitude_deg, elevation = 0, temperature = constants.standard_temperature, pressure = constants.standard_pressure, cache_size = default_observer_cache_size) :
+        self._latitude_deg = latitude_deg
+        self._longitude_deg = longitude_deg
+        self._elevation = elevation
+        self._temperature = temperature
+        self._pressure = pressure
+        self.cache_size = cache_size
+        self._projected_radial_distance = get_projected_radial_distance(elevation, latitude_deg)
+        self._projected_axial_distance = get_projected_axial_distance(elevation, latitude_deg)
+        latitude_rad = math.radians(latitude_deg)
+        self._sin_latitude = math.sin(latitude_rad)
+        self._cos_latitude = math.cos(latitude_rad)
+        # the factors of get_refraction_correction that depend only on the atmosphere,
+        # grouped as there so that results are identical
+        self._refraction_numerator = pressure * 2.830 * 1.02
+        self._refraction_denominator = 1010.0 * temperature * 60.0
+        self._cache = collections.OrderedDict()
+    #end __init__
+
+    @property
+    def latitude_deg(self) :
+        "the latitude of the site, in degrees."
+        return \
+            self._latitude_deg
+    #end latitude_deg
+
+    @property
+    def longitude_deg(self) :
+        "the longitude of the site, in degrees."
+        return \
+            self._longitude_deg
+    #end longitude_deg
+
+    @property
+    def elevation(self) :
+        "the elevation of the site, in metres."
+        return \
+            self._elevation
+    #end elevation
+
+    @property
+    def temperature(self) :
+        "the air temperature, in Kelvin."
+        return \
+            self._temperature
+    #end temperature
+
+    @property
+    def pressure(self) :
+        "the air pressure, in Pascal."
+        return \
+            self._pressure
+    #end pressure
+
+    @property
+    def projected_radial_distance(self) :
+        "get_projected_radial_distance for the site."
+        return \
+            self._projected_radial_distance
+    #end projected_radial_distance
+
+    @property
+    def projected_axial_distance(self) :
+        "get_projected_axial_distance for the site."
+        return \
+            self._projected_axial_distance
+    #end projected_axial_distance
+
+    def _get_position(self, when) :
+        apparent_sidereal_time, geocentric_sun_right_ascension, geocentric_sun_declination, equatorial_horizontal_parallax = \
+            get_geocentric_position(when)
+        local_hour_angle = get_local_hour_angle(apparent_sidereal_time, self._longitude_deg, geocentric_sun_right_ascension)
+        parallax_sun_right_ascension = get_parallax_sun_right_ascension(self._projected_radial_distance, equatorial_horizontal_parallax, local_hour_angle, geocentric_sun_declination)
+        topocentric_local_hour_angle = get_topocentric_local_hour_angle(local_hour_angle, parallax_sun_right_ascension)
+        topocentric_sun_declination = get_topocentric_sun_declination(geocentric_sun_declination, self._projected_axial_distance, equatorial_horizontal_parallax, parallax_sun_right_ascension, local_hour_angle)
+        # get_topocentric_elevation_angle, get_refraction_correction and
+        # get_topocentric_azimuth_angle with the site and atmosphere terms precomputed
+        tsd_rad = math.radians(topocentric_sun_declination)
+        tlha_rad = math.radians(topocentric_local_hour_angle)
+        tea = math.degrees(math.asin((self._sin_latitude * math.sin(tsd_rad)) + self._cos_latitude * math.cos(tsd_rad) * math.cos(tlha_rad)))
+        refraction_correction = math.where \
+          (
+            tea >= -1.0 * (0.26667 + 0.5667), # sun radius and atmospheric refraction
+            self._refraction_numerator / (self._refraction_denominator * math.tan(math.radians(tea + (10.3 / (tea + 5.11))))),
+            0.
+          )
+        altitude_deg = tea + refraction_correction
+        a = math.sin(tlha_rad)
+        b = math.cos(tlha_rad) * self._sin_latitude - math.tan(tsd_rad) * self._cos_latitude
+        azimuth_deg = (180.0 + math.degrees(math.atan2(a, b))) % 360
+        return \
+            azimuth_deg, altitude_deg
+    #end _get_position
+
+    def position(self, when) :
+        "returns (azimuth, altitude) of the sun in degrees at the aware datetime when," \
+        " as get_position does for this site."
+        cache = self._cache
+        if when in cache :
+            cache.move_to_end(when)
+            return \
+                cache[when]
+        #end if
+        result = self._get_position(when)
+        cache[when] = result
+        while len(cache) > self.cache_size :
+            cache.popitem(last = False)
+        #end while
+        return \
+            result
+    #end position
+
+    def position_many(self, times) :
+        "returns the azimuths and altitudes in degrees for a sequence of times. With the" \
+        " numpy backend, times may be a datetime64 array, computed in one pass into two" \
+        " arrays; otherwise each aware datetime goes through position, into two lists."
+        if math.current_mod == "numpy" and hasattr(times, "dtype") :
+            return \
+                self._get_position(times)
+        #end if
+        positions = [self.position(when) for when in times]
+        return \
+            [azimuth for azimuth, _ in positions], [altitude for _, altitude in positions]
+    #end position_many
+
+#end Observer
+
 @check_aware_dt('when')
 def get_altitude(latitude_deg, longitude_deg, when, elevation = 0,
                  temperature = constants.standard_temperature, pressure = constants.standard_pressure):
@@ -179,7 +347,33 @@ def get_azimuth_fast(latitude_deg, longitude_deg, when):
 
 def get_coeff(jme, coeffs):
     "computes a polynomial with time-varying coefficients from the given constant" \
-    " coefficients array and the current Julian millennium."
+    " coefficients and the current Julian millennium. coeffs is either a list per" \
+    " power of (amplitude, phase, frequency) terms, as from constants.get_table_lists," \
+    " or an array with rows of (power, amplitude, phase, frequency) in increasing" \
+    " power, as from constants.get_table, which is summed in one pass for a scalar jme."
+    if getattr(coeffs, "ndim", None) == 2 :
+        import numpy # already imported, as coeffs is an array
+        if numpy.ndim(jme) == 0 :
+            # index of the first term of each power
+            starts = numpy.flatnonzero(numpy.diff(coeffs[:, 0], prepend = -1))
+            terms = coeffs[:, 1] * numpy.cos(coeffs[:, 2] + coeffs[:, 3] * jme)
+            result = 0.0
+            for c in numpy.add.reduceat(terms, starts)[::-1].tolist() :
+                result = result * jme + c
+            #end for
+            return \
+                result
+        #end if
+        lines = []
+        for power, a, b, f in coeffs.tolist() :
+            while len(lines) <= power :
+                lines.append([])
+            #end while
+            lines[int(power)].append((a, b, f))
+        #end for
+        coeffs = lines
+    #end if
+    # one term at a time, so that memory does not grow with the number of terms
     result = 0.0
     x = 1.0
     for line in coeffs :
@@ -238,13 +432,24 @@ def get_geocentric_sun_right_ascension(apparent_sun_longitude, true_ecliptic_obl
     alpha = math.atan2((a - b),  c)
     return math.degrees(alpha) % 360
 
+def _get_table(name, x):
+    # the array table, summed in one pass, for a scalar under the numpy backend; else
+    # the lists, which the math backend reads without numpy
+    if math.current_mod == "numpy" and math.numpy.ndim(x) == 0 :
+        return \
+            constants.get_table(name)
+    #end if
+    return \
+        constants.get_table_lists(name)
+#end _get_table
+
 # Heliocentric functions calculate angles relative to the center of the sun.
 
 def get_heliocentric_latitude(jme):
-    return math.degrees(get_coeff(jme, constants.heliocentric_latitude_coeffs) / 1e8)
+    return math.degrees(get_coeff(jme, _get_table("heliocentric_latitude_coeffs", jme)) / 1e8)
 
 def get_heliocentric_longitude(jme):
-    return math.degrees(get_coeff(jme, constants.heliocentric_longitude_coeffs) / 1e8) % 360
+    return math.degrees(get_coeff(jme, _get_table("heliocentric_longitude_coeffs", jme)) / 1e8) % 360
 
 @check_aware_dt('when')
 def get_hour_angle(when, longitude_deg):
@@ -268,9 +473,6 @@ def get_mean_sidereal_time(jd):
     return sidereal_time % 360
 
 def get_nutation(jce):
-    abcd = constants.nutation_coefficients
-    nutation_long = []
-    nutation_oblique = []
     p = constants.get_aberration_coeffs()
     x = list \
       (
@@ -284,17 +486,29 @@ def get_nutation(jce):
                 'LongitudeOfAscendingNode',
             )
       )
-    y = constants.aberration_sin_terms
-    for i in range(len(abcd)):
-        sigmaxy = 0.0
-        for j in range(len(x)):
-            sigmaxy += x[j] * y[i][j]
+    abcd = _get_table("nutation_coefficients", jce)
+    y = _get_table("aberration_sin_terms", jce)
+    if getattr(abcd, "ndim", None) == 2 :
+        # all terms in one pass
+        numpy = math.numpy
+        sigmaxy = numpy.radians(numpy.dot(y, x))
+        nutation_long = float(numpy.dot(abcd[:, 0] + abcd[:, 1] * jce, numpy.sin(sigmaxy)))
+        nutation_oblique = float(numpy.dot(abcd[:, 2] + abcd[:, 3] * jce, numpy.cos(sigmaxy)))
+    else :
+        nutation_long = 0.0
+        nutation_oblique = 0.0
+        for (a, b, c, d), y_i in zip(abcd, y) :
+            sigmaxy = 0.0
+            for j in range(len(x)):
+                sigmaxy += x[j] * y_i[j]
+            #end for
+            nutation_long += (a + (b * jce)) * math.sin(math.radians(sigmaxy))
+            nutation_oblique += (c + (d * jce)) * math.cos(math.radians(sigmaxy))
         #end for
-        nutation_long.append((abcd[i][0] + (abcd[i][1] * jce)) * math.sin(math.radians(sigmaxy)))
-        nutation_oblique.append((abcd[i][2] + (abcd[i][3] * jce)) * math.cos(math.radians(sigmaxy)))
+    #end if
 
     # 36000000 scales from 0.0001 arcseconds to degrees
-    nutation = {'longitude' : sum(nutation_long)/36000000.0, 'obliquity' : sum(nutation_oblique)/36000000.0}
+    nutation = {'longitude' : nutation_long/36000000.0, 'obliquity' : nutation_oblique/36000000.0}
 
     return nutation
 #end get_nutation
@@ -320,7 +534,7 @@ def get_projected_axial_distance(elevation, latitude):
     return 0.99664719 * math.sin(flattened_latitude_rad) + (elevation * math.sin(latitude_rad) / constants.earth_radius)
 
 def get_sun_earth_distance(jme):
-    return get_coeff(jme, constants.sun_earth_distance_coeffs) / 1e8
+    return get_coeff(jme, _get_table("sun_earth_distance_coeffs", jme)) / 1e8
 
 def get_refraction_correction(pressure, temperature, topocentric_elevation_angle):
     #function and default values according to original NREL SPA C code
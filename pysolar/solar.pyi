@@ -1,7 +1,8 @@
 # Stubs for pysolar.solar (Python 3.6)
 
 import datetime
-from typing import List, Tuple
+import numpy
+from typing import Any, List, Tuple
 
 def solar_test() -> None: ...
 def equation_of_time(day:int) -> float: ...
@@ -12,11 +13,12 @@ def get_apparent_sidereal_time(jd:float, jme:float, nutation_float) -> float: ..
 def get_apparent_sun_longitude(geocentric_longitude:float, nutation:float, ab_correction:float) -> float: ...
 def get_azimuth(latitude_deg:float, longitude_deg:float, when:datetime.datetime, elevation:float = ...) -> float: ...
 def get_azimuth_fast(latitude_deg:float, longitude_deg:float, when:datetime.datetime) -> float: ...
-def get_coeff(jme:float, coeffs:List[List[float]]) -> float: ...
+def get_coeff(jme:float, coeffs:numpy.ndarray) -> float: ...
 def get_declination(day:int) -> float: ...
 def get_equatorial_horizontal_parallax(sun_earth_distance:float) -> float: ...
 def get_flattened_latitude(latitude:float) -> float: ...
 def get_geocentric_latitude(jme:float) -> float: ...
+def get_geocentric_position(when:datetime.datetime) -> Tuple[float, float, float, float]: ...
 def get_geocentric_longitude(jme:float) -> float: ...
 def get_geocentric_sun_declination(apparent_sun_longitude:float, true_ecliptic_obliquity:float, geocentric_latitude:float) -> float: ...
 def get_geocentric_sun_right_ascension(apparent_sun_longitude:float, true_ecliptic_obliquity:float, geocentric_latitude:float) -> float: ...
@@ -41,3 +43,25 @@ def get_topocentric_sun_declination(geocentric_sun_declination:float, projected_
 def get_topocentric_sun_right_ascension(projected_radial_distance:float, equatorial_horizontal_parallax:float, local_hour_angle:float, apparent_sun_longitude:float, true_ecliptic_obliquity:float, geocentric_latitude:float) -> float: ...
 def get_topocentric_zenith_angle(latitude:float, topocentric_sun_declination:float, topocentric_local_hour_angle:float, pressure:float, temperature:float) -> float: ...
 def get_true_ecliptic_obliquity(jme:float, nutation:float) -> float: ...
+
+default_observer_cache_size: int
+
+class Observer:
+    cache_size: int
+    @property
+    def latitude_deg(self) -> float: ...
+    @property
+    def longitude_deg(self) -> float: ...
+    @property
+    def elevation(self) -> float: ...
+    @property
+    def temperature(self) -> float: ...
+    @property
+    def pressure(self) -> float: ...
+    @property
+    def projected_radial_distance(self) -> float: ...
+    @property
+    def projected_axial_distance(self) -> float: ...
+    def __init__(self, latitude_deg:float, longitude_deg:float, elevation:float = ..., temperature:float = ..., pressure:float = ..., cache_size:int = ...) -> None: ...
+    def position(self, when:datetime.datetime) -> Tuple[float, float]: ...
+    def position_many(self, times:Any) -> Tuple[Any, Any]: ...
@@ -95,9 +95,34 @@ leap_seconds_adjustments = \
       (0, 0), # 2025    
     ]
 
+def get_year_month(when) :
+    "returns the UTC year and month (1-12) of a numpy datetime64 array as integer arrays." \
+    " Naive datetime64 values are taken to be UTC, as in the numeric module."
+    months = when.astype("datetime64[M]").astype(int)
+    return \
+        (months // 12 + 1970, months % 12 + 1)
+#end get_year_month
+
+def get_timestamp(when) :
+    "returns POSIX seconds for the specified datetime, or for each element of a" \
+    " numpy datetime64 array."
+    if hasattr(when, "shape") :
+        import numpy
+        result = (when - numpy.datetime64(0, "s")) / numpy.timedelta64(1, "s")
+    else :
+        result = when.timestamp()
+    #end if
+    return \
+        result
+#end get_timestamp
+
 @check_aware_dt('when')
 def get_leap_seconds(when) :
     "returns adjustment to be added to UTC at the specified datetime to produce TAI."
+    if hasattr(when, "shape") :
+        return \
+            get_leap_seconds_array(when)
+    #end if
     when = when.utctimetuple()
     adj = 10 # as decreed from 1972
     year = leap_seconds_base_year
@@ -135,6 +160,38 @@ def get_leap_seconds(when) :
         adj
 #end get_leap_seconds
 
+def get_leap_seconds_array(when) :
+    "array version of get_leap_seconds, for a numpy datetime64 array of UTC times."
+    import numpy
+    year, month = get_year_month(when)
+    adjustments = numpy.array(leap_seconds_adjustments)
+    nr_years = len(adjustments)
+    at_year_start = 10 + numpy.concatenate(([0], numpy.cumsum(adjustments.sum(axis = 1))))
+    index = year - leap_seconds_base_year
+    if numpy.any((index > nr_years) | (index == nr_years) & (month > 6)) :
+        warnings.warn \
+          (
+                "Leap seconds for year %d are not available for the installed version of pysolar"
+            %
+                (leap_seconds_base_year + nr_years - 1)
+          )
+    #end if
+    in_table = (index >= 0) & (index < nr_years)
+    adj = \
+        (
+            at_year_start[numpy.clip(index, 0, nr_years)]
+        +
+            numpy.where
+              (
+                in_table & (month > 6),
+                adjustments[numpy.clip(index, 0, nr_years - 1), 0],
+                0
+              )
+        )
+    return \
+        numpy.where(index < 0, 10, adj)
+#end get_leap_seconds_array
+
 # table of values to add to UT1 to get TT (to date), generated by util/get_delta_t script
 delta_t_base_year = 1973
 delta_t_base_month = 2
@@ -724,6 +781,10 @@ delta_t = \
 @check_aware_dt('when')
 def get_delta_t(when) :
     "returns a suitable value for delta_t for the given datetime."
+    if hasattr(when, "shape") :
+        return \
+            get_delta_t_array(when)
+    #end if
     when = when.utctimetuple()
     year, month = when.tm_year, when.tm_mon
     if year < delta_t_base_year :
@@ -742,6 +803,19 @@ def get_delta_t(when) :
           # don't bother doing any fancy interpolation
 #end get_delta_t
 
+def get_delta_t_array(when) :
+    "array version of get_delta_t, for a numpy datetime64 array of UTC times."
+    import numpy
+    year, month = get_year_month(when)
+    last_year = delta_t_base_year + len(delta_t) - 1
+    month = numpy.where(year < delta_t_base_year, 1, month)
+    year = numpy.clip(year, delta_t_base_year, last_year)
+    month = numpy.where(year == last_year, numpy.minimum(month, len(delta_t[-1])), month)
+    index = numpy.maximum((year - delta_t_base_year) * 12 + month - delta_t_base_month, 0)
+    return \
+        numpy.array([value for year_values in delta_t for value in year_values])[index]
+#end get_delta_t_array
+
 @check_aware_dt('when')
 def get_julian_solar_day(when):
     "returns the UT Julian day number (including fraction of a day) corresponding to" \
@@ -750,7 +824,7 @@ def get_julian_solar_day(when):
     " happened over such wildly varying times in different regions."
     return \
         (
-                (when.timestamp() + get_leap_seconds(when) + tt_offset - get_delta_t(when))
+                (get_timestamp(when) + get_leap_seconds(when) + tt_offset - get_delta_t(when))
             /
                 seconds_per_day
         +
@@ -768,7 +842,7 @@ def get_julian_ephemeris_day(when) :
     " happened over such wildly varying times in different regions."
     return \
         (
-                (when.timestamp() + get_leap_seconds(when) + tt_offset)
+                (get_timestamp(when) + get_leap_seconds(when) + tt_offset)
             /
                 seconds_per_day
         +
@@ -1,7 +1,8 @@
 # Stubs for pysolar.time (Python 3.6)
 
 import datetime
-from typing import List, Tuple
+import numpy
+from typing import List, Tuple, Union
 
 julian_day_offset: float
 gregorian_day_offset: int
@@ -9,13 +10,17 @@ tt_offset: float
 leap_seconds_base_year: int
 leap_seconds_adjustments: List[Tuple[float,float]]
 
+def get_year_month(when:numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]: ...
+def get_timestamp(when:Union[datetime.datetime, numpy.ndarray]) -> Union[float, numpy.ndarray]: ...
 def get_leap_seconds(when:datetime.datetime) -> int: ...
+def get_leap_seconds_array(when:numpy.ndarray) -> numpy.ndarray: ...
 
 delta_t_base_year: int
 delta_t_base_month: int
 delta_t: List[List[float]]
 
 def get_delta_t(when:datetime.datetime) -> float: ...
+def get_delta_t_array(when:numpy.ndarray) -> numpy.ndarray: ...
 def get_julian_solar_day(when:datetime.datetime) -> float: ...
 def get_julian_ephemeris_day(when:datetime.datetime) -> float: ...
 def get_julian_century(julian_day:float) -> float: ...
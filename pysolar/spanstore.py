@@ -0,0 +1,186 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Streaming storage of long simulated spans
+
+write_span computes a span of simulate.simulate_times in fixed-size chunks
+of time steps and writes each one to its own file in a directory, as
+columns named after the fields of simulate.span_dtype: an .npz archive, or
+a Parquet file when pyarrow is installed. Only one chunk is held in memory
+at a time.
+
+A manifest.json file in the directory records the parameters of the span
+and the chunks completed so far. Chunk files and the manifest are written
+to temporary files and renamed into place, so an interrupted run leaves
+only whole chunks behind and calling write_span again with the same
+parameters carries on from the first missing chunk.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import numpy
+from . import constants, simulate
+from .horizon import HorizonProfile
+
+try :
+    import pyarrow
+    import pyarrow.parquet
+except ImportError :
+    pyarrow = None
+#end try
+
+manifest_name = "manifest.json"
+formats = ("npz", "parquet")
+default_chunk_steps = 86400
+
+def _write_atomic(path, write):
+    "calls write(f) on a temporary file in the directory of path, then renames it to path."
+    fd, temp_path = tempfile.mkstemp(dir = os.path.dirname(path), suffix = ".tmp")
+    try :
+        with os.fdopen(fd, "wb") as f :
+            write(f)
+        #end with
+        os.replace(temp_path, path)
+    except BaseException :
+        os.unlink(temp_path)
+        raise
+    #end try
+#end _write_atomic
+
+def _get_horizon_digest(horizon):
+    if isinstance(horizon, HorizonProfile) :
+        values = horizon.elevation_deg
+    else :
+        values = numpy.asarray(horizon, dtype = float)
+    #end if
+    return \
+        type(horizon).__name__ + ":" + hashlib.sha1(numpy.ascontiguousarray(values).tobytes()).hexdigest()
+#end _get_horizon_digest
+
+def read_manifest(directory):
+    "returns the manifest of the span stored in directory, or None if there is none."
+    path = os.path.join(directory, manifest_name)
+    if not os.path.exists(path) :
+        return \
+            None
+    #end if
+    with open(path) as f :
+        return \
+            json.load(f)
+    #end with
+#end read_manifest
+
+def _write_manifest(directory, manifest):
+    _write_atomic \
+      (
+        os.path.join(directory, manifest_name),
+        lambda f : f.write(json.dumps(manifest, indent = 1, sort_keys = True).encode())
+      )
+#end _write_manifest
+
+def _write_chunk(path, records, format):
+    columns = {name : records[name] for name in records.dtype.names}
+    if format == "parquet" :
+        table = pyarrow.table(columns)
+        _write_atomic(path, lambda f : pyarrow.parquet.write_table(table, f))
+    else :
+        _write_atomic(path, lambda f : numpy.savez(f, **columns))
+    #end if
+#end _write_chunk
+
+def write_span(directory, latitude_deg, longitude_deg, horizon, start_datetime, end_datetime, step_minutes, elevation = 0, temperature = constants.standard_temperature, pressure = constants.standard_pressure, chunk_steps = default_chunk_steps, format = None):
+    '''Simulates the span as simulate.simulate_span_chunks does and writes it to
+    directory, one file per chunk of chunk_steps time steps, resuming an earlier
+    run with the same parameters. format is "npz" or "parquet"; the default is
+    "parquet" when pyarrow is installed.
+
+    returns the manifest, whose "chunks" entry lists the chunk file names in
+    time order. Raises ValueError if directory holds a span with different
+    parameters.
+    '''
+    if format is None :
+        format = "parquet" if pyarrow is not None else "npz"
+    #end if
+    if format not in formats :
+        raise ValueError("format must be one of %s" % ", ".join(formats))
+    #end if
+    if format == "parquet" and pyarrow is None :
+        raise ValueError("the parquet format needs pyarrow")
+    #end if
+    parameters = \
+        {
+            "latitude_deg" : float(latitude_deg),
+            "longitude_deg" : float(longitude_deg),
+            "horizon" : _get_horizon_digest(horizon),
+            "start" : str(simulate.get_datetime64(start_datetime)),
+            "end" : str(simulate.get_datetime64(end_datetime)),
+            "step_minutes" : float(step_minutes),
+            "elevation" : float(elevation),
+            "temperature" : float(temperature),
+            "pressure" : float(pressure),
+            "chunk_steps" : int(chunk_steps),
+            "format" : format,
+        }
+    os.makedirs(directory, exist_ok = True)
+    manifest = read_manifest(directory)
+    if manifest is None :
+        manifest = {"parameters" : parameters, "chunks" : []}
+        _write_manifest(directory, manifest)
+    elif manifest["parameters"] != parameters :
+        raise ValueError("%s holds a span with different parameters" % directory)
+    #end if
+    nr_done = len(manifest["chunks"])
+    for index, when in enumerate(simulate.get_time_chunks(start_datetime, end_datetime, step_minutes, chunk_steps)) :
+        if index < nr_done :
+            continue
+        #end if
+        records = simulate.simulate_times(latitude_deg, longitude_deg, horizon, when, elevation, temperature, pressure)
+        name = "chunk_%06d.%s" % (index, format)
+        _write_chunk(os.path.join(directory, name), records, format)
+        # the manifest only lists a chunk once its file is complete
+        manifest["chunks"].append(name)
+        _write_manifest(directory, manifest)
+    #end for
+    return \
+        manifest
+#end write_span
+
+def read_span_chunks(directory):
+    "yields the chunks of the span stored in directory in time order, as structured" \
+    " arrays of simulate.span_dtype."
+    manifest = read_manifest(directory)
+    if manifest is None :
+        raise ValueError("%s holds no span" % directory)
+    #end if
+    for name in manifest["chunks"] :
+        path = os.path.join(directory, name)
+        if manifest["parameters"]["format"] == "parquet" :
+            table = pyarrow.parquet.read_table(path)
+            columns = {name : table.column(name).to_numpy() for name in simulate.span_dtype.names}
+        else :
+            with numpy.load(path) as archive :
+                columns = {name : archive[name] for name in simulate.span_dtype.names}
+            #end with
+        #end if
+        records = numpy.empty(len(columns["time"]), dtype = simulate.span_dtype)
+        for name, values in columns.items() :
+            records[name] = values
+        #end for
+        yield records
+    #end for
+#end read_span_chunks
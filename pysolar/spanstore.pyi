@@ -0,0 +1,14 @@
+# Stubs for pysolar.spanstore (Python 3.6)
+
+import datetime
+import numpy
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+from .horizon import HorizonProfile
+
+manifest_name: str
+formats: Tuple[str, ...]
+default_chunk_steps: int
+
+def read_manifest(directory:str) -> Optional[Dict[str, Any]]: ...
+def write_span(directory:str, latitude_deg:float, longitude_deg:float, horizon:Union[Sequence[float], HorizonProfile], start_datetime:Union[datetime.datetime, numpy.datetime64], end_datetime:Union[datetime.datetime, numpy.datetime64], step_minutes:float, elevation:float = ..., temperature:float = ..., pressure:float = ..., chunk_steps:int = ..., format:Optional[str] = ...) -> Dict[str, Any]: ...
+def read_span_chunks(directory:str) -> Iterator[numpy.ndarray]: ...
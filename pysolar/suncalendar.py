@@ -0,0 +1,124 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Per-site annual calendars of sunrise, sunset and transit times
+
+A calendar holds the results of util.get_sunrise_sunset_transit for every day
+of one year at one site, as a compact float32 array of hours after UTC
+midnight. Calendars are filled in one vectorized pass on first use, kept in
+an in-memory LRU and optionally persisted as .npy files in a local directory,
+so that repeated lookups for the same sites and dates avoid the calculation.
+"""
+import calendar
+import collections
+import datetime
+import os
+import tempfile
+import numpy
+from . import numeric, util
+
+def get_year_hours(latitude_deg, longitude_deg, year):
+    "returns a float32 array of shape (days in year, 3) holding sunrise, sunset and" \
+    " transit in hours after UTC midnight for each day of the year, NaN where the sun" \
+    " does not rise or set. Computed with the numpy backend."
+    day = numpy.arange(1, 366 + calendar.isleap(year))
+    with numeric.backend("numpy"), numpy.errstate(invalid = 'ignore') :
+        hours = util.get_sunrise_sunset_transit_hours(latitude_deg, longitude_deg, day)
+    #end with
+    return \
+        numpy.stack(hours, axis = -1).astype(numpy.float32)
+#end get_year_hours
+
+class SunCalendarCache :
+    '''Cache of annual sunrise/sunset/transit calendars keyed by (site, year).
+
+    directory, if given, is a local directory where calendars are persisted
+    so that they survive the process; maxsize bounds the number of calendars
+    kept in memory. Sites are identified by latitude and longitude rounded to
+    1e-6 degrees.
+    '''
+
+    def __init__(self, directory = None, maxsize = 1024) :
+        self.directory = directory
+        self.maxsize = maxsize
+        self._calendars = collections.OrderedDict()
+        if directory is not None :
+            os.makedirs(directory, exist_ok = True)
+        #end if
+    #end __init__
+
+    def _path(self, key) :
+        return \
+            os.path.join(self.directory, "%+.6f_%+.6f_%d.npy" % key)
+    #end _path
+
+    def get_year(self, latitude_deg, longitude_deg, year) :
+        "returns the calendar array for the site and year; see get_year_hours."
+        key = (round(latitude_deg, 6), round(longitude_deg, 6), year)
+        hours = self._calendars.get(key)
+        if hours is not None :
+            self._calendars.move_to_end(key)
+            return \
+                hours
+        #end if
+        path = self._path(key) if self.directory is not None else None
+        if path is not None and os.path.exists(path) :
+            hours = numpy.load(path)
+        else :
+            hours = get_year_hours(key[0], key[1], year)
+            if path is not None :
+                # write to a temporary file first so readers never see a partial calendar
+                fd, temp_path = tempfile.mkstemp(dir = self.directory, suffix = ".npy")
+                with os.fdopen(fd, "wb") as f :
+                    numpy.save(f, hours)
+                #end with
+                os.replace(temp_path, path)
+            #end if
+        #end if
+        hours.flags.writeable = False
+        self._calendars[key] = hours
+        if len(self._calendars) > self.maxsize :
+            self._calendars.popitem(last = False)
+        #end if
+        return \
+            hours
+    #end get_year
+
+    def get_sunrise_sunset_transit(self, latitude_deg, longitude_deg, when) :
+        '''Same as util.get_sunrise_sunset_transit, answered from the calendar.
+        Times are for the same day in the same timezone as when; None replaces
+        a sunrise or sunset that does not happen.'''
+        utc_offset = when.utcoffset()
+        utc_offset_hours = utc_offset.total_seconds() / 3600 if utc_offset is not None else 0
+        day = when.timetuple().tm_yday
+        hours = self.get_year(latitude_deg, longitude_deg, when.year)[day - 1].tolist()
+        same_day = datetime.datetime(year = when.year, month = when.month, day = when.day, tzinfo = when.tzinfo)
+        return \
+            tuple \
+              (
+                same_day + datetime.timedelta(hours = h + utc_offset_hours)
+                    if h == h else None # NaN marks a missing event
+                for h in hours
+              )
+    #end get_sunrise_sunset_transit
+
+    def clear(self) :
+        "empties the in-memory LRU; persisted calendars are kept."
+        self._calendars.clear()
+    #end clear
+
+#end SunCalendarCache
@@ -0,0 +1,15 @@
+# Stubs for pysolar.suncalendar (Python 3.6)
+
+import datetime
+import numpy
+from typing import Optional, Tuple
+
+def get_year_hours(latitude_deg:float, longitude_deg:float, year:int) -> numpy.ndarray: ...
+
+class SunCalendarCache:
+    directory: Optional[str]
+    maxsize: int
+    def __init__(self, directory:Optional[str] = ..., maxsize:int = ...) -> None: ...
+    def get_year(self, latitude_deg:float, longitude_deg:float, year:int) -> numpy.ndarray: ...
+    def get_sunrise_sunset_transit(self, latitude_deg:float, longitude_deg:float, when:datetime.datetime) -> Tuple[Optional[datetime.datetime], Optional[datetime.datetime], Optional[datetime.datetime]]: ...
+    def clear(self) -> None: ...
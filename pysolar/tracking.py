@@ -0,0 +1,127 @@
+#    Copyright Brandon Stafford
+#
+#    This file is part of Pysolar.
+#
+#    Pysolar is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    Pysolar is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
+
+"""Rotation angles of single-axis trackers, with backtracking
+
+A tracker row turns about an axis that points towards axis_azimuth (degrees
+clockwise from north) and dips below the horizontal by axis_tilt in that
+direction. At rotation 0 the panels face up, tilted by axis_tilt; positive
+rotations turn them to the right of the axis direction, which is west for
+the usual axis pointing south.
+
+The ideal rotation points the panel normal as close to the sun as the axis
+allows. Backtracking then turns the rows back towards flat, just enough
+that a row does not shade its neighbour on level ground with the given
+ground coverage ratio (panel width / row pitch); see Anderson and
+Mikofski, "Slope-Aware Backtracking for Single-Axis Trackers", NREL 2020.
+
+Sun arguments broadcast together and row arguments broadcast together;
+results have the shape of the sun arguments followed by that of the rows,
+so a plant is evaluated with one sun position per timestep. Rotations are
+NaN while the sun is below the horizon.
+"""
+import numpy
+from . import numeric, poa, solar
+
+default_axis_azimuth = 180.0
+default_max_angle = 90.0
+default_gcr = 2 / 7
+
+def get_axis_frames(axis_tilt = 0.0, axis_azimuth = default_axis_azimuth):
+    "returns (normal, right), the unit panel normal at rotation 0 and the horizontal" \
+    " unit vector to the right of the axis, each with shape 3 followed by the broadcast" \
+    " shape of the arguments, in the frame of poa.get_sun_vectors."
+    tilt_rad = numpy.radians(axis_tilt)
+    azimuth_rad = numpy.radians(axis_azimuth)
+    sin_tilt = numpy.sin(tilt_rad)
+    cos_azimuth = numpy.cos(azimuth_rad)
+    sin_azimuth = numpy.sin(azimuth_rad)
+    normal = numpy.stack(numpy.broadcast_arrays(sin_tilt * cos_azimuth, sin_tilt * sin_azimuth, numpy.cos(tilt_rad)))
+    right = numpy.stack(numpy.broadcast_arrays(-sin_azimuth, cos_azimuth, numpy.zeros_like(tilt_rad)))
+    return \
+        normal, right
+#end get_axis_frames
+
+def get_tracker_angles(altitude_deg, azimuth_deg, axis_tilt = 0.0, axis_azimuth = default_axis_azimuth, max_angle = default_max_angle, gcr = default_gcr, backtrack = True):
+    '''Rotation of single-axis tracker rows following the sun.
+
+    altitude_deg and azimuth_deg give the sun's position, as returned by
+    solar.get_position. axis_tilt, axis_azimuth, max_angle and gcr describe
+    the rows and may be arrays that broadcast together.
+
+    returns a dict with
+        "ideal_rotation": rotation in degrees that best faces the sun,
+        "rotation": the same limited to +/-max_angle, after backtracking if
+            backtrack is true,
+        "aoi": angle of incidence of the sun on the panels at "rotation",
+        "slope", "slope_orientation": tilt and orientation of the panels at
+            "rotation", in the convention of solar.get_incidence_angle.
+    '''
+    sun = poa.get_sun_vectors(altitude_deg, azimuth_deg)
+    sun_shape = sun.shape[:-1]
+    normal, right = get_axis_frames(axis_tilt, axis_azimuth)
+    row_shape = numpy.broadcast_shapes(normal.shape[1:], numpy.shape(max_angle), numpy.shape(gcr))
+    normal, right = \
+        (
+            numpy.broadcast_to(value.reshape((3,) + (1,) * (len(row_shape) + 1 - value.ndim) + value.shape[1:]), (3,) + row_shape).reshape(3, -1)
+            for value in (normal, right)
+        )
+    sun = sun.reshape(-1, 3)
+    shape = sun_shape + row_shape
+    # both projections come from one product with the stacked row frames
+    projection = sun @ numpy.concatenate((normal, right), axis = 1)
+    along_normal, along_right = projection[:, :normal.shape[1]].reshape(shape), projection[:, normal.shape[1]:].reshape(shape)
+    is_daytime = numpy.broadcast_to(numpy.asarray(altitude_deg) > 0, sun_shape)[(Ellipsis,) + (None,) * len(row_shape)]
+    ideal = numpy.where(is_daytime, numpy.degrees(numpy.arctan2(along_right, along_normal)), numpy.nan)
+    rotation = ideal
+    if backtrack :
+        # rows shade each other when the shadow of a row, cos(ideal) / gcr wide, is
+        # narrower than the pitch; turning back by arccos(cos(ideal) / gcr) removes it
+        with numpy.errstate(invalid = 'ignore') :
+            correction = numpy.degrees(numpy.arccos(numpy.minimum(numpy.cos(numpy.radians(ideal)) / gcr, 1)))
+        #end with
+        rotation = ideal - numpy.sign(ideal) * correction
+    #end if
+    rotation = numpy.clip(rotation, -numpy.asarray(max_angle), max_angle)
+    rotation_rad = numpy.radians(rotation)
+    cos_rotation = numpy.cos(rotation_rad)
+    sin_rotation = numpy.sin(rotation_rad)
+    cos_aoi = numpy.clip(along_normal * cos_rotation + along_right * sin_rotation, -1, 1)
+    # panel normal after rotation, in the frame of poa.get_sun_vectors
+    normal, right = (value.reshape((3,) + (1,) * len(sun_shape) + row_shape) for value in (normal, right))
+    panel = normal * cos_rotation[None] + right * sin_rotation[None]
+    return \
+        {
+            "ideal_rotation" : ideal,
+            "rotation" : rotation,
+            "aoi" : numpy.degrees(numpy.arccos(cos_aoi)),
+            "slope" : numpy.degrees(numpy.arccos(numpy.clip(panel[2], -1, 1))),
+            # the panel faces azimuth slope_orientation + 180 clockwise from north
+            "slope_orientation" : numpy.degrees(numpy.arctan2(panel[1], panel[0])) % 360 - 180,
+        }
+#end get_tracker_angles
+
+def get_tracker_positions(latitude_deg, longitude_deg, when, elevation = 0, **kwargs):
+    "computes the sun's position at the plant once for each of the times in when and" \
+    " returns get_tracker_angles for it; keyword arguments describe the rows. The" \
+    " position is computed with the numpy backend."
+    with numeric.backend("numpy") :
+        azimuth_deg, altitude_deg = solar.get_position(latitude_deg, longitude_deg, when, elevation)
+    #end with
+    return \
+        get_tracker_angles(altitude_deg, azimuth_deg, **kwargs)
+#end get_tracker_positions
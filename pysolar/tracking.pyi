@@ -0,0 +1,15 @@
+# Stubs for pysolar.tracking (Python 3.6)
+
+import datetime
+import numpy
+from typing import Any, Dict, Tuple, Union
+
+default_axis_azimuth: float
+default_max_angle: float
+default_gcr: float
+
+ArrayLike = Union[numpy.ndarray, float]
+
+def get_axis_frames(axis_tilt:ArrayLike = ..., axis_azimuth:ArrayLike = ...) -> Tuple[numpy.ndarray, numpy.ndarray]: ...
+def get_tracker_angles(altitude_deg:ArrayLike, azimuth_deg:ArrayLike, axis_tilt:ArrayLike = ..., axis_azimuth:ArrayLike = ..., max_angle:ArrayLike = ..., gcr:ArrayLike = ..., backtrack:bool = ...) -> Dict[str, numpy.ndarray]: ...
+def get_tracker_positions(latitude_deg:float, longitude_deg:float, when:Union[datetime.datetime, numpy.ndarray], elevation:float = ..., **kwargs:Any) -> Dict[str, numpy.ndarray]: ...
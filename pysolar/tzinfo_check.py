@@ -1,6 +1,9 @@
 from functools import wraps
 import inspect
+import time
 
+# called with the seconds spent in each check when set; see profiling.py
+check_observer = None
 
 
 class NoTimeZoneInfoError(ValueError):
@@ -72,6 +75,9 @@ def check_aware_dt(*argnames):
         we return the very same result that would have been returned
         by the 'func' function alone
         we just checked the values of args from argnames before"""
+      # read once, so that setting check_observer during the check is harmless
+      observer = check_observer
+      begin = time.perf_counter() if observer is not None else None
       for argname in argnames:
         # first checking if argname is a valid arg name
         full = inspect.getfullargspec(func)
@@ -90,6 +96,8 @@ def check_aware_dt(*argnames):
     for arg '%s', got %s instead" % (argname, dt))
             if dt.tzinfo is None:
               raise NoTimeZoneInfoError(argname, dt)
+      if observer is not None:
+        observer(time.perf_counter() - begin)
       return func(*args, **kwargs)
     return func_with_check
   return checker
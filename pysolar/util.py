@@ -30,6 +30,7 @@
 from datetime import \
     datetime, \
     timedelta
+import functools
 from . import numeric as math
 from . import solar, constants
 from .tzinfo_check import check_aware_dt
@@ -96,7 +97,37 @@ def get_sunrise_sunset_transit(latitude_deg, longitude_deg, when):
         utc_offset = 0
     #end if
     day = when.timetuple().tm_yday # Day of the year
-    SHA = utc_offset / 3600 * 15.0 - longitude_deg # Solar hour angle
+    sunrise_hours, sunset_hours, transit_hours = \
+        get_sunrise_sunset_transit_hours(latitude_deg, longitude_deg, day, utc_offset / 3600)
+    same_day = datetime(year = when.year, month = when.month, day = when.day, tzinfo = when.tzinfo)
+    sunrise_time = same_day + timedelta(hours = sunrise_hours)
+    sunset_time = same_day + timedelta(hours = sunset_hours)
+    transit_time = same_day + timedelta(hours = transit_hours)
+    return sunrise_time, sunset_time, transit_time
+
+def get_sunrise_sunset_transit_hours(latitude_deg, longitude_deg, day, utc_offset_hours = 0):
+    """Arithmetic behind get_sunrise_sunset_transit, for a day of the year rather than
+    a datetime, so that it can be evaluated for arrays of days or locations at once.
+
+    Parameters
+    ----------
+    latitude_deg : float
+        latitude in decimal degree.
+    longitude_deg : float
+        longitude in decimal degree.
+    day : int
+        day of the year, 1 for January 1st.
+    utc_offset_hours : float
+        offset of the local time zone from UTC in hours.
+
+    Returns
+    -------
+    sunrise_hours, sunset_hours, transit_hours : float
+        sunrise, sunset and sun transit times in hours after local midnight.
+        With the numpy backend, days without sunrise or sunset give NaN.
+
+    """
+    SHA = utc_offset_hours * 15.0 - longitude_deg # Solar hour angle
     TT = 2 * math.pi * day / 366
     decl = \
         (
@@ -156,11 +187,7 @@ def get_sunrise_sunset_transit(latitude_deg, longitude_deg, when):
         *
             (12 / math.pi)
         )
-    same_day = datetime(year = when.year, month = when.month, day = when.day, tzinfo = when.tzinfo)
-    sunrise_time = same_day + timedelta(hours = TON - ha)
-    sunset_time = same_day + timedelta(hours = TON + ha)
-    transit_time = same_day + timedelta(hours = TON)
-    return sunrise_time, sunset_time, transit_time
+    return TON - ha, TON + ha, TON
 
 @check_aware_dt('when')
 def get_sunrise_sunset(latitude_deg, longitude_deg, when):
@@ -209,7 +236,7 @@ def mean_earth_sun_distance(when):
             radiation models, p.113
     """
 
-    return 1 - 0.0335 * math.sin(2 * math.pi * (when.utctimetuple().tm_yday - 94)) / 365
+    return 1 - 0.0335 * math.sin(2 * math.pi * (math.tm_yday(when) - 94)) / 365
 
 @check_aware_dt('when')
 def extraterrestrial_irrad(latitude_deg, longitude_deg, when, SC=SC_default):
@@ -236,25 +263,59 @@ def extraterrestrial_irrad(latitude_deg, longitude_deg, when, SC=SC_default):
 
     Returns
     -------
-    EXTR1 : float
+    EXTR1 : float or numpy.ndarray
         Extraterrestrial irradiation
 
+    With the numpy backend, when may be an array of datetime64 (taken as UTC) and the
+    site arguments arrays that broadcast with it.
+
     References
     ----------
     .. [1] http://solardat.uoregon.edu/SolarRadiationBasics.html
     .. [2] Dr. J. Schumacher and et al,"INSEL LE(Integrated Simulation Environment Language)Block reference",p.68
 
     """
-    day = when.utctimetuple().tm_yday
+    eccentricity, decl = get_day_terms(math.tm_yday(when))
+    ha = math.radians(solar.get_hour_angle(when, longitude_deg))
+    ZA = math.sin(math.radians(latitude_deg)) * math.sin(decl) + math.cos(math.radians(latitude_deg)) * math.cos(decl) * math.cos(ha)
+
+    return math.where(ZA > 0, SC * ZA * eccentricity, 0.0)
+
+
+@functools.lru_cache(maxsize = 366)
+def _get_day_terms(day):
     ab = math.cos(2 * math.pi * (day - 1.0)/(365.0))
     bc = math.sin(2 * math.pi * (day - 1.0)/(365.0))
     cd = math.cos(2 * (2 * math.pi * (day - 1.0)/(365.0)))
     df = math.sin(2 * (2 * math.pi * (day - 1.0)/(365.0)))
-    decl = math.radians(solar.get_declination(day))
-    ha = math.radians(solar.get_hour_angle(when, longitude_deg))
-    ZA = math.sin(math.radians(latitude_deg)) * math.sin(decl) + math.cos(math.radians(latitude_deg)) * math.cos(decl) * math.cos(ha)
+    eccentricity = 1.00010 + 0.034221 * ab + 0.001280 * bc + 0.000719 * cd + 0.000077 * df
+    return eccentricity, math.radians(solar.get_declination(day))
+
+
+def get_day_terms(day):
+    """Returns the eccentricity correction factor and the solar declination in radians used by
+    extraterrestrial_irrad for a day of the year, or an array of them.
 
-    return SC * ZA * (1.00010 + 0.034221 * ab + 0.001280 * bc + 0.000719 * cd + 0.000077 * df) if ZA > 0 else 0.0
+    The terms only depend on the day, so they are computed once per distinct day and cached;
+    a long series of timestamps costs one evaluation per day it covers.
+
+    Parameters
+    ----------
+    day : int or array_like
+        day of the year, 1 for January 1st
+
+    Returns
+    -------
+    eccentricity, declination : float or numpy.ndarray
+        arrays of the same shape as day when day is an array
+
+    """
+    if getattr(day, 'shape', ()) == ():
+        return _get_day_terms(int(day))
+    import numpy # only reached with the numpy backend
+    days, inverse = numpy.unique(day, return_inverse = True)
+    terms = numpy.array([_get_day_terms(int(d)) for d in days]).reshape(-1, 2)
+    return terms[inverse, 0].reshape(numpy.shape(day)), terms[inverse, 1].reshape(numpy.shape(day))
 
 
 @check_aware_dt('when')
@@ -280,7 +341,7 @@ def declination_degree(when, TY = TY_default):
     .. [1] http://pysolar.org/
 
     """
-    return constants.earth_axis_inclination * math.sin((2 * math.pi / (TY)) * ((when.utctimetuple().tm_yday) - 81))
+    return constants.earth_axis_inclination * math.sin((2 * math.pi / (TY)) * ((math.tm_yday(when)) - 81))
 
 
 @check_aware_dt('when')
@@ -572,15 +633,12 @@ def global_irradiance_clear(latitude_deg, longitude_deg, when,
             new approaches", energy 30 (2005), pp 1533 - 1549.
 
     """
-    DIRC =  direct_underclear(latitude_deg, longitude_deg, when,
-                              TY, AM, TL, elevation, temperature = constants.standard_temperature,
-                              pressure = constants.standard_pressure)
+    # direct and diffuse share one evaluation of the solar altitude
+    components = get_clear_sky_components(latitude_deg, longitude_deg, when,
+                                          TY, AM, TL, elevation, temperature = constants.standard_temperature,
+                                          pressure = constants.standard_pressure)
 
-    DIFFC = diffuse_underclear(latitude_deg, longitude_deg, when,
-                               elevation, temperature = constants.standard_temperature, 
-                               pressure= constants.standard_pressure)
-
-    ghic = (DIRC + DIFFC)
+    ghic = components['global_irradiance_clear']
 
     return ghic
 
@@ -630,6 +688,89 @@ def global_irradiance_overcast(latitude_deg, longitude_deg, when,
     return ghioc
 
 
+@check_aware_dt('when')
+def get_clear_sky_components(latitude_deg, longitude_deg, when,
+                             TY = TY_default, AM = AM_default, TL = TL_default, elevation = elevation_default,
+                             temperature = constants.standard_temperature, pressure = constants.standard_pressure,
+                             altitude_deg = None):
+    """Evaluates all the clear sky and overcast sky model components at once.
+
+    The functions solarelevation_function_clear, solarelevation_function_overcast,
+    diffuse_underclear, diffuse_underovercast, direct_underclear, global_irradiance_clear
+    and global_irradiance_overcast each compute the solar altitude; this computes it once,
+    or takes it precomputed, and returns the same values from it. With the numpy backend,
+    when may be an array of datetime64 and the site arguments arrays that broadcast with it,
+    e.g. sites along a leading axis and times along the last.
+
+    Parameters
+    ----------
+    latitude_deg : float or array_like
+        latitude in decimal degree.
+    longitude_deg : float or array_like
+        longitude in decimal degree.
+    when : datetime.datetime or array_like of numpy.datetime64
+        date/time for which to do the calculation
+    TY : float
+        Total number of days in a year. eg. 365 days per year,(no leap days)
+    AM : float
+        Air mass.
+    TL : float
+        Linke turbidity factor
+    elevation : float or array_like
+        The elevation of a geographic location is its height above a fixed reference point, often the mean
+        sea level.
+    temperature : float
+        atmospheric temperature in kelvin
+    pressure : float
+        pressure in pascals
+    altitude_deg : float or array_like, optional
+        solar altitude as returned by solar.get_altitude for the same arguments; computed if omitted.
+
+    Returns
+    -------
+    components : dict
+        'altitude', 'solarelevation_function_clear', 'solarelevation_function_overcast',
+        'diffuse_transmittance', 'diffuse_underclear', 'diffuse_underovercast', 'direct_underclear',
+        'global_irradiance_clear' and 'global_irradiance_overcast', each as the function of that name
+        would return it.
+
+    References
+    ----------
+    .. [1] S. Younes, R.Claywell and el al,"Quality control of solar radiation data: present status and proposed
+            new approaches", energy 30 (2005), pp 1533 - 1549.
+
+    """
+    if altitude_deg is None:
+        altitude_deg = solar.get_altitude(latitude_deg, longitude_deg, when, elevation, temperature, pressure)
+
+    sin_altitude = math.sin(altitude_deg)
+    half_versine = 0.5 * (1 - math.cos(2 * altitude_deg))
+    KD = mean_earth_sun_distance(when)
+    DT = diffuse_transmittance(TL)
+    DEC = declination_degree(when, TY)
+
+    DIRC = 1367 * KD * math.exp(-0.8662 * (AM) * (TL) * (DEC)) * sin_altitude
+    DIFFC = KD * DT * altitude_deg
+    # global_irradiance_clear takes its diffuse part at the default turbidity
+    if TL is TL_default:
+        DIFFC_default = DIFFC
+    else:
+        DIFFC_default = KD * diffuse_transmittance(TL_default) * altitude_deg
+
+    return {
+        'altitude': altitude_deg,
+        'solarelevation_function_clear': 0.038175 + (1.5458 * sin_altitude) + ((-0.59980) * half_versine),
+        'solarelevation_function_overcast': ((-0.0067133) + (0.78600 * sin_altitude)) + (0.22401 * half_versine),
+        'diffuse_transmittance': DT,
+        # the clear and overcast diffuse models are the same equation
+        'diffuse_underclear': DIFFC,
+        'diffuse_underovercast': DIFFC,
+        'direct_underclear': DIRC,
+        'global_irradiance_clear': DIRC + DIFFC_default,
+        'global_irradiance_overcast': 572 * altitude_deg,
+    }
+
+
 def diffuse_ratio(DIFF_data, ghi_data):
     """Function calculates the Diffuse ratio.
 
@@ -676,9 +817,12 @@ def clear_index(ghi_data, latitude_deg, longitude_deg, when):
 
     Returns
     -------
-    KT : float
+    KT : float or numpy.ndarray
         Clear index ratio
 
+    With the numpy backend, ghi_data and when may be arrays of the same length, so that
+    a whole measurement series is processed in one call; see extraterrestrial_irrad.
+
     References
     ----------
     .. [1] S. Younes, R.Claywell and el al,"Quality control of solar radiation data: present status and proposed
@@ -2,7 +2,7 @@
 
 import datetime
 import numpy  # https://stackoverflow.com/questions/21968643/what-is-a-scalar-in-numpy  https://stackoverflow.com/questions/40378427/numpy-formal-definition-of-array-like-objects
-from typing import Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 
 AM_default: float
 TL_default: float
@@ -11,12 +11,14 @@ TY_default: float
 elevation_default: float
 
 def get_sunrise_sunset_transit(latitude_deg:float, longitude_deg:float, when:datetime.datetime) -> Tuple[datetime.datetime, datetime.datetime, datetime.datetime]: ...
+def get_sunrise_sunset_transit_hours(latitude_deg:float, longitude_deg:float, day:int, utc_offset_hours:float = ...) -> Tuple[float, float, float]: ...
 def get_sunrise_sunset(latitude_deg:float, longitude_deg:float, when:datetime.datetime) -> Tuple[datetime.datetime, datetime.datetime]: ...
 def get_sunrise_time(latitude_deg:float, longitude_deg:float, when:datetime.datetime) -> datetime.datetime: ...
 def get_sunset_time(latitude_deg:float, longitude_deg:float, when:datetime.datetime) -> datetime.datetime: ...
 def get_transit_time(latitude_deg:float, longitude_deg:float, when:datetime.datetime) -> datetime.datetime: ...
 def mean_earth_sun_distance(when:datetime.datetime) -> float: ...
-def extraterrestrial_irrad(when:datetime.datetime, latitude_deg:float, longitude_deg:float, SC:float = ...) -> float: ...
+def extraterrestrial_irrad(latitude_deg:Union[float,numpy.ndarray], longitude_deg:Union[float,numpy.ndarray], when:Union[datetime.datetime,numpy.ndarray], SC:float = ...) -> Union[float,numpy.ndarray]: ...
+def get_day_terms(day:Union[int,numpy.ndarray]) -> Tuple[Union[float,numpy.ndarray], Union[float,numpy.ndarray]]: ...
 def declination_degree(when:datetime.datetime, TY:float = ...) -> float: ...
 def solarelevation_function_clear(latitude_deg:float, longitude_deg:float, when:datetime.datetime, temperature:float = ..., pressure:float = ..., elevation:float = ...) -> float: ...
 def solarelevation_function_overcast(latitude_deg:float, longitude_deg:float, when:datetime.datetime, elevation:float = ..., temperature:float = ..., pressure:float = ...) -> float: ...
@@ -26,5 +28,6 @@ def diffuse_underovercast(latitude_deg:float, longitude_deg:float, when:datetime
 def direct_underclear(latitude_deg:float, longitude_deg:float, when:datetime.datetime, temperature:float = ..., pressure:float = ..., TY:float = ..., AM:float = ..., TL:float = ..., elevation:float = ...) -> float: ...
 def global_irradiance_clear(DIRC, DIFFC, latitude_deg:float, longitude_deg:float, when:datetime.datetime, temperature:float = ..., pressure:float = ..., TY:float = ..., AM:float = ..., TL:float = ..., elevation:float = ...) -> float: ...
 def global_irradiance_overcast(latitude_deg:float, longitude_deg:float, when:datetime.datetime, elevation:float = ..., temperature:float = ..., pressure:float = ...) -> float: ...
+def get_clear_sky_components(latitude_deg:Union[float,numpy.ndarray], longitude_deg:Union[float,numpy.ndarray], when:Union[datetime.datetime,numpy.ndarray], TY:float = ..., AM:float = ..., TL:float = ..., elevation:Union[float,numpy.ndarray] = ..., temperature:float = ..., pressure:float = ..., altitude_deg:Optional[Union[float,numpy.ndarray]] = ...) -> Dict[str, Union[float,numpy.ndarray]]: ...
 def diffuse_ratio(DIFF_data:Union[numpy.array,numpy.ndarray,numpy.generic,float,int], ghi_data:Union[numpy.array,numpy.ndarray,numpy.generic,float,int]) -> float: ...
-def clear_index(ghi_data:Union[numpy.array,numpy.ndarray,numpy.generic,float,int], when:datetime.datetime, latitude_deg:float, longitude_deg:float) -> float: ...
+def clear_index(ghi_data:Union[numpy.array,numpy.ndarray,numpy.generic,float,int], latitude_deg:Union[float,numpy.ndarray], longitude_deg:Union[float,numpy.ndarray], when:Union[datetime.datetime,numpy.ndarray]) -> Union[float,numpy.ndarray]: ...
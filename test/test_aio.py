@@ -0,0 +1,102 @@
+import pysolar
+from pysolar import aio, batch, simulate, solar
+import asyncio
+import concurrent.futures
+import datetime
+import numpy
+import threading
+import time
+import unittest
+
+
+def slow_identity(value, calls, lock):
+    with lock:
+        calls.append(value)
+    time.sleep(0.02)
+    return value
+
+
+class TestAsyncBatch(unittest.TestCase):
+
+    def setUp(self):
+        pysolar.use_numpy()
+        count = 1000
+        self.latitude = numpy.linspace(-60, 60, count)
+        self.longitude = numpy.linspace(-180, 180, count)
+        self.elevation = numpy.zeros(count)
+        self.when = numpy.datetime64("2024-03-01T00:00:00") + numpy.arange(count).astype("timedelta64[h]")
+
+    def tearDown(self):
+        pysolar.use_math()
+
+    def get_chunks(self, chunk_rows):
+        return [
+            {"latitude": self.latitude[i:i + chunk_rows], "longitude": self.longitude[i:i + chunk_rows],
+             "elevation": self.elevation[i:i + chunk_rows], "timestamp": self.when[i:i + chunk_rows]}
+            for i in range(0, len(self.when), chunk_rows)]
+
+    def test_compute_chunks(self):
+        expected = list(batch.compute_chunks(self.get_chunks(128), "rest"))
+        pysolar.use_numpy()
+
+        async def run(ordered):
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                return [records async for records in aio.compute_chunks(self.get_chunks(128), "rest", executor, 3, ordered)]
+        for actual, wanted in zip(asyncio.run(run(True)), expected):
+            numpy.testing.assert_array_equal(actual, wanted)
+        unordered = numpy.sort(numpy.concatenate(asyncio.run(run(False))), order="timestamp")
+        numpy.testing.assert_array_equal(unordered, numpy.concatenate(expected))
+
+    def test_get_batch_records(self):
+        latitude = numpy.array([[10.0], [45.0]])
+        expected = batch.get_batch_records(*numpy.broadcast_arrays(latitude, self.longitude, self.elevation, self.when))
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            actual = asyncio.run(aio.get_batch_records(latitude, self.longitude, self.elevation, self.when, chunk_rows=300, executor=executor))
+        self.assertEqual(actual.shape, (2, 1000))
+        numpy.testing.assert_array_equal(actual, expected)
+
+    def test_simulate_span_chunks(self):
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        end = start + datetime.timedelta(days=3)
+        expected = numpy.concatenate(list(simulate.simulate_span_chunks(42.0, -71.0, [0] * 360, start, end, 10, chunk_steps=100)))
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+            task = asyncio.ensure_future(ticker())
+            chunks = [records async for records in aio.simulate_span_chunks(42.0, -71.0, [0] * 360, start, end, 10, chunk_steps=100)]
+            task.cancel()
+            return chunks, ticks
+        chunks, ticks = asyncio.run(run())
+        self.assertEqual(len(chunks), 5)
+        self.assertGreater(ticks, 0)
+        numpy.testing.assert_array_equal(numpy.concatenate(chunks), expected)
+
+    def test_backend_left_alone(self):
+        pysolar.use_math()
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            actual = asyncio.run(aio.get_batch_records(self.latitude, self.longitude, self.elevation, self.when, chunk_rows=300, executor=executor))
+        self.assertEqual(len(actual), 1000)
+        self.assertEqual(pysolar.numeric.current_mod, "math")
+        self.assertIs(type(solar.get_altitude(42.0, -71.0, datetime.datetime(2024, 6, 21, 16, tzinfo=datetime.timezone.utc))), float)
+
+    def test_cancellation(self):
+        calls = []
+        lock = threading.Lock()
+
+        async def run():
+            with concurrent.futures.ThreadPoolExecutor(1) as executor:
+                chunks = aio.map_chunks(slow_identity, ((i, calls, lock) for i in range(100)), executor, max_pending=4)
+                first = await chunks.__anext__()
+                await chunks.aclose()
+                return first
+        self.assertEqual(asyncio.run(run()), 0)
+        self.assertLess(len(calls), 10)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+import pysolar
+from pysolar import batch, solar
+import contextlib
+import datetime
+import io
+import numpy
+import os
+import tempfile
+import unittest
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        pysolar.use_numpy()
+        self.directory = tempfile.TemporaryDirectory()
+        self.latitude = numpy.array([42.364908, -33.9, 51.5, 0.0, 70.0])
+        self.longitude = numpy.array([-71.112828, 18.4, -0.1, 100.0, 25.0])
+        self.elevation = numpy.array([20.0, 0.0, 35.0, 1000.0, 5.0])
+        self.when = numpy.array(["2024-06-21T16:00:00", "2024-06-21T10:30:00", "2024-12-21T12:00:00", "2024-03-20T05:59:00", "2024-01-01T00:00:00"], dtype="datetime64[s]")
+
+    def tearDown(self):
+        self.directory.cleanup()
+        pysolar.use_math()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_csv(self, name):
+        with open(self.path(name), "w") as f:
+            f.write("lat,lon,elevation,timestamp\n")
+            for row in zip(self.latitude.tolist(), self.longitude.tolist(), self.elevation.tolist(), numpy.datetime_as_string(self.when)):
+                f.write("%r,%r,%r,%s\n" % row)
+        return self.path(name)
+
+    def test_parse_timestamps(self):
+        expected = numpy.array(["2024-06-21T12:00:00"] * 4, dtype="datetime64[s]")
+        numpy.testing.assert_array_equal(batch.parse_timestamps(["2024-06-21T12:00:00", "2024-06-21 12:00:00", "2024-06-21T12:00:00Z", "2024-06-21T08:00:00-04:00"]), expected)
+        numpy.testing.assert_array_equal(batch.parse_timestamps(["1718971200", "1718971200.2"]), expected[:2])
+        numpy.testing.assert_array_equal(batch.parse_timestamps(numpy.array([1718971200.0])), expected[:1])
+        for values in (["1718971200", "2024-06-21T12:00:00"], ["2024-06-21T12:00:00", "1718971200"], ["2024-06-21T12:00:00Z", "noon"]):
+            with self.assertRaises(ValueError):
+                batch.parse_timestamps(values)
+
+    def test_csv(self):
+        nr_rows, seconds = batch.run_batch(self.write_csv("sites.csv"), self.path("out.csv"), irradiance="rest", chunk_rows=2)
+        self.assertEqual(nr_rows, 5)
+        with open(self.path("out.csv")) as f:
+            header = f.readline().strip().split(",")
+            rows = numpy.loadtxt(f, delimiter=",", dtype=str)
+        self.assertEqual(header, ["timestamp", "latitude", "longitude", "elevation", "azimuth", "altitude", "direct_normal", "diffuse", "global"])
+        self.assertEqual(rows.shape, (5, 9))
+        for row, when in zip(rows, self.when.tolist()):
+            when = when.replace(tzinfo=datetime.timezone.utc)
+            azimuth, altitude = solar.get_position(float(row[1]), float(row[2]), when, float(row[3]))
+            self.assertAlmostEqual(float(row[4]), azimuth, 5)
+            self.assertAlmostEqual(float(row[5]), altitude, 5)
+            if altitude <= 0:
+                self.assertEqual(float(row[8]), 0)
+            else:
+                self.assertGreater(float(row[8]), 0)
+
+    def test_npy(self):
+        table = numpy.empty(5, dtype=[("latitude", float), ("longitude", float), ("time", "datetime64[s]")])
+        table["latitude"], table["longitude"], table["time"] = self.latitude, self.longitude, self.when
+        numpy.save(self.path("sites.npy"), table)
+        plain = numpy.stack([self.latitude, self.longitude, numpy.zeros(5), self.when.astype(float)], axis=1)
+        numpy.save(self.path("plain.npy"), plain)
+        batch.run_batch(self.path("sites.npy"), self.path("out.npy"), chunk_rows=3)
+        batch.run_batch(self.path("plain.npy"), self.path("plain_out.npy"), chunk_rows=3, processes=2)
+        result = numpy.load(self.path("out.npy"))
+        numpy.testing.assert_array_equal(result, numpy.load(self.path("plain_out.npy")))
+        expected = batch.get_batch_records(self.latitude, self.longitude, numpy.zeros(5), self.when)
+        numpy.testing.assert_array_equal(result, expected)
+        self.assertEqual(result.dtype, batch.get_record_dtype("direct"))
+        self.assertTrue(numpy.all((result["radiation"] > 0) == (result["altitude"] > 0)))
+
+    def test_main(self):
+        output = io.StringIO()
+        with open(self.write_csv("sites.csv")) as f:
+            records = numpy.concatenate(list(batch.compute_chunks(batch.read_csv_chunks(f, 2), "none")))
+        batch.write_csv_records(output, records, header=True)
+        self.assertEqual(len(output.getvalue().splitlines()), 6)
+        self.assertEqual(batch.main([self.path("sites.csv"), "-o", self.path("out.csv"), "--irradiance", "none"]), 0)
+        with open(self.path("out.csv")) as f:
+            self.assertEqual(f.read(), output.getvalue())
+
+    def test_backend_restored(self):
+        pysolar.use_math()
+        chunks = batch.compute_chunks(iter([{"latitude": self.latitude, "longitude": self.longitude, "elevation": self.elevation, "timestamp": self.when}] * 2))
+        next(chunks)
+        self.assertEqual(pysolar.numeric.current_mod, "math")
+        chunks.close()
+        self.assertEqual(pysolar.numeric.current_mod, "math")
+
+    def test_main_errors(self):
+        with open(self.path("bad.csv"), "w") as f:
+            f.write("lat,lon,time\n42,-71,2024-06-21T12:00:00\n42,-71,1718971200\n")
+        stderr = io.StringIO()
+        with self.assertRaises(SystemExit) as raised, contextlib.redirect_stderr(stderr):
+            batch.main([self.path("bad.csv"), "-o", self.path("out.csv")])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("invalid timestamp '1718971200'", stderr.getvalue())
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
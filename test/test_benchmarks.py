@@ -0,0 +1,30 @@
+from benchmarks import __main__ as benchmarks
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+
+    def run_benchmarks(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return benchmarks.main(["--filter", "get_julian_solar_day", "--min-time", "0.001", "--repeat", "1"] + list(args))
+
+    def test_baseline_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            self.assertEqual(self.run_benchmarks("--baseline", path, "--save"), 0)
+            with open(path) as f:
+                baseline = json.load(f)
+            self.assertEqual(len(baseline), 6)
+            self.assertEqual(self.run_benchmarks("--baseline", path, "--threshold", "99"), 0)
+            # a baseline ten times faster than anything measured fails the run
+            with open(path, "w") as f:
+                json.dump({key: value * 10 for key, value in baseline.items()}, f)
+            self.assertEqual(self.run_benchmarks("--baseline", path), 1)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+from pysolar import constants, dem
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class TestDemHorizon(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # a cone 1000 m high on a cell centre 5 km east of the site at (3025, 6025), on a 12 km raster of 50 m cells
+        self.cell_size = 50.0
+        n = 240
+        row, column = np.mgrid[0:n, 0:n]
+        x = (column + 0.5) * self.cell_size
+        y = (n - row - 0.5) * self.cell_size
+        terrain = np.maximum(0, 1000 - np.hypot(x - 8025, y - 6025) / 2).astype(np.float32)
+        self.path = os.path.join(self.directory.name, "terrain.npy")
+        np.save(self.path, terrain)
+        self.raster = dem.ElevationRaster.load(self.path, 0, n * self.cell_size, self.cell_size)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ascii_grid(self):
+        path = os.path.join(self.directory.name, "grid.asc")
+        with open(path, "w") as f:
+            f.write("ncols 3\nnrows 2\nxllcorner 100\nyllcorner 200\ncellsize 10\nNODATA_value -9999\n1 2 3\n4 5 -9999\n")
+        raster = dem.ElevationRaster.from_ascii_grid(path)
+        self.assertTrue(os.path.exists(path + ".npy"))
+        self.assertEqual((raster.x_west, raster.y_north, raster.cell_size), (100.0, 220.0, 10.0))
+        # cell centres, the midpoint of the top row and points next to nodata or outside
+        np.testing.assert_allclose(raster.sample([105, 105, 110, 125, 99], [215, 205, 215, 205, 215]), [1, 4, 1.5, np.nan, np.nan])
+
+    def test_cone(self):
+        profile = dem.get_horizon(self.raster, 3025, 6025, observer_height = 0, resolution_deg = 2)
+        self.assertEqual(len(profile.elevation_deg), 180)
+        # the summit is 5 km away, lowered by the curvature of the earth
+        drop = 5000 ** 2 * (1 - dem.refraction_coefficient) / (2 * constants.earth_radius)
+        self.assertAlmostEqual(float(profile.get_elevation(90)), np.degrees(np.arctan((1000 - drop) / 5000)), places = 2)
+        self.assertTrue(np.all(profile.elevation_deg[np.abs(np.arange(0, 360, 2) - 90) > 30] < 0.1))
+
+    def test_cache_and_pool(self):
+        sites = np.array([[3000.0, 6000.0], [5000.0, 2000.0], [9000.0, 9000.0]])
+        cache = os.path.join(self.directory.name, "cache")
+        serial = dem.get_horizons(self.raster, sites, max_distance = 6000, cache_directory = cache, max_workers = 1)
+        self.assertEqual(len(os.listdir(cache)), 3)
+        cached = dem.get_horizons(self.raster, sites, max_distance = 6000, cache_directory = cache, max_workers = 1)
+        pooled = dem.get_horizons(self.raster, sites, max_distance = 6000, max_workers = 2)
+        for a, b, c in zip(serial, cached, pooled):
+            np.testing.assert_array_equal(a.elevation_deg, b.elevation_deg)
+            np.testing.assert_array_equal(a.elevation_deg, c.elevation_deg)
+
+    def test_pool_in_memory(self):
+        sites = np.array([[3000.0, 6000.0], [5000.0, 2000.0], [9000.0, 9000.0]])
+        raster = dem.ElevationRaster(np.array(self.raster.values), self.raster.x_west, self.raster.y_north, self.cell_size)
+        serial = dem.get_horizons(self.raster, sites, max_distance = 6000, max_workers = 1)
+        pooled = dem.get_horizons(raster, sites, max_distance = 6000, max_workers = 4)
+        for a, b in zip(serial, pooled):
+            np.testing.assert_array_equal(a.elevation_deg, b.elevation_deg)
+
+    def test_ascii_grid_changed(self):
+        path = os.path.join(self.directory.name, "grid.asc")
+        for height in (1, 2):
+            with open(path, "w") as f:
+                f.write("ncols 2\nnrows 1\nxllcorner 0\nyllcorner 0\ncellsize 10\n%d %d\n" % (height, height))
+            raster = dem.ElevationRaster.from_ascii_grid(path)
+            np.testing.assert_array_equal(raster.values, [[height, height]])
+        # an unchanged grid keeps its .npy file, and so the horizons cached for it
+        mtime = os.stat(path + ".npy").st_mtime_ns
+        dem.ElevationRaster.from_ascii_grid(path)
+        self.assertEqual(os.stat(path + ".npy").st_mtime_ns, mtime)
+
+    def test_cache_invalidation(self):
+        sites = np.array([[3025.0, 6025.0]])
+        cache = os.path.join(self.directory.name, "cache")
+        before = dem.get_horizons(self.raster, sites, max_distance = 6000, cache_directory = cache, max_workers = 1)[0]
+        # flatten the cone in place, keeping the size of the file
+        np.save(self.path, np.zeros_like(self.raster.values))
+        info = os.stat(self.path)
+        os.utime(self.path, ns = (info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+        raster = dem.ElevationRaster.load(self.path, self.raster.x_west, self.raster.y_north, self.cell_size)
+        after = dem.get_horizons(raster, sites, max_distance = 6000, cache_directory = cache, max_workers = 1)[0]
+        self.assertGreater(before.get_elevation(90), 5)
+        self.assertLess(after.get_elevation(90), 0)
+        # in-memory rasters are told apart by their values
+        memory = [dem.ElevationRaster(np.full((4, 4), height, dtype = np.float32), 0, 40, 10) for height in (0, 1)]
+        self.assertNotEqual(dem.get_fingerprint(memory[0]), dem.get_fingerprint(memory[1]))
+
+    def test_site_without_terrain(self):
+        raster = dem.ElevationRaster(np.array([[1, 2], [3, -9999]], dtype = np.float32), 0, 20, 10, nodata = -9999)
+        with self.assertRaises(ValueError):
+            dem.get_horizon(raster, 12, 8)
+        with self.assertRaises(ValueError):
+            dem.get_horizons(self.raster, [[-100.0, 6000.0]], max_workers = 1)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,85 @@
+import pysolar
+from pysolar import ensemble, numeric, rest, solar
+import numpy as np
+import unittest
+
+
+class TestEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.altitude = np.array([[-4.0, 12.0, 35.0], [50.0, 65.0, 80.0]])
+        self.samples = \
+            {
+                "turbidity_beta": rng.uniform(0.02, 0.3, 300),
+                "precipitable_water_cm": rng.uniform(0.5, 4.0, 300),
+                "ozone_atm_cm": rng.uniform(0.25, 0.4, 300),
+            }
+
+    def test_matches_full_ensemble(self):
+        summary = ensemble.get_ensemble_summary(self.altitude, self.samples, components = ("global", "direct_normal"), batch_size = 37)
+        full = rest.get_clear_sky_irradiance(self.altitude, **{name: value[:, None, None] for name, value in self.samples.items()})
+        for component in ("global", "direct_normal"):
+            result = summary[component]
+            self.assertEqual(result["count"], 300)
+            np.testing.assert_allclose(result["mean"], full[component].mean(axis = 0))
+            np.testing.assert_allclose(result["std"], full[component].std(axis = 0), atol = 1e-6)
+            np.testing.assert_allclose(result["min"], full[component].min(axis = 0))
+            np.testing.assert_allclose(result["max"], full[component].max(axis = 0))
+            self.assertEqual(result["percentiles"].shape, (3, 2, 3))
+            # P-square estimates, within a few percent of the spread of the members
+            spread = full[component].max(axis = 0) - full[component].min(axis = 0)
+            self.assertTrue(np.all(np.abs(result["percentiles"] - np.percentile(full[component], [5, 50, 95], axis = 0)) <= 0.05 * spread + 1e-9))
+        # a single batch gives the exact percentiles
+        single = ensemble.get_ensemble_summary(self.altitude, self.samples, batch_size = 300)
+        np.testing.assert_allclose(single["global"]["percentiles"], np.percentile(full["global"], [5, 50, 95], axis = 0))
+
+    def test_streaming_summary(self):
+        rng = np.random.default_rng(2)
+        # a large offset, where a naive sum of squares loses every digit of the spread
+        values = 1e9 + rng.normal(0, 1, (1000, 4))
+        summary = ensemble.StreamingSummary((4,), percentiles = (25, 50, 75))
+        for first in range(0, 1000, 3):
+            summary.add(values[first : first + 3])
+        result = summary.get_summary()
+        self.assertEqual(result["count"], 1000)
+        np.testing.assert_allclose(result["std"], values.std(axis = 0), rtol = 1e-6)
+        np.testing.assert_allclose(result["percentiles"], np.percentile(values, (25, 50, 75), axis = 0), atol = 0.1)
+        small = ensemble.StreamingSummary((), percentiles = (50,))
+        small.add(np.array([3.0, 1.0]))
+        self.assertEqual(small.get_percentiles().tolist(), [2.0])
+        with self.assertRaises(ValueError):
+            ensemble.StreamingSummary((4,), percentiles = (0, 50))
+
+    def test_sites_and_times(self):
+        when = np.datetime64('2024-06-21T12:00') + np.arange(0, 6 * 60, 60).astype('timedelta64[m]')
+        lat = np.array([[35.0], [52.0]])
+        lon = np.array([[-106.0], [0.0]])
+        summary = ensemble.get_site_ensemble_summary(lat, lon, when, self.samples)
+        self.assertEqual(summary["global"]["mean"].shape, (2, 6))
+        with numeric.backend("numpy"):
+            altitude = solar.get_position(lat, lon, when)[1]
+        direct = ensemble.get_ensemble_summary(altitude, self.samples)
+        np.testing.assert_allclose(summary["global"]["mean"], direct["global"]["mean"])
+
+    def test_bad_samples(self):
+        with self.assertRaises(ValueError):
+            ensemble.get_ensemble_summary(self.altitude, {"humidity": [1.0]})
+        with self.assertRaises(ValueError):
+            ensemble.get_ensemble_summary(self.altitude, {"turbidity_beta": [0.1], "ozone_atm_cm": [0.3, 0.35]})
+        with self.assertRaises(ValueError):
+            ensemble.get_ensemble_summary(self.altitude, {})
+        with self.assertRaises(ValueError):
+            ensemble.get_ensemble_summary(self.altitude, {"turbidity_beta": []})
+
+    def test_math_backend(self):
+        when = np.datetime64('2024-06-21T12:00') + np.arange(0, 6 * 60, 60).astype('timedelta64[m]')
+        expected = ensemble.get_site_ensemble_summary(35.0, -106.0, when, self.samples)
+        self.addCleanup(getattr(pysolar, "use_" + numeric.current_mod))
+        pysolar.use_math()
+        summary = ensemble.get_site_ensemble_summary(35.0, -106.0, when, self.samples)
+        np.testing.assert_array_equal(summary["global"]["mean"], expected["global"]["mean"])
+        self.assertEqual(numeric.current_mod, "math")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
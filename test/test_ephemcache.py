@@ -0,0 +1,77 @@
+import pysolar
+from pysolar import ephemcache, solar
+import numpy
+import os
+import sqlite3
+import tempfile
+import unittest
+
+
+class TestEphemerisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+        pysolar.use_math()
+
+    def test_hit(self):
+        with ephemcache.EphemerisCache(self.directory.name) as cache:
+            positions = cache.get_site_year(42.0, -71.0, 2024, step_minutes=30, elevation=10)
+            self.assertEqual(len(positions), 366 * 48)
+            self.assertEqual(positions.dtype, ephemcache.year_dtype)
+            self.assertEqual(positions["time"][0], numpy.datetime64("2024-01-01T00:00:00"))
+            again = cache.get_site_year(42.0, -71.0, 2024, step_minutes=30, elevation=10)
+            self.assertIsInstance(again, numpy.memmap)
+            self.assertEqual(again.filename, positions.filename)
+            self.assertFalse(again.flags.writeable)
+            self.assertEqual(len(cache), 1)
+            pysolar.use_numpy()
+            azimuth, altitude = solar.get_position(42.0, -71.0, positions["time"][::500], 10)
+            numpy.testing.assert_allclose(positions["azimuth"][::500], azimuth)
+            numpy.testing.assert_allclose(positions["altitude"][::500], altitude)
+            fast = cache.get_site_year(42.0, -71.0, 2024, step_minutes=30, elevation=10, engine="fast")
+            self.assertEqual(len(cache), 2)
+            self.assertGreater(numpy.abs(fast["altitude"] - positions["altitude"]).max(), 0)
+            with self.assertRaises(ValueError):
+                cache.get_site_year(42.0, -71.0, 2024, engine="other")
+
+    def test_eviction(self):
+        with ephemcache.EphemerisCache(self.directory.name) as cache:
+            first = cache.get_site_year(10.0, 0.0, 2023)
+            entry_size = cache.get_size()
+            cache.max_bytes = 2 * entry_size
+            cache.get_site_year(20.0, 0.0, 2023)
+            # using the first entry makes the second the least recently used
+            cache.get_site_year(10.0, 0.0, 2023)
+            cache.get_site_year(30.0, 0.0, 2023)
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.get_size(), 2 * entry_size)
+            self.assertEqual(cache.get_site_year(10.0, 0.0, 2023).filename, first.filename)
+            self.assertEqual(len(cache), 2)
+            cache.clear()
+            self.assertEqual((len(cache), cache.get_size()), (0, 0))
+            self.assertEqual([name for name in os.listdir(self.directory.name) if name.endswith(".npy")], [])
+
+    def test_invalidation(self):
+        with ephemcache.EphemerisCache(self.directory.name) as cache:
+            path = cache.get_site_year(10.0, 0.0, 2023, step_minutes=120).filename
+            entry_size = cache.get_size()
+        # as written by another installed release sharing the directory
+        os.rename(path, os.path.join(self.directory.name, "earlier.npy"))
+        path = os.path.join(self.directory.name, "earlier.npy")
+        index = sqlite3.connect(os.path.join(self.directory.name, ephemcache.index_name))
+        with index:
+            index.execute("update entries set fingerprint = 'earlier release', key = 'earlier', file = 'earlier.npy', last_used = 0")
+        index.close()
+        with ephemcache.EphemerisCache(self.directory.name, max_bytes=entry_size) as cache:
+            self.assertEqual(len(cache), 1)
+            self.assertTrue(os.path.exists(path))
+            self.assertNotEqual(cache.get_site_year(10.0, 0.0, 2023, step_minutes=120).filename, path)
+            # the other release's entry was the least recently used
+            self.assertEqual(len(cache), 1)
+            self.assertFalse(os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,57 @@
+import pysolar
+from pysolar import events, numeric, solar, util
+import datetime
+import numpy as np
+import unittest
+
+
+class TestEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.latitude = np.array([42.364908, 0.0, -33.9, 78.0])
+        self.longitude = np.array([-71.112828, 10.0, 151.2, 15.0])
+
+    def assert_altitude(self, when, altitude_deg):
+        found = ~np.isnat(when)
+        latitude = np.broadcast_to(self.latitude[:, None], when.shape)[found]
+        longitude = np.broadcast_to(self.longitude[:, None], when.shape)[found]
+        with numeric.backend("numpy"):
+            declination, hour_angle = solar.get_topocentric_position(latitude, longitude, when[found])
+            altitude = solar.get_topocentric_elevation_angle(latitude, declination, hour_angle)
+        np.testing.assert_allclose(altitude, altitude_deg, atol = 0.005)
+
+    def test_crossings_reach_threshold(self):
+        for altitude_deg in (events.sunrise_altitude_deg, -12.0, 15.0):
+            rising, setting = events.get_crossings(self.latitude, self.longitude, '2024-01-01', 30, altitude_deg)
+            self.assertEqual(rising.shape, (4, 30))
+            self.assert_altitude(rising, altitude_deg)
+            self.assert_altitude(setting, altitude_deg)
+            self.assertTrue(np.all(rising[:3] < setting[:3]))
+
+    def test_polar_night(self):
+        sunrise, sunset = events.get_sunrise_sunset(78.0, 15.0, '2024-12-01', 10)
+        self.assertTrue(np.isnat(sunrise).all())
+        self.assertTrue(np.isnat(sunset).all())
+
+    def test_twilight_brackets_sunrise(self):
+        dawn, dusk = events.get_twilight(self.latitude[:3], self.longitude[:3], '2024-03-01', 5, 'civil')
+        sunrise, sunset = events.get_sunrise_sunset(self.latitude[:3], self.longitude[:3], '2024-03-01', 5)
+        self.assertTrue(np.all(dawn < sunrise))
+        self.assertTrue(np.all(sunset < dusk))
+
+    def test_agrees_with_util(self):
+        when = datetime.datetime(2024, 6, 21, tzinfo = datetime.timezone.utc)
+        sunrise, sunset = events.get_sunrise_sunset(42.364908, -71.112828, '2024-06-21', 1)
+        expected = util.get_sunrise_sunset(42.364908, -71.112828, when)
+        for found, approximate in zip((sunrise[0], sunset[0]), expected):
+            approximate = np.datetime64(approximate.replace(tzinfo = None), 's')
+            self.assertLess(abs(found - approximate), np.timedelta64(120, 's'))
+
+    def test_math_backend(self):
+        expected = events.get_sunrise_sunset(self.latitude, self.longitude, '2024-06-21', 3)
+        self.addCleanup(getattr(pysolar, "use_" + numeric.current_mod))
+        pysolar.use_math()
+        sunrise, sunset = events.get_sunrise_sunset(self.latitude, self.longitude, '2024-06-21', 3)
+        np.testing.assert_array_equal(sunrise, expected[0])
+        np.testing.assert_array_equal(sunset, expected[1])
+        self.assertEqual(numeric.current_mod, "math")
@@ -0,0 +1,58 @@
+import pysolar
+from pysolar import simulate
+from pysolar.horizon import HorizonProfile
+import datetime
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class TestHorizonProfile(unittest.TestCase):
+
+    def setUp(self):
+        # a ridge to the east and open sky elsewhere, sampled every 5 degrees
+        azimuth = np.arange(0, 360, 5.0)
+        self.profile = HorizonProfile(np.where(np.abs(azimuth - 90) <= 30, 20.0, 2.0))
+
+    def test_interpolation(self):
+        self.assertEqual(self.profile.resolution_deg, 5.0)
+        np.testing.assert_allclose(self.profile.get_elevation([57.5, 60.0, 90.0, 357.5, -2.5, 720.0]), [11.0, 20.0, 20.0, 2.0, 2.0, 2.0])
+        np.testing.assert_allclose(self.profile.get_elevation([56.0, 58.0], "nearest"), [2.0, 20.0])
+        with self.assertRaises(ValueError):
+            self.profile.get_elevation(10.0, "cubic")
+
+    def test_is_blocked(self):
+        azimuth = np.array([[90.0, 180.0], [60.0, 300.0]])
+        altitude = np.array([[15.0, 15.0], [21.0, 1.0]])
+        np.testing.assert_array_equal(self.profile.is_blocked(azimuth, altitude), [[True, False], [False, True]])
+
+    def test_from_samples_and_pixels(self):
+        profile = HorizonProfile.from_samples([350.0, 10.0, 180.0], [10.0, 30.0, 0.0], resolution_deg = 0.5)
+        self.assertEqual(len(profile.elevation_deg), 720)
+        self.assertAlmostEqual(float(profile.get_elevation(0.0)), 20.0, places = 5)
+        pixels = HorizonProfile.from_pixels([380, 190, 0, 760])
+        np.testing.assert_allclose(pixels.elevation_deg, [0.0, 30.0, 90.0, -90.0], atol = 1e-5)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "site.npy")
+            self.profile.save(path)
+            loaded = HorizonProfile.load(path)
+            self.assertEqual(os.listdir(directory), ["site.npy"])
+        np.testing.assert_array_equal(loaded.elevation_deg, self.profile.elevation_deg)
+
+    def test_simulate(self):
+        pysolar.use_numpy()
+        try:
+            start = datetime.datetime(2024, 3, 20, 9, 0, tzinfo = datetime.timezone.utc)
+            result = simulate.simulate_span_array(42.364908, -71.112828, self.profile, start, start + datetime.timedelta(hours = 12), 15)
+        finally:
+            pysolar.use_math()
+        blocked = result["altitude"] < self.profile.get_elevation(result["azimuth"])
+        self.assertTrue(blocked.any() and not blocked.all())
+        np.testing.assert_array_equal(result["radiation"][blocked], 0)
+        np.testing.assert_allclose(result["shade"], self.profile.get_elevation(result["azimuth"]))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
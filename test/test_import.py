@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+source_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def run_python(self, statement):
+        return subprocess.run([sys.executable, "-c", statement], cwd=source_directory, check=True, capture_output=True, text=True).stdout.split()
+
+    def test_import_defers_numpy(self):
+        result = self.run_python(
+            "import sys, pysolar; print('numpy' in sys.modules, 'pysolar.solar' in sys.modules);"
+            "from pysolar import solar; print('numpy' in sys.modules);"
+            "print(pysolar.numeric.current_mod, 'numpy' in sys.modules, pysolar.stime.__name__)")
+        self.assertEqual(result, ["False", "False", "False", "numpy", "True", "pysolar.solartime"])
+
+    def test_use_math_before_first_use(self):
+        result = self.run_python(
+            "import sys, datetime, pysolar; pysolar.use_math();"
+            "pysolar.solar.get_altitude(42, -71, datetime.datetime(2024, 6, 21, 16, tzinfo=datetime.timezone.utc));"
+            "print(pysolar.numeric.current_mod, 'numpy' in sys.modules)")
+        self.assertEqual(result, ["math", "False"])
+
+    def test_attributes(self):
+        import pysolar
+        self.assertIn("util", dir(pysolar))
+        with self.assertRaises(AttributeError):
+            pysolar.no_such_module
+
+
+class TestBackendScope(unittest.TestCase):
+
+    def tearDown(self):
+        import pysolar
+        pysolar.use_math()
+
+    def test_restores_backend(self):
+        import pysolar
+        from pysolar import numeric
+        pysolar.use_math()
+        with numeric.backend("numpy"):
+            self.assertEqual(numeric.current_mod, "numpy")
+            with numeric.backend("numpy"):
+                pass
+            self.assertEqual(numeric.current_mod, "numpy")
+            with self.assertRaises(RuntimeError):
+                with numeric.backend("math"):
+                    pass
+        self.assertEqual(numeric.current_mod, "math")
+        with self.assertRaises(ValueError):
+            with numeric.backend("fortran"):
+                pass
+
+    def test_unselected_backend_stays_lazy(self):
+        result = TestLazyImport.run_python(self,
+            "from pysolar import numeric\n"
+            "with numeric.backend('math'):\n"
+            "    print(numeric.current_mod)\n"
+            "print('current_mod' in vars(numeric), numeric.current_mod)")
+        self.assertEqual(result, ["math", "False", "numpy"])
+
+    def test_threads_wait_for_other_backend(self):
+        from pysolar import numeric
+        entered = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        def hold_numpy():
+            with numeric.backend("numpy"):
+                entered.set()
+                release.wait()
+
+        def use_math():
+            with numeric.backend("math"):
+                seen.append(numeric.current_mod)
+
+        holder = threading.Thread(target=hold_numpy)
+        holder.start()
+        entered.wait()
+        waiter = threading.Thread(target=use_math)
+        waiter.start()
+        with numeric.backend("numpy"):
+            self.assertEqual(numeric.current_mod, "numpy")
+        waiter.join(0.1)
+        self.assertEqual(seen, [])
+        release.set()
+        holder.join()
+        waiter.join()
+        self.assertEqual(seen, ["math"])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
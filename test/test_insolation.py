@@ -0,0 +1,46 @@
+import pysolar
+from pysolar import insolation, numeric, simulate
+from pysolar.horizon import HorizonProfile
+import numpy as np
+import unittest
+
+
+class TestInsolation(unittest.TestCase):
+
+    def setUp(self):
+        # mid-latitude, southern hemisphere winter, midnight sun and polar night
+        self.lat = np.array([42.364908, -33.9, 78.2, -78.2])
+        self.lon = np.array([-71.112828, 18.4, 15.6, 15.6])
+
+    def minute_sum(self, i, day):
+        # simulate_span samples every minute of the local mean solar day, without a horizon
+        midnight = np.datetime64(day, 's') - np.round(self.lon[i] * 240).astype('timedelta64[s]')
+        start = midnight + np.timedelta64(30, 's')
+        span = simulate.simulate_span_array(self.lat[i], self.lon[i], HorizonProfile(np.full(360, -90.0)), start, start + np.timedelta64(1, 'D'), 1)
+        self.assertEqual(len(span), 24 * 60)
+        return span["radiation"].sum() / 60
+
+    def test_matches_minute_sum(self):
+        daily = insolation.get_daily_insolation(self.lat, self.lon, '2024-06-20', 2, order = 12)
+        self.assertEqual(daily.shape, (4, 2))
+        for i in range(4):
+            for j, day in enumerate(('2024-06-20', '2024-06-21')):
+                expected = self.minute_sum(i, day)
+                self.assertAlmostEqual(daily[i, j], expected, delta = 1e-3 * expected + 1e-9)
+        self.assertEqual(daily[3, 0], 0)
+        self.assertTrue(daily[2, 0] > daily[0, 0] > daily[1, 0] > 0)
+
+    def test_monthly(self):
+        monthly = insolation.get_monthly_insolation(self.lat[:2], self.lon[:2], 2023, 2)
+        daily = insolation.get_daily_insolation(self.lat[:2], self.lon[:2], '2023-02-01', 28)
+        np.testing.assert_allclose(monthly, daily.sum(axis = -1))
+
+    def test_math_backend(self):
+        expected = insolation.get_daily_insolation(self.lat, self.lon, '2024-06-20', 2)
+        self.addCleanup(getattr(pysolar, "use_" + numeric.current_mod))
+        pysolar.use_math()
+        np.testing.assert_array_equal(insolation.get_daily_insolation(self.lat, self.lon, '2024-06-20', 2), expected)
+        self.assertEqual(numeric.current_mod, "math")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,57 @@
+import pysolar
+from pysolar import numeric, poa, rest, solar
+import numpy as np
+import unittest
+
+
+class TestPlaneOfArray(unittest.TestCase):
+
+    def setUp(self):
+        self.altitude = np.array([-3.0, 10.0, 35.0, 62.0])
+        self.azimuth = np.array([80.0, 120.0, 170.0, 250.0])
+        self.slope = np.array([0.0, 20.0, 45.0, 90.0, 30.0])
+        self.orientation = np.array([0.0, -30.0, 15.0, 90.0, 180.0])
+
+    def test_cos_incidence_matches_solar(self):
+        cos_incidence = poa.get_cos_incidence(self.altitude, self.azimuth, self.slope, self.orientation)
+        self.assertEqual(cos_incidence.shape, (4, 5))
+        for i in range(4):
+            for j in range(5):
+                expected = solar.get_incidence_angle(90 - self.altitude[i], self.slope[j], self.orientation[j], self.azimuth[i])
+                self.assertAlmostEqual(np.degrees(np.arccos(cos_incidence[i, j])), expected, places = 6)
+
+    def test_horizontal_panel_gets_global_horizontal(self):
+        clear_sky = rest.get_clear_sky_irradiance(self.altitude)
+        # the sky diffuse including its backscattered part
+        diffuse = clear_sky["global"] - clear_sky["beam"]
+        poa_irradiance = poa.get_plane_of_array_irradiance \
+          (
+            self.altitude, self.azimuth, clear_sky["direct_normal"], diffuse,
+            self.slope, self.orientation, global_horizontal = clear_sky["global"]
+          )
+        for value in poa_irradiance.values():
+            self.assertEqual(value.shape, (4, 5))
+        np.testing.assert_allclose(poa_irradiance["global"][:, 0], clear_sky["global"])
+        self.assertTrue(np.all(poa_irradiance["beam"][0] == 0))
+        # a vertical wall sees half the sky and half the ground
+        np.testing.assert_allclose(poa_irradiance["sky_diffuse"][:, 3], diffuse / 2)
+        np.testing.assert_allclose(poa_irradiance["ground_reflected"][:, 3], 0.2 * clear_sky["global"] / 2)
+
+    def test_panel_grid(self):
+        slope = np.array([10.0, 40.0])[:, None]
+        orientation = np.array([-90.0, 0.0, 90.0])
+        poa_irradiance = poa.get_plane_of_array_irradiance(self.altitude, self.azimuth, 800.0, 100.0, slope, orientation)
+        self.assertEqual(poa_irradiance["global"].shape, (4, 2, 3))
+        flat = poa.get_plane_of_array_irradiance(self.altitude, self.azimuth, 800.0, 100.0, slope[1, 0], orientation[2])
+        np.testing.assert_allclose(poa_irradiance["global"][:, 1, 2], flat["global"])
+
+    def test_math_backend(self):
+        expected = poa.get_plane_of_array_irradiance(self.altitude, self.azimuth, 800.0, 100.0, self.slope, self.orientation)
+        self.addCleanup(getattr(pysolar, "use_" + numeric.current_mod))
+        pysolar.use_math()
+        poa_irradiance = poa.get_plane_of_array_irradiance(self.altitude, self.azimuth, 800.0, 100.0, self.slope, self.orientation)
+        np.testing.assert_array_equal(poa_irradiance["global"], expected["global"])
+        self.assertEqual(numeric.current_mod, "math")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,61 @@
+import pysolar
+from pysolar import profiling, rest, solar, solartime, tzinfo_check
+import datetime
+import unittest
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def setUp(self):
+        pysolar.use_math()
+        self.when = datetime.datetime(2024, 6, 21, 12, tzinfo = datetime.timezone.utc)
+
+    def test_stages(self):
+        exported = []
+        original = solar.get_nutation
+        with profiling.StageProfiler(callback = exported.append) as profiler:
+            self.assertIsNot(solar.get_nutation, original)
+            for _ in range(3):
+                expected = solar.get_position(42.0, -71.0, self.when)
+            rest.get_clear_sky_irradiance(45.0)
+        self.assertIs(solar.get_nutation, original)
+        self.assertEqual(solar.get_position(42.0, -71.0, self.when), expected)
+        stats = profiler.get_stats()
+        self.assertEqual(exported, [stats])
+        for stage in ("topocentric", "geocentric", "nutation", "vsop87", "time_scale", "tz_validation", "rest_atmosphere", "rest_irradiance"):
+            self.assertIn(stage, stats)
+        self.assertEqual(stats["topocentric"]["calls"], 3)
+        self.assertEqual(stats["nutation"]["calls"], 3)
+        # each position takes two outermost time-scale calls, for the solar and ephemeris days
+        self.assertEqual(stats["time_scale"]["calls"], 6)
+        self.assertEqual(stats["vsop87"]["calls"], 9)
+        self.assertGreaterEqual(stats["geocentric"]["seconds"], stats["nutation"]["seconds"] + stats["vsop87"]["seconds"])
+        self.assertIn("topocentric", profiler.report())
+
+    def test_single_active(self):
+        with profiling.StageProfiler():
+            with self.assertRaises(RuntimeError):
+                profiling.StageProfiler().__enter__()
+        with profiling.StageProfiler() as profiler:
+            solartime.get_julian_solar_day(self.when)
+        self.assertEqual(profiler.get_stats()["time_scale"]["calls"], 1)
+
+    def test_started_during_check(self):
+        # a profiler started, as by another thread, while an argument is checked
+        started = []
+
+        class When:
+            @property
+            def tzinfo(self):
+                if not started:
+                    started.append(profiling.StageProfiler().__enter__())
+                return datetime.timezone.utc
+
+        checked = tzinfo_check.check_aware_dt("when")(lambda when: "done")
+        try:
+            self.assertEqual(checked(When()), "done")
+        finally:
+            started[0].__exit__(None, None, None)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
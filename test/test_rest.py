@@ -0,0 +1,82 @@
+from pysolar import numeric, rest
+import numpy as np
+import unittest
+
+
+class TestRestArrayEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.altitude = np.array([-5.0, 5.0, 30.0, 60.0, 90.0])
+        self.water = np.array([0.5, 1.0, 1.5, 2.0, 3.0])
+
+    def test_band_axis(self):
+        by_bands = rest.get_clear_sky_irradiance_by_bands(self.altitude, precipitable_water_cm = self.water)
+        broadband = rest.get_clear_sky_irradiance(self.altitude, precipitable_water_cm = self.water)
+        for name, value in by_bands.items():
+            self.assertEqual(value.shape, (2, 5))
+            np.testing.assert_allclose(value.sum(axis = 0), broadband[name])
+        self.assertTrue(np.all(broadband["global"][0] == 0))
+        self.assertTrue(np.all(np.diff(broadband["direct_normal"][1:]) > 0))
+        np.testing.assert_allclose(broadband["beam"][-1], broadband["direct_normal"][-1])
+
+    def test_broadcasting_matches_elementwise(self):
+        beta = np.array([0.02, 0.1, 0.3])[:, None]
+        together = rest.get_clear_sky_irradiance(self.altitude, turbidity_beta = beta)["global"]
+        self.assertEqual(together.shape, (3, 5))
+        for i, b in enumerate(beta[:, 0]):
+            for j, altitude in enumerate(self.altitude):
+                alone = rest.get_clear_sky_irradiance(altitude, turbidity_beta = b)["global"]
+                self.assertAlmostEqual(together[i, j], alone)
+
+    def test_optical_mass_at_zenith(self):
+        for get_optical_mass in (rest.get_optical_mass_ozone, rest.get_optical_mass_water, rest.get_optical_mass_aerosol):
+            self.assertAlmostEqual(get_optical_mass(90.0), 1.0)
+        self.assertAlmostEqual(rest.get_optical_mass_rayleigh(90.0, rest.standard_pressure_millibars), 1.0)
+
+    def test_legacy_functions_share_state(self):
+        # the legacy by-band functions keep their own composition, so they agree with the state in daytime
+        altitude, water = self.altitude[1:], self.water[1:]
+        state = rest.get_atmospheric_state(altitude, precipitable_water_cm = water)
+        components = rest.get_clear_sky_irradiance_from_state(state)
+        with numeric.backend("numpy"):
+            np.testing.assert_allclose(rest.get_broadband_direct_normal_irradiance(altitude, precipitable_water_cm = water),
+                                       components["direct_normal"].sum(axis = 0))
+            np.testing.assert_allclose(rest.get_beam_irradiance_by_band("low-frequency", altitude, precipitable_water_cm = water),
+                                       components["beam"][1])
+        np.testing.assert_allclose(rest.get_global_broadband_irradiance(altitude, precipitable_water_cm = water),
+                                   components["global"].sum(axis = 0))
+        self.assertAlmostEqual(rest.get_beam_broadband_irradiance(60.0), rest.get_clear_sky_irradiance(60.0)["beam"])
+        for band in rest.bands:
+            ma = state["aerosol_optical_mass"][1]
+            self.assertEqual(rest.get_effective_aerosol_wavelength(band, ma, 1.3, 0.6),
+                             state["effective_aerosol_wavelength"][rest.bands.index(band)][1])
+
+    def test_legacy_functions_match_baseline(self):
+        # values of the original scalar functions, with the corrected optical masses and their
+        # nitrogen amount of rest.un, which get_nitrogen_transmittance used whatever it was passed
+        baseline = {
+            "high-frequency": (0.9918302423196169, 0.5464007897981309, 281.73134471085115, 405.16562840620696, 350.88372694006125),
+            "low-frequency": (1.0, 1.040464446862573, 409.02002667132035, 480.59788324282056, 416.20997589331023),
+        }
+        for band, (Tn, wavelength, dni_30, dni_60, beam_60) in baseline.items():
+            self.assertEqual(rest.get_nitrogen_transmittance(band, 1.6, rest.un), Tn)
+            self.assertEqual(rest.get_effective_aerosol_wavelength(band, 1.5, 1.3, 0.1), wavelength)
+            self.assertEqual(rest.get_direct_normal_irradiance_by_band(band, 30.0, rest.standard_pressure_millibars, 0.35, rest.un, 1.4, 1.3, 0.1), dni_30)
+            self.assertEqual(rest.get_direct_normal_irradiance_by_band(band, 60.0, 850.0, 0.35, rest.un, 1.4, 1.3, 0.1), dni_60)
+            self.assertEqual(rest.get_beam_irradiance_by_band(band, 60.0, 850.0, 0.35, rest.un, 1.4, 1.3, 0.1), beam_60)
+        self.assertEqual(rest.get_broadband_direct_normal_irradiance(30.0, nitrogen_atm_cm = rest.un), 181.08133800927948)
+        self.assertEqual(rest.get_beam_broadband_irradiance(60.0, nitrogen_atm_cm = rest.un), 310.0033283342065)
+        self.assertEqual(np.ndim(rest.get_beam_broadband_irradiance(60.0)), 0)
+
+    def test_nitrogen_amount(self):
+        # get_nitrogen_transmittance now uses the amount it is given, as the array engine does
+        mw = np.array([1.0, 1.6, 3.0])
+        for nitrogen in (0.0001, 0.0002, 0.0005):
+            Tn = rest.get_nitrogen_transmittance("high-frequency", mw, nitrogen)
+            state = rest.get_atmospheric_state(np.array([30.0, 60.0]), nitrogen_atm_cm = nitrogen)
+            np.testing.assert_array_equal(state["nitrogen_transmittance"][0],
+                                          rest.get_nitrogen_transmittance("high-frequency", state["water_optical_mass"], nitrogen))
+            self.assertEqual(Tn.shape, (3,))
+            self.assertTrue(np.all(Tn <= 1))
+        self.assertLess(rest.get_broadband_direct_normal_irradiance(30.0, nitrogen_atm_cm = 0.0005),
+                        rest.get_broadband_direct_normal_irradiance(30.0, nitrogen_atm_cm = 0.0001))
@@ -0,0 +1,82 @@
+import pysolar
+from pysolar import server, solar
+import asyncio
+import datetime
+import json
+import numpy
+import unittest
+
+
+async def fetch(port, target):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(("GET %s HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n" % target).encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    body = json.loads(await reader.read())
+    writer.close()
+    return status, body
+
+
+class TestServer(unittest.TestCase):
+
+    def tearDown(self):
+        pysolar.use_math()
+
+    def run_with_server(self, requests, **kwargs):
+        async def run():
+            batcher = server.PositionBatcher(**kwargs)
+            instance = await server.start_server(batcher, port=0)
+            port = instance.sockets[0].getsockname()[1]
+            try:
+                return batcher, await asyncio.gather(*(fetch(port, target) for target in requests))
+            finally:
+                instance.close()
+                await instance.wait_closed()
+                batcher.close()
+        return asyncio.run(run())
+
+    def test_batched_positions(self):
+        sites = [(42.0 + i / 10, -71.0 + i, 10.0 * i) for i in range(50)]
+        requests = ["/position?lat=%r&lon=%r&elevation=%r&time=2024-06-21T16:00:00Z" % site for site in sites]
+        batcher, responses = self.run_with_server(requests, irradiance="rest", window=0.05)
+        self.assertEqual(batcher.nr_requests, 50)
+        self.assertLess(batcher.nr_batches, 50)
+        when = datetime.datetime(2024, 6, 21, 16, tzinfo=datetime.timezone.utc)
+        for (latitude, longitude, elevation), (status, body) in zip(sites, responses):
+            self.assertEqual(status, 200)
+            azimuth, altitude = solar.get_position(latitude, longitude, when, elevation)
+            self.assertAlmostEqual(body["azimuth"], azimuth, 6)
+            self.assertAlmostEqual(body["altitude"], altitude, 6)
+            self.assertEqual(body["timestamp"], "2024-06-21T16:00:00")
+            self.assertGreater(body["global"], 0)
+
+    def test_errors(self):
+        pysolar.use_math()
+        batcher, responses = self.run_with_server(
+            [
+                "/position?lat=x&lon=0", "/position?lon=0", "/position?lat=95&lon=0", "/other",
+                "/position?lat=0&lon=0&elevation=nan", "/position?lat=0&lon=0&elevation=inf",
+                "/position?lat=0&lon=0&time=10000-01-01T00:00:00",
+            ])
+        self.assertEqual([status for status, body in responses], [400, 400, 400, 404, 400, 400, 400])
+        self.assertEqual(batcher.nr_requests, 0)
+        self.assertEqual(pysolar.numeric.current_mod, "math")
+
+    def test_bad_request_in_batch(self):
+        async def run():
+            batcher = server.PositionBatcher(window=0.05)
+            try:
+                good = (42.0, -71.0, 0.0, numpy.datetime64("2024-06-21T16:00:00"))
+                bad = (42.0, -71.0, 0.0, numpy.datetime64("10000-01-01T00:00:00"))
+                return await asyncio.wait_for(asyncio.gather(*(batcher.get_position(*arguments) for arguments in (good, bad, good)), return_exceptions=True), 5)
+            finally:
+                batcher.close()
+        first, bad, last = asyncio.run(run())
+        self.assertIsInstance(bad, Exception)
+        self.assertEqual(first, last)
+        self.assertEqual(first["timestamp"], "2024-06-21T16:00:00")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,64 @@
+import pysolar
+from pysolar import horizon, simulate
+import datetime
+import numpy as np
+import unittest
+import warnings
+
+
+class TestSimulateSpanArray(unittest.TestCase):
+
+    def setUp(self):
+        self.lat = 42.364908
+        self.lon = -71.112828
+        self.start = datetime.datetime(2024, 3, 20, 10, 0, tzinfo = datetime.timezone(datetime.timedelta(hours = -4)))
+        self.end = self.start + datetime.timedelta(hours = 9, minutes = 7)
+        self.horizon = [(azimuth * 7) % 400 for azimuth in range(360)]
+
+    def tearDown(self):
+        pysolar.use_math()
+
+    def test_matches_generator(self):
+        pysolar.use_math()
+        expected = list(simulate.simulate_span(self.lat, self.lon, self.horizon, self.start, self.end, 10))
+        pysolar.use_numpy()
+        result = simulate.simulate_span_array(self.lat, self.lon, self.horizon, self.start, self.end, 10)
+        self.assertEqual(result.dtype, simulate.span_dtype)
+        self.assertEqual(len(result), len(expected))
+        for record, (time, alt, azi, rad, shade) in zip(result, expected):
+            self.assertEqual(record["time"], simulate.get_datetime64(time))
+            self.assertAlmostEqual(record["altitude"], alt, places = 6)
+            self.assertAlmostEqual(record["azimuth"], azi, places = 6)
+            self.assertAlmostEqual(record["radiation"], rad, places = 6)
+            self.assertEqual(record["shade"], shade)
+        self.assertTrue(np.any(result["radiation"] == 0) and np.any(result["radiation"] > 0))
+
+    def test_chunks(self):
+        pysolar.use_numpy()
+        whole = simulate.simulate_span_array(self.lat, self.lon, self.horizon, self.start, self.end, 10)
+        chunks = list(simulate.simulate_span_chunks(self.lat, self.lon, self.horizon, self.start, self.end, 10, chunk_steps = 20))
+        self.assertEqual([len(chunk) for chunk in chunks], [20, 20, 14])
+        np.testing.assert_array_equal(np.concatenate(chunks), whole)
+        self.assertEqual(len(simulate.simulate_span_array(self.lat, self.lon, self.horizon, self.end, self.start, 10)), 0)
+
+    def test_sun_just_below_horizon(self):
+        # a skyline below the astronomical horizon leaves these samples unblocked
+        profile = horizon.HorizonProfile(np.full(360, -5.0))
+        when = np.datetime64("2024-06-21T00:22:30") + np.arange(60).astype("timedelta64[s]")
+        pysolar.use_numpy()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = simulate.simulate_times(self.lat, self.lon, profile, when)
+        self.assertTrue(np.any((result["altitude"] < 0) & (result["altitude"] > -0.01)))
+        self.assertTrue(np.all(np.isfinite(result["radiation"])))
+        np.testing.assert_array_equal(result["radiation"][result["altitude"] <= 0], 0)
+
+    def test_math_backend(self):
+        pysolar.use_numpy()
+        expected = simulate.simulate_span_array(self.lat, self.lon, self.horizon, self.start, self.end, 10)
+        pysolar.use_math()
+        np.testing.assert_array_equal(simulate.simulate_span_array(self.lat, self.lon, self.horizon, self.start, self.end, 10), expected)
+        self.assertEqual(pysolar.numeric.current_mod, "math")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
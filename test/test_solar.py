@@ -19,12 +19,15 @@
 #    You should have received a copy of the GNU General Public License along
 #    with Pysolar. If not, see <http://www.gnu.org/licenses/>.
 
+import pysolar
 from pysolar import \
 	solar, \
 	constants, \
 	solartime as stime, \
 	elevation
+from pysolar.tzinfo_check import NoTimeZoneInfoError
 import datetime
+import numpy
 import unittest
 
 
@@ -97,6 +100,24 @@ class TestSolar(unittest.TestCase):
 		self.assertAlmostEqual(0.00166657, self.nutation['obliquity'], 8) # value from Reda and Andreas (2005)
 		self.assertAlmostEqual(-0.00399840, self.nutation['longitude'], 8) # value from Reda and Andreas (2005)
 
+	def test_get_coeff_tables(self):
+		# the nested lists of earlier releases, the lists read without numpy and the arrays agree
+		self.assertEqual(solar.get_coeff(0.5, [[[1.0, 0.0, 0.0]], [[2.0, 0.0, 0.0], [4.0, 0.0, 0.0]]]), 4.0)
+		for name in constants.series_tables:
+			table = constants.get_table(name)
+			expected = solar.get_coeff(self.jme, constants.get_table_lists(name))
+			self.assertAlmostEqual(solar.get_coeff(self.jme, table) / expected, 1, 12)
+			with pysolar.numeric.backend("numpy"):
+				self.assertAlmostEqual(solar.get_coeff(numpy.array([self.jme]), table)[0] / expected, 1, 12)
+
+	def test_constant_tables_as_lists(self):
+		# the module attributes keep the form of earlier releases
+		self.assertEqual(constants.aberration_sin_terms[1], (-2, 0, 0, 2, 2))
+		self.assertEqual(constants.nutation_coefficients[0], (-171996, -174.2, 92025, 8.9))
+		self.assertEqual(constants.heliocentric_longitude_coeffs[0][:2], [(175347046.0, 0, 0), (3341656.0, 4.6692568, 6283.07585)])
+		self.assertEqual([len(terms) for terms in constants.heliocentric_latitude_coeffs], [5, 2])
+		self.assertIsInstance(constants.sun_earth_distance_coeffs, list)
+
 	def test_get_sun_earth_distance(self):
 		self.assertAlmostEqual(0.9965421031, self.sun_earth_distance, 6) # value from Reda and Andreas (2005)
 
@@ -201,5 +222,56 @@ class TestApi(unittest.TestCase):
 			self.assertAlmostEqual(az, az_expected, delta=1.5)
 
 
+class TestObserver(unittest.TestCase):
+	test_when = datetime.datetime(2016, 12, 19, 23, 0, 0, tzinfo=datetime.timezone.utc)
+
+	def tearDown(self):
+		pysolar.use_math()
+
+	def testPosition(self):
+		for latitude, longitude, elevation in ((59.6365662, 12.5350953, 0), (-43, 172, 250), (39.742476, -105.1786, 1830.14)):
+			observer = solar.Observer(latitude, longitude, elevation, temperature=284.15, pressure=82000)
+			for hours in range(0, 24, 5):
+				when = TestObserver.test_when + datetime.timedelta(hours=hours)
+				self.assertEqual(observer.position(when), solar.get_position(latitude, longitude, when, elevation, 284.15, 82000))
+
+	def testCache(self):
+		observer = solar.Observer(-43, 172, cache_size=2)
+		self.assertFalse(hasattr(observer, "__dict__"))
+		first = observer.position(TestObserver.test_when)
+		self.assertIs(observer.position(TestObserver.test_when), first)
+		for hours in (1, 2):
+			observer.position(TestObserver.test_when + datetime.timedelta(hours=hours))
+		self.assertIsNot(observer.position(TestObserver.test_when), first)
+		self.assertEqual(observer.position(TestObserver.test_when), first)
+		with self.assertRaises(NoTimeZoneInfoError):
+			observer.position(datetime.datetime(2016, 12, 19, 23))
+
+	def testReadOnly(self):
+		observer = solar.Observer(-43, 172, 250)
+		for name in ("latitude_deg", "longitude_deg", "elevation", "temperature", "pressure", "projected_radial_distance", "projected_axial_distance"):
+			with self.assertRaises(AttributeError):
+				setattr(observer, name, 0)
+		self.assertEqual(observer.latitude_deg, -43)
+		observer.cache_size = 1
+		for hours in range(3):
+			observer.position(TestObserver.test_when + datetime.timedelta(hours=hours))
+		self.assertEqual(len(observer._cache), 1)
+
+	def testPositionMany(self):
+		observer = solar.Observer(51.4826, 0, 10)
+		times = [TestObserver.test_when + datetime.timedelta(hours=hours) for hours in range(12)]
+		azimuths, altitudes = observer.position_many(times)
+		self.assertEqual(len(azimuths), 12)
+		pysolar.use_numpy()
+		when = numpy.array([t.replace(tzinfo=None) for t in times], dtype="datetime64[s]")
+		azimuth, altitude = observer.position_many(when)
+		expected = solar.get_position(51.4826, 0, when, 10)
+		numpy.testing.assert_array_equal(azimuth, expected[0])
+		numpy.testing.assert_array_equal(altitude, expected[1])
+		numpy.testing.assert_allclose(azimuth, azimuths, atol=1e-9)
+		numpy.testing.assert_allclose(altitude, altitudes, atol=1e-9)
+
+
 if __name__ == "__main__":
 	unittest.main(verbosity=2)
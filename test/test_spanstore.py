@@ -0,0 +1,66 @@
+from pysolar import simulate, spanstore
+import datetime
+import numpy as np
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestSpanStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.args = \
+            (
+                42.364908, -71.112828, [200] * 360,
+                datetime.datetime(2024, 1, 1, tzinfo = datetime.timezone.utc),
+                datetime.datetime(2024, 1, 3, 1, tzinfo = datetime.timezone.utc),
+                5,
+            )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_and_read(self):
+        manifest = spanstore.write_span(self.directory.name, *self.args, chunk_steps = 100, format = "npz")
+        self.assertEqual(len(manifest["chunks"]), 6)
+        stored = np.concatenate(list(spanstore.read_span_chunks(self.directory.name)))
+        np.testing.assert_array_equal(stored, simulate.simulate_span_array(*self.args))
+        self.assertEqual(sorted(os.listdir(self.directory.name)), sorted(manifest["chunks"] + [spanstore.manifest_name]))
+
+    def test_resume(self):
+        calls = []
+        simulate_times = simulate.simulate_times
+
+        def interrupted(*args):
+            calls.append(args[3][0])
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return simulate_times(*args)
+
+        with mock.patch.object(simulate, "simulate_times", interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                spanstore.write_span(self.directory.name, *self.args, chunk_steps = 100, format = "npz")
+        self.assertEqual(len(spanstore.read_manifest(self.directory.name)["chunks"]), 2)
+        calls.clear()
+        with mock.patch.object(simulate, "simulate_times", lambda *args: calls.append(args[3][0]) or simulate_times(*args)):
+            spanstore.write_span(self.directory.name, *self.args, chunk_steps = 100, format = "npz")
+        self.assertEqual(len(calls), 4)
+        stored = np.concatenate(list(spanstore.read_span_chunks(self.directory.name)))
+        np.testing.assert_array_equal(stored, simulate.simulate_span_array(*self.args))
+        with self.assertRaises(ValueError):
+            spanstore.write_span(self.directory.name, *self.args, chunk_steps = 50, format = "npz")
+
+    def test_same_times_as_simulate(self):
+        args = self.args[:5] + (7.3,)
+        spanstore.write_span(self.directory.name, *args, chunk_steps = 64, format = "npz")
+        stored = np.concatenate(list(spanstore.read_span_chunks(self.directory.name)))
+        np.testing.assert_array_equal(stored, simulate.simulate_span_array(*args))
+        empty = os.path.join(self.directory.name, "empty")
+        manifest = spanstore.write_span(empty, *(self.args[:4] + (self.args[3], 5)), format = "npz")
+        self.assertEqual(manifest["chunks"], [])
+        self.assertEqual(spanstore.read_manifest(empty), manifest)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
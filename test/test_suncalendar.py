@@ -0,0 +1,48 @@
+import pysolar
+from pysolar import numeric, suncalendar, util
+import datetime
+import os
+import tempfile
+import unittest
+
+
+class TestSunCalendarCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = self.temporary.name
+        self.when = datetime.datetime(2024, 3, 5, 10, tzinfo = datetime.timezone(datetime.timedelta(hours = -5)))
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def test_matches_util(self):
+        cache = suncalendar.SunCalendarCache(self.directory)
+        cached = cache.get_sunrise_sunset_transit(42.364908, -71.112828, self.when)
+        expected = util.get_sunrise_sunset_transit(42.364908, -71.112828, self.when)
+        for a, b in zip(cached, expected):
+            self.assertLess(abs((a - b).total_seconds()), 1)
+
+    def test_persisted_and_evicted(self):
+        cache = suncalendar.SunCalendarCache(self.directory, maxsize = 1)
+        first = cache.get_year(42.364908, -71.112828, 2024)
+        cache.get_year(10.0, 20.0, 2023)
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertEqual(first.shape, (366, 3))
+        reloaded = suncalendar.SunCalendarCache(self.directory).get_year(42.364908, -71.112828, 2024)
+        self.assertTrue((reloaded == first).all())
+
+    def test_polar_night(self):
+        cache = suncalendar.SunCalendarCache()
+        sunrise, sunset, transit = cache.get_sunrise_sunset_transit(78.0, 15.0, self.when.replace(month = 12))
+        self.assertIsNone(sunrise)
+        self.assertIsNone(sunset)
+        self.assertIsNotNone(transit)
+
+    def test_math_backend(self):
+        expected = suncalendar.get_year_hours(42.364908, -71.112828, 2024)
+        self.addCleanup(getattr(pysolar, "use_" + numeric.current_mod))
+        pysolar.use_math()
+        hours = suncalendar.SunCalendarCache().get_year(42.364908, -71.112828, 2024)
+        self.assertTrue((hours == expected).all())
+        self.assertEqual(numeric.current_mod, "math")
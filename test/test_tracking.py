@@ -0,0 +1,68 @@
+import pysolar
+from pysolar import numeric, poa, solar, tracking
+import numpy as np
+import unittest
+
+
+class TestTracking(unittest.TestCase):
+
+    def setUp(self):
+        self.altitude = np.array([-2.0, 8.0, 30.0, 55.0, 70.0, 25.0])
+        self.azimuth = np.array([70.0, 80.0, 100.0, 150.0, 200.0, 265.0])
+
+    def test_ideal_rotation(self):
+        angles = tracking.get_tracker_angles(30.0, 90.0, backtrack = False)
+        self.assertAlmostEqual(float(angles["ideal_rotation"]), -60.0)
+        self.assertAlmostEqual(float(angles["aoi"]), 0.0, places = 5)
+        angles = tracking.get_tracker_angles(30.0, 270.0, backtrack = False)
+        self.assertAlmostEqual(float(angles["rotation"]), 60.0)
+        self.assertAlmostEqual(float(angles["slope_orientation"]), 90.0)
+
+    def test_rows(self):
+        axis_tilt = np.array([0.0, 10.0, 20.0])
+        axis_azimuth = np.array([180.0, 170.0, 200.0])
+        angles = tracking.get_tracker_angles(self.altitude, self.azimuth, axis_tilt, axis_azimuth, max_angle = 60.0)
+        for value in angles.values():
+            self.assertEqual(value.shape, (6, 3))
+        self.assertTrue(np.all(np.isnan(angles["rotation"][0])))
+        self.assertTrue(np.all(np.abs(angles["rotation"][1:]) <= 60.0))
+        # the reported panel orientation reproduces the angle of incidence
+        for i in range(1, 6):
+            for j in range(3):
+                expected = solar.get_incidence_angle(90 - self.altitude[i], angles["slope"][i, j], angles["slope_orientation"][i, j], self.azimuth[i])
+                self.assertAlmostEqual(angles["aoi"][i, j], expected, places = 6)
+        # with a flat north-south axis, the ideal rotation follows the sun's projection on the east-west plane
+        ideal = tracking.get_tracker_angles(self.altitude[1:], self.azimuth[1:], backtrack = False)["ideal_rotation"]
+        altitude, azimuth = np.radians(self.altitude[1:]), np.radians(self.azimuth[1:])
+        np.testing.assert_allclose(ideal, np.degrees(np.arctan2(-np.cos(altitude) * np.sin(azimuth), np.sin(altitude))))
+
+    def test_backtracking(self):
+        gcr = 0.4
+        ideal = tracking.get_tracker_angles(self.altitude[1:], self.azimuth[1:], gcr = gcr, backtrack = False)["ideal_rotation"]
+        rotation = tracking.get_tracker_angles(self.altitude[1:], self.azimuth[1:], gcr = gcr)["rotation"]
+        shaded = np.cos(np.radians(ideal)) < gcr
+        self.assertTrue(shaded.any() and not shaded.all())
+        np.testing.assert_allclose(rotation[~shaded], ideal[~shaded])
+        # backtracked rows are just clear of each other's shadow
+        np.testing.assert_allclose(gcr * np.cos(np.radians(rotation - ideal))[shaded], np.cos(np.radians(ideal))[shaded])
+        self.assertTrue(np.all(np.abs(rotation) <= np.abs(ideal) + 1e-9))
+
+    def test_positions(self):
+        when = np.datetime64('2024-06-21T10:00') + np.arange(0, 8 * 60, 60).astype('timedelta64[m]')
+        angles = tracking.get_tracker_positions(35.0, -106.0, when, gcr = np.array([0.3, 0.5]))
+        self.assertEqual(angles["rotation"].shape, (8, 2))
+        with numeric.backend("numpy"):
+            azimuth, altitude = solar.get_position(35.0, -106.0, when)
+        np.testing.assert_allclose(angles["rotation"], tracking.get_tracker_angles(altitude, azimuth, gcr = np.array([0.3, 0.5]))["rotation"])
+
+    def test_math_backend(self):
+        when = np.datetime64('2024-06-21T10:00') + np.arange(0, 8 * 60, 60).astype('timedelta64[m]')
+        expected = tracking.get_tracker_positions(35.0, -106.0, when)
+        self.addCleanup(getattr(pysolar, "use_" + numeric.current_mod))
+        pysolar.use_math()
+        angles = tracking.get_tracker_positions(35.0, -106.0, when)
+        np.testing.assert_array_equal(angles["rotation"], expected["rotation"])
+        self.assertEqual(numeric.current_mod, "math")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,101 @@
+import pysolar
+from pysolar import util
+import datetime
+import numpy as np
+import unittest
+
+
+class TestClearSkyComponents(unittest.TestCase):
+
+    def setUp(self):
+        self.lat = 42.364908
+        self.lon = -71.112828
+        self.when = datetime.datetime(2024, 6, 21, 16, 30, tzinfo = datetime.timezone.utc)
+
+    def tearDown(self):
+        pysolar.use_math()
+
+    def test_matches_individual_functions(self):
+        pysolar.use_math()
+        components = util.get_clear_sky_components(self.lat, self.lon, self.when)
+        args = (self.lat, self.lon, self.when)
+        self.assertAlmostEqual(components['solarelevation_function_clear'], util.solarelevation_function_clear(*args))
+        self.assertAlmostEqual(components['solarelevation_function_overcast'], util.solarelevation_function_overcast(*args))
+        self.assertAlmostEqual(components['diffuse_transmittance'], util.diffuse_transmittance())
+        self.assertAlmostEqual(components['diffuse_underclear'], util.diffuse_underclear(*args))
+        self.assertAlmostEqual(components['diffuse_underovercast'], util.diffuse_underovercast(*args))
+        self.assertAlmostEqual(components['direct_underclear'], util.direct_underclear(*args))
+        self.assertAlmostEqual(components['global_irradiance_clear'], util.global_irradiance_clear(*args))
+        self.assertAlmostEqual(components['global_irradiance_overcast'], util.global_irradiance_overcast(*args))
+
+    def test_turbidity_and_air_mass(self):
+        # values of the functions before they shared one altitude; global_irradiance_clear
+        # takes its diffuse part at the default turbidity whatever TL is
+        pysolar.use_math()
+        when = datetime.datetime(2024, 6, 21, 15, tzinfo = datetime.timezone.utc)
+        options = dict(TY = 366, AM = 1.5, TL = 3.0)
+        components = util.get_clear_sky_components(42, -71, when, **options)
+        self.assertAlmostEqual(util.global_irradiance_clear(42, -71, when, **options), 1262.0827776767, places = 6)
+        self.assertAlmostEqual(components['global_irradiance_clear'], 1262.0827776767, places = 6)
+        self.assertAlmostEqual(components['diffuse_underclear'], 6628.7929968302, places = 6)
+        self.assertAlmostEqual(components['diffuse_underclear'], util.diffuse_underclear(42, -71, when, TL = 3.0))
+        self.assertAlmostEqual(components['direct_underclear'], util.direct_underclear(42, -71, when, **options))
+
+    def test_precomputed_altitude(self):
+        pysolar.use_math()
+        computed = util.get_clear_sky_components(self.lat, self.lon, self.when)
+        given = util.get_clear_sky_components(self.lat, self.lon, self.when, altitude_deg = computed['altitude'])
+        self.assertEqual(computed, given)
+
+    def test_vectorized_over_sites_and_times(self):
+        pysolar.use_numpy()
+        lat = np.array([[self.lat], [-33.9]])
+        lon = np.array([[self.lon], [18.4]])
+        when = np.datetime64('2024-06-21T00:00') + np.arange(0, 24 * 60, 90).astype('timedelta64[m]')
+        components = util.get_clear_sky_components(lat, lon, when)
+        self.assertEqual(components['global_irradiance_clear'].shape, (2, 16))
+        pysolar.use_math()
+        for i in range(2):
+            for j in (3, 11):
+                moment = when[j].astype(datetime.datetime).replace(tzinfo = datetime.timezone.utc)
+                alone = util.get_clear_sky_components(lat[i, 0], lon[i, 0], moment)
+                for name, value in alone.items():
+                    self.assertAlmostEqual(np.broadcast_to(components[name], (2, 16))[i, j], value, places = 6)
+
+
+class TestVectorizedExtraterrestrial(unittest.TestCase):
+
+    def setUp(self):
+        self.lat = 42.364908
+        self.lon = -71.112828
+        self.when = np.datetime64('2024-03-01T00:00:00') + np.arange(0, 3 * 86400, 600).astype('timedelta64[s]')
+
+    def tearDown(self):
+        pysolar.use_math()
+
+    def test_matches_scalar(self):
+        pysolar.use_numpy()
+        ghi = np.full(self.when.shape, 500.0)
+        extraterrestrial = util.extraterrestrial_irrad(self.lat, self.lon, self.when)
+        with np.errstate(divide = 'ignore'):
+            kt = util.clear_index(ghi, self.lat, self.lon, self.when)
+        self.assertEqual(extraterrestrial.shape, self.when.shape)
+        self.assertTrue(np.all(extraterrestrial >= 0))
+        pysolar.use_math()
+        for j in range(0, len(self.when), 7):
+            moment = self.when[j].astype(datetime.datetime).replace(tzinfo = datetime.timezone.utc)
+            expected = util.extraterrestrial_irrad(self.lat, self.lon, moment)
+            self.assertAlmostEqual(extraterrestrial[j], expected, places = 9)
+            if expected > 0:
+                self.assertAlmostEqual(kt[j], util.clear_index(500.0, self.lat, self.lon, moment))
+
+    def test_day_terms(self):
+        pysolar.use_numpy()
+        day = np.array([[1, 60, 60], [365, 1, 200]])
+        eccentricity, declination = util.get_day_terms(day)
+        self.assertEqual(eccentricity.shape, day.shape)
+        for index, d in np.ndenumerate(day):
+            self.assertEqual((eccentricity[index], declination[index]), util.get_day_terms(d))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
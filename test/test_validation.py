@@ -0,0 +1,28 @@
+from validation import __main__ as validation
+import contextlib
+import io
+import unittest
+
+
+class TestValidationHarness(unittest.TestCase):
+
+    def run_validation(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = validation.main(["--engine", "numpy", "--engine", "fast"] + list(args))
+        return status, output.getvalue()
+
+    def test_accuracy(self):
+        status, output = self.run_validation()
+        self.assertEqual(status, 0, output)
+        self.assertIn("numpy    usno", output)
+        self.assertIn("numpy    spa         1000 rows", output)
+        self.assertNotIn("math     usno", output)
+
+    def test_failure(self):
+        status, output = self.run_validation("--tolerance-scale", "1e-6")
+        self.assertEqual(status, 1)
+        self.assertIn("FAILED: numpy usno separation", output)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,23 @@
+"""Offline accuracy validation of the Pysolar position engines
+
+Run from the top of the source tree:
+
+    python -m validation                    # validate every engine
+    python -m validation --engine numpy     # only the vectorized engine
+
+Each engine of engines.py computes the 6259 airless positions of the USNO
+sample in test/usno_data_6259.txt; the median, 95th and 99th percentile and
+maximum errors are reported with the engine's throughput, next to the errors
+of the positions an earlier release recorded in test/pysolar_v_usno.csv.
+The engines are also run on the worked example of the NREL SPA report and on
+the 1000 random positions computed by SPA in spa_positions.csv (written by
+util/make_spa_positions), and pysolar's Julian days, heliocentric coordinates
+and nutation are checked against the values published in the report
+(spa_reference.json).
+
+The run fails if any error exceeds its tolerance in __main__.py, so that a
+speed optimization can be accepted only once its accuracy is measured.
+Errors are gated on the angle between the computed and reference
+directions to the sun and on altitude; azimuth errors are reported but not
+gated, since they grow without bound near the zenith.
+"""
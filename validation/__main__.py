@@ -0,0 +1,189 @@
+"""Command-line entry point; see the package docstring."""
+import argparse
+import sys
+import time
+import numpy
+from pysolar import constants, numeric, solar, solartime
+from . import engines, references
+
+percentiles = (50, 95, 99)
+# largest allowed errors in degrees, per engine: the exact engines are gated just
+# above their measured maxima (0.0058 on the USNO sample, 0.0053 against SPA)
+tolerances = \
+    {
+        "math" : {"separation" : 0.006, "altitude" : 0.006, "spa" : 0.006},
+        "numpy" : {"separation" : 0.006, "altitude" : 0.006, "spa" : 0.006},
+        "fast" : {"separation" : 2.0, "altitude" : 1.5, "spa" : 2.0},
+    }
+# largest allowed errors of the SPA intermediate quantities, in their units
+quantity_tolerances = \
+    {
+        "julian_day_seconds" : 2.0, # pysolar works in UT1 and SPA in UTC
+        "heliocentric_longitude" : 1e-6,
+        "heliocentric_latitude" : 1e-8,
+        "sun_earth_distance" : 1e-8,
+        "nutation_longitude" : 1e-7,
+        "nutation_obliquity" : 1e-7,
+    }
+
+def get_unit_vectors(azimuth, altitude):
+    azimuth = numpy.radians(azimuth)
+    altitude = numpy.radians(altitude)
+    return \
+        numpy.stack([numpy.cos(altitude) * numpy.cos(azimuth), numpy.cos(altitude) * numpy.sin(azimuth), numpy.sin(altitude)], axis = -1)
+#end get_unit_vectors
+
+def get_errors(azimuth, altitude, reference):
+    '''returns a dict of absolute "separation" (angle between the directions to the
+    sun), "altitude" and "azimuth" errors in degrees against reference. Azimuth
+    errors grow without bound near the zenith, so only the separation and the
+    altitude are gated.'''
+    product = numpy.sum(get_unit_vectors(azimuth, altitude) * get_unit_vectors(reference["azimuth"], reference["altitude"]), axis = -1)
+    return \
+        {
+            "separation" : numpy.degrees(numpy.arccos(numpy.clip(product, -1, 1))),
+            "altitude" : numpy.abs(altitude - reference["altitude"]),
+            "azimuth" : numpy.abs((azimuth - reference["azimuth"] + 180) % 360 - 180),
+        }
+#end get_errors
+
+def format_errors(errors):
+    "formats the percentiles and the maximum of each kind of error."
+    return \
+        "  ".join \
+          (
+            "%s %s" % (name, "/".join("%.5f" % value for value in numpy.percentile(values, percentiles + (100,))))
+            for name, values in errors.items()
+          )
+#end format_errors
+
+def check_usno(engine, tolerance_scale):
+    "compares engine with the airless USNO sample and returns the list of failures."
+    usno = references.load_usno()
+    count = len(usno["when"])
+    begin = time.perf_counter()
+    azimuth, altitude = engine.function \
+      (
+        usno["latitude"], usno["longitude"], usno["elevation"], usno["when"],
+        numpy.full(count, constants.standard_temperature), numpy.zeros(count)
+      )
+    seconds = time.perf_counter() - begin
+    errors = get_errors(azimuth, altitude, usno)
+    print("%-8s usno      %6d rows %12.0f rows/s  %s" % (engine.name, count, count / seconds, format_errors(errors)), flush = True)
+    failures = []
+    for name in ("separation", "altitude") :
+        limit = tolerances[engine.name][name] * tolerance_scale
+        if errors[name].max() > limit :
+            failures.append("%s usno %s error %.5f > %.5f" % (engine.name, name, errors[name].max(), limit))
+        #end if
+    #end for
+    return \
+        failures
+#end check_usno
+
+def check_spa_example(engine, tolerance_scale):
+    "compares engine with the position of the NREL SPA example and returns the list of failures."
+    example = references.load_spa()["example"]
+    azimuth, altitude = engine.function \
+      (
+        numpy.array([example["latitude"]]), numpy.array([example["longitude"]]),
+        numpy.array([example["elevation"]]), numpy.array([example["timestamp"]], dtype = "datetime64[s]"),
+        numpy.array([example["temperature_celsius"] + constants.celsius_offset]),
+        numpy.array([example["pressure_millibars"] * 100])
+      )
+    error = get_errors(azimuth, altitude, {"azimuth" : example["azimuth"], "altitude" : 90 - example["zenith"]})["separation"][0]
+    limit = tolerances[engine.name]["spa"] * tolerance_scale
+    print("%-8s spa       separation %.5f (limit %.5f)" % (engine.name, error, limit), flush = True)
+    return \
+        ["%s spa example separation %.5f > %.5f" % (engine.name, error, limit)] if error > limit else []
+#end check_spa_example
+
+def check_spa_positions(engine, tolerance_scale):
+    "compares engine with the positions computed by the NREL SPA and returns the list of failures."
+    positions = references.load_spa_positions()
+    count = len(positions["when"])
+    begin = time.perf_counter()
+    azimuth, altitude = engine.function \
+      (
+        positions["latitude"], positions["longitude"], positions["elevation"], positions["when"],
+        positions["temperature"], positions["pressure"]
+      )
+    seconds = time.perf_counter() - begin
+    errors = get_errors(azimuth, altitude, positions)
+    print("%-8s spa       %6d rows %12.0f rows/s  %s" % (engine.name, count, count / seconds, format_errors(errors)), flush = True)
+    limit = tolerances[engine.name]["spa"] * tolerance_scale
+    return \
+        ["%s spa positions separation %.5f > %.5f" % (engine.name, errors["separation"].max(), limit)] if errors["separation"].max() > limit else []
+#end check_spa_positions
+
+def check_spa_quantities(tolerance_scale):
+    "compares the Julian days and the intermediate quantities of the SPA example and" \
+    " returns the list of failures."
+    spa = references.load_spa()
+    example = spa["example"]
+    with numeric.backend("math") :
+        errors = \
+            {
+                "julian_day_seconds" :
+                    max
+                      (
+                        abs(solartime.get_julian_solar_day(references.get_datetime(when)) - julian_day) * constants.seconds_per_day
+                        for when, julian_day in spa["julian_days"]
+                      ),
+            }
+        # at the ephemeris time of the example, so that pysolar's delta T does not enter
+        jce = (example["julian_day"] + example["delta_t"] / constants.seconds_per_day - 2451545) / 36525
+        jme = jce / 10
+        nutation = solar.get_nutation(jce)
+        values = \
+            {
+                "heliocentric_longitude" : solar.get_heliocentric_longitude(jme),
+                "heliocentric_latitude" : solar.get_heliocentric_latitude(jme),
+                "sun_earth_distance" : solar.get_sun_earth_distance(jme),
+                "nutation_longitude" : nutation["longitude"],
+                "nutation_obliquity" : nutation["obliquity"],
+            }
+    #end with
+    for name, value in values.items() :
+        errors[name] = abs(value - example[name])
+    #end for
+    failures = []
+    for name, error in errors.items() :
+        limit = quantity_tolerances[name] * tolerance_scale
+        print("spa      %-24s error %.3g (limit %.3g)" % (name, error, limit))
+        if error > limit :
+            failures.append("spa %s error %.3g > %.3g" % (name, error, limit))
+        #end if
+    #end for
+    return \
+        failures
+#end check_spa_quantities
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m validation", description = "Pysolar accuracy validation against offline references")
+    parser.add_argument("--engine", action = "append", choices = [engine.name for engine in engines.engines], help = "only validate this engine (repeatable; default: all)")
+    parser.add_argument("--tolerance-scale", type = float, default = 1.0, help = "multiply every tolerance by this factor (default: %(default)s)")
+    args = parser.parse_args(argv)
+    failures = check_spa_quantities(args.tolerance_scale)
+    print("errors in degrees as p%s/max" % "/p".join(str(p) for p in percentiles))
+    usno = references.load_usno()
+    recorded = references.load_recorded()
+    print("%-8s usno      %6d rows %19s  %s" % ("recorded", len(usno["when"]), "", format_errors(get_errors(recorded["azimuth"], recorded["altitude"], usno))))
+    for engine in engines.engines :
+        if args.engine is not None and engine.name not in args.engine :
+            continue
+        #end if
+        failures += check_usno(engine, args.tolerance_scale)
+        failures += check_spa_example(engine, args.tolerance_scale)
+        failures += check_spa_positions(engine, args.tolerance_scale)
+    #end for
+    for failure in failures :
+        print("FAILED: " + failure)
+    #end for
+    return \
+        1 if len(failures) != 0 else 0
+#end main
+
+if __name__ == "__main__" :
+    sys.exit(main())
+#end if
@@ -0,0 +1,47 @@
+"""Position engines under validation: each takes arrays of latitude, longitude,
+elevation, UTC datetime64 times, temperature in kelvin and pressure in pascals,
+and returns arrays of azimuth and altitude in degrees."""
+import collections
+import numpy
+from pysolar import numeric, solar
+from . import references
+
+Engine = collections.namedtuple("Engine", ("name", "function"))
+
+def _get_position_math(latitude, longitude, elevation, when, temperature, pressure):
+    with numeric.backend("math") :
+        positions = \
+            [
+                solar.get_position(*arguments[:2], references.get_datetime(arguments[2]), *arguments[3:])
+                for arguments in zip
+                  (
+                    latitude.tolist(), longitude.tolist(), when,
+                    elevation.tolist(), temperature.tolist(), pressure.tolist()
+                  )
+            ]
+    #end with
+    return \
+        tuple(numpy.array(positions, dtype = float).reshape(-1, 2).T)
+#end _get_position_math
+
+def _get_position_numpy(latitude, longitude, elevation, when, temperature, pressure):
+    with numeric.backend("numpy") :
+        return \
+            solar.get_position(latitude, longitude, when, elevation, temperature, pressure)
+    #end with
+#end _get_position_numpy
+
+def _get_position_fast(latitude, longitude, elevation, when, temperature, pressure):
+    # the approximate formulas ignore elevation and refraction
+    with numeric.backend("numpy") :
+        return \
+            solar.get_azimuth_fast(latitude, longitude, when), solar.get_altitude_fast(latitude, longitude, when)
+    #end with
+#end _get_position_fast
+
+engines = \
+    (
+        Engine("math", _get_position_math),
+        Engine("numpy", _get_position_numpy),
+        Engine("fast", _get_position_fast),
+    )
@@ -0,0 +1,75 @@
+"""Reference data: the USNO ephemeris sample in test/, the pysolar results recorded
+against it, the NREL SPA examples in spa_reference.json and the SPA positions
+in spa_positions.csv."""
+import datetime
+import json
+import os
+import numpy
+from pysolar import constants
+
+source_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+usno_path = os.path.join(source_directory, "test", "usno_data_6259.txt")
+recorded_path = os.path.join(source_directory, "test", "pysolar_v_usno.csv")
+spa_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spa_reference.json")
+spa_positions_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spa_positions.csv")
+
+def load_usno(path = usno_path):
+    '''returns the USNO sample as a dict of arrays "when" (UTC datetime64[s]),
+    "latitude", "longitude", "elevation", "azimuth" and "altitude". The USNO
+    positions are airless: altitude is not corrected for refraction.'''
+    rows = numpy.loadtxt(path, dtype = str)
+    return \
+        {
+            "when" : numpy.array([day + "T" + time for day, time in rows[:, :2]], dtype = "datetime64[s]"),
+            "latitude" : rows[:, 2].astype(float),
+            "longitude" : rows[:, 3].astype(float),
+            "elevation" : rows[:, 4].astype(float),
+            "azimuth" : rows[:, 5].astype(float),
+            # the sample holds zenith angles
+            "altitude" : 90 - rows[:, 6].astype(float),
+        }
+#end load_usno
+
+def load_recorded(path = recorded_path):
+    "returns the pysolar azimuth and altitude recorded against the USNO sample by an" \
+    " earlier release, in the order of load_usno."
+    table = numpy.genfromtxt(path, delimiter = ",", names = True, dtype = None, encoding = None)
+    return \
+        {
+            "azimuth" : table["az1"].astype(float),
+            "altitude" : 90 - table["alt1"].astype(float),
+        }
+#end load_recorded
+
+def load_spa(path = spa_path):
+    "returns the contents of spa_reference.json."
+    with open(path) as f :
+        return \
+            json.load(f)
+    #end with
+#end load_spa
+
+def load_spa_positions(path = spa_positions_path):
+    '''returns the SPA positions written by util/make_spa_positions as a dict of
+    arrays "when" (UTC datetime64[s]), "latitude", "longitude", "elevation",
+    "temperature" in kelvin, "pressure" in pascals, "azimuth" and "altitude".
+    The altitudes are corrected for refraction.'''
+    table = numpy.genfromtxt(path, delimiter = ",", names = True, dtype = None, encoding = None)
+    return \
+        {
+            "when" : table["when"].astype("datetime64[s]"),
+            "latitude" : table["latitude"].astype(float),
+            "longitude" : table["longitude"].astype(float),
+            "elevation" : table["elevation"].astype(float),
+            "temperature" : table["temperature_celsius"] + constants.celsius_offset,
+            "pressure" : table["pressure_millibars"] * 100,
+            "azimuth" : table["azimuth"].astype(float),
+            "altitude" : 90 - table["zenith"].astype(float),
+        }
+#end load_spa_positions
+
+def get_datetime(when):
+    "converts a UTC datetime64 or ISO 8601 string to an aware datetime."
+    return \
+        numpy.datetime64(when, "s").item().replace(tzinfo = datetime.timezone.utc)
+#end get_datetime